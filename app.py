@@ -1,6 +1,6 @@
-from flask import Flask, render_template, jsonify, request
-import pandas as pd
+from flask import Flask, Response, render_template, jsonify, request
 from pathlib import Path
+from urllib.parse import urlencode
 import threading
 import json
 import time
@@ -8,46 +8,354 @@ import sys
 import os
 import tempfile
 
-# Import the scraper orchestrator
-# We need to add the current dir to path to import scraper properly if needed, but it's in the same dir
-from scraper import run_scrapers
+from loguru import logger
+
+import store
+from output_handler import CSV_FILE, CSV_SEGMENT_FILE
+from seen_index import get_seen_index
+import events
+import log_tail
+import compression
 
 app = Flask(__name__)
-DATA_FILE = Path(__file__).parent / "internships.csv"
+events.install_log_sink()
+
+
+# ── Response cache ───────────────────────────────────────────────────────────
+class ResponseCache:
+    """
+    Pre-serialized JSON bodies keyed on the request, valid for one store
+    version. Any committed write (from this process or a scraper running
+    elsewhere) bumps the version, so stale entries are simply never hit again.
+    Compressed variants are made on first request and kept next to the body.
+    """
+
+    MAX_ENTRIES = 64
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}  # key -> (version, {encoding or None: body bytes})
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build, encoding=None, version=None):
+        """
+        Returns (body, encoding), calling build() -> JSON-able object only on
+        a miss. Bodies too small to be worth compressing come back as
+        identity (encoding None) whatever was asked for.
+        """
+        if version is None:
+            version = store.get_version()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version:
+                self.hits += 1
+                variants = entry[1]
+            else:
+                self.misses += 1
+                variants = None
+
+        if variants is None:
+            variants = {None: app.json.dumps(build()).encode("utf-8")}
+            with self._lock:
+                if key not in self._entries and len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))  # evict the oldest key
+                self._entries[key] = (version, variants)
+
+        if encoding is None or len(variants[None]) < compression.MIN_COMPRESS_BYTES:
+            return variants[None], None
+        if encoding not in variants:
+            variants[encoding] = compression.compress(variants[None], encoding)
+        return variants[encoding], encoding
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "entries": len(self._entries),
+                "store_version": store.get_version(),
+            }
+
+
+response_cache = ResponseCache()
+
+
+# ── Conditional / compressed responses ───────────────────────────────────────
+def _not_modified(tag: str, encoding):
+    """
+    The ETag from If-None-Match that names this content, or None. Either
+    coding of the same content counts: the client keeps whichever it has.
+    """
+    etags = request.if_none_match
+    for candidate in ([f"{tag}-{encoding}"] if encoding else []) + [tag]:
+        if etags.contains_weak(candidate):
+            return candidate
+    return None
+
+
+def _json_body(body: bytes, tag: str = None, encoding=None, status: int = 200):
+    """A JSON response from ready bytes; with `tag` it gets a strong ETag."""
+    response = app.response_class(body, status=status, mimetype="application/json")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    if tag:
+        response.set_etag(f"{tag}-{encoding}" if encoding else tag)
+        # Cacheable, but always revalidated: a 304 is a few bytes
+        response.headers["Cache-Control"] = "no-cache"
+        response.vary.add("Accept-Encoding")
+    return response
+
+
+PAYLOAD_FORMATS = ("rows", "columnar")
+
+
+def _payload_format() -> str:
+    """?format=rows (default: one object per listing) or ?format=columnar (see store.to_columnar)."""
+    fmt = request.args.get("format", "rows")
+    if fmt not in PAYLOAD_FORMATS:
+        raise ValueError(f"unknown format '{fmt}' (expected one of: {', '.join(PAYLOAD_FORMATS)})")
+    return fmt
+
+
+def _formatted(build, fmt: str):
+    """Wraps build() so its listings (the list itself, or its "items") come out in `fmt`."""
+    if fmt != "columnar":
+        return build
+
+    def build_columnar():
+        result = build()
+        if isinstance(result, list):
+            return store.to_columnar(result)
+        return dict(result, items=store.to_columnar(result["items"]))
+    return build_columnar
+
+
+def _cached_json(key, build, snapshot: str = None):
+    """
+    Serves build()'s result through the response cache, with an ETag of the
+    store version it reflects, compression negotiated from Accept-Encoding,
+    and 304 Not Modified when the client's copy is still current (nothing
+    is built or read for a 304). `snapshot` names the payload format of the
+    on-disk listing snapshot that may stand in for build().
+    """
+    version = store.get_version()
+    tag = f"v{version}"
+    encoding = compression.negotiate(request.headers.get("Accept-Encoding", ""))
+    matched = _not_modified(tag, encoding)
+    if matched:
+        return _json_body(b"", matched, status=304)
+
+    body = compression.read_snapshot(version, encoding, snapshot) if snapshot and encoding else None
+    if body is None:
+        body, encoding = response_cache.get_or_build(key, build, encoding=encoding, version=version)
+    return _json_body(body, tag, encoding)
 
 # Global state for scraping
 scraper_t = None
 
+
+# ── Queue mode ───────────────────────────────────────────────────────────────
+# By default (`python app.py`) a scrape runs in a thread of this process.
+# serve.py switches to queue mode: /api/scrape only queues a job for
+# worker.py, and a bridge thread turns what the worker does (job status,
+# scraper_run.log lines, alerts, committed listings) into the same SSE events
+# the in-process scraper would publish. The bridge only runs while this
+# process has an open event stream, so an idle server does no polling.
+
+QUEUE_MODE = False
+BRIDGE_POLL_SECONDS = 1.0
+RUN_LOG_FILE = Path(__file__).parent / "scraper_run.log"
+ALERT_FILE = Path(__file__).parent / "scraper_alerts.json"
+
+_bridge_t = None
+_bridge_lock = threading.Lock()
+
+
+def enable_queue_mode():
+    """Hands scraping to worker.py (called by serve.py before serving)."""
+    global QUEUE_MODE
+    QUEUE_MODE = True
+    # Log lines come from the worker's scraper_run.log instead of this process
+    events.remove_log_sink()
+
+
+def _scrape_running() -> bool:
+    if QUEUE_MODE:
+        return store.active_job() is not None
+    return bool(scraper_t and scraper_t.is_alive())
+
+
+def _start_bridge():
+    # Started on demand rather than at import, so each (forked) server worker gets its own.
+    # Call it after subscribing, so the bridge cannot stop for lack of subscribers meanwhile.
+    global _bridge_t
+    with _bridge_lock:
+        if _bridge_t is None:
+            _bridge_t = threading.Thread(target=_bridge_loop, name="event-bridge", daemon=True)
+            _bridge_t.start()
+
+
+def _bridge_should_stop() -> bool:
+    global _bridge_t
+    with _bridge_lock:
+        if events.bus.has_subscribers():
+            return False
+        _bridge_t = None
+        return True
+
+
+def _bridge_loop():
+    status = version = alert_mtime = None
+    try:
+        st = os.stat(RUN_LOG_FILE)
+        log_cursor = log_tail.make_cursor(st, st.st_size)  # Only lines written from now on
+    except FileNotFoundError:
+        log_cursor = "0"
+
+    while not _bridge_should_stop():
+        try:
+            job = store.active_job()
+            current = {"status": job["status"] if job else "idle", "job": job["id"] if job else None}
+            if current != status:
+                events.publish("status", current)
+                status = current
+
+            lines, log_cursor, _ = log_tail.read_after(RUN_LOG_FILE, log_cursor)
+            for line in lines:
+                events.publish("log", line)
+
+            current_version = store.get_version()
+            if version is not None and current_version != version:
+                events.publish("listings", {"seq": store.current_seq(), "added": None})
+            version = current_version
+
+            mtime = ALERT_FILE.stat().st_mtime if ALERT_FILE.exists() else None
+            if mtime != alert_mtime:
+                alert = json.loads(ALERT_FILE.read_text(encoding="utf-8")) if mtime else None
+                events.publish("alert", alert if alert and not alert.get("resolved") else None)
+                alert_mtime = mtime
+        except Exception as e:
+            logger.error(f"Event bridge error: {e}")
+        time.sleep(BRIDGE_POLL_SECONDS)
+
+
 @app.route("/")
 def index():
     return render_template("index.html")
 
+LISTING_FILTERS = ("q", "source", "location_type", "stipend", "org_type", "role_type")
+PAGE_PARAMS = LISTING_FILTERS + ("sort", "limit", "cursor")
+
 @app.route("/api/internships")
 def get_internships():
-    if not DATA_FILE.exists():
-        return jsonify([])
-        
+    """
+    Without query parameters: every listing (what the dashboard loads).
+    With any of PAGE_PARAMS: one filtered, sorted page as
+    {"items", "total", "next_cursor"}; pass next_cursor back as `cursor`.
+    Paging is for API clients and scripts; the dashboard loads everything
+    once, delta-syncs it and filters locally, with the same `q` semantics.
+    Either way, ?format=columnar sends the listings column by column.
+    """
     try:
-        df = pd.read_csv(DATA_FILE)
-        # Safely convert NaN to empty strings for JSON serialization
-        df = df.fillna("")
-        return jsonify(df.to_dict(orient="records"))
-    except Exception as e:
-        print(f"Error reading CSV: {e}")
-        return jsonify([])
+        fmt = _payload_format()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if not any(p in request.args for p in PAGE_PARAMS):
+        try:
+            return _cached_json(f"internships?format={fmt}", _formatted(store.fetch_listings, fmt),
+                                snapshot=fmt)
+        except Exception as e:
+            logger.error(f"Error reading listing store: {e}")
+            return jsonify([])
+
+    try:
+        filters = {p: request.args.get(p) for p in LISTING_FILTERS}
+        sort = request.args.get("sort", "match_score")
+        limit = request.args.get("limit", store.DEFAULT_PAGE_SIZE, type=int)
+        cursor = request.args.get("cursor")
+        key = "internships?" + request.query_string.decode("utf-8", "replace")
+        return _cached_json(
+            key, _formatted(lambda: store.query_listings(filters, sort=sort, limit=limit, cursor=cursor), fmt)
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.route("/api/internships/changes")
+def get_internship_changes():
+    """
+    Listings added or updated after ?since=<seq> (the largest `seq` the client
+    has seen), as {"items", "reset", "seq", "more"}. `reset` means the data
+    was cleared: drop everything and keep only these items.
+    """
+    since = request.args.get("since", 0, type=int)
+    limit = max(1, min(request.args.get("limit", 1000, type=int), 5000))
+    try:
+        fmt = _payload_format()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return _cached_json(
+        f"changes?since={since}&limit={limit}&format={fmt}",
+        _formatted(lambda: store.fetch_changes(since, limit=limit), fmt),
+    )
+
+@app.route("/api/search")
+def search_internships():
+    """Full-text search: ?q=words (each a prefix, all required), best match first."""
+    q = request.args.get("q", "")
+    limit = request.args.get("limit", store.DEFAULT_PAGE_SIZE, type=int)
+    try:
+        fmt = _payload_format()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    # Encoded, so a `q` containing "&" or "=" cannot pass for another query's key
+    key = "search?" + urlencode({"q": q, "limit": limit, "format": fmt})
+    return _cached_json(key, _formatted(lambda: store.search_listings(q, limit=limit), fmt))
+
+@app.route("/api/facets")
+def get_facets():
+    """Counts per location_type / source / org_type / role_type / stipend, optionally under the LISTING_FILTERS."""
+    filters = {p: request.args.get(p) for p in LISTING_FILTERS}
+    try:
+        key = "facets?" + request.query_string.decode("utf-8", "replace")
+        return _cached_json(key, lambda: store.facets(filters))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.route("/api/cache/stats")
+def cache_stats():
+    """Hit/miss counters of the listing response cache."""
+    return jsonify(response_cache.stats())
 
 @app.route("/api/scrape", methods=["POST"])
 def trigger_scrape():
     global scraper_t
-    
+
+    config = request.json if request.is_json else None
+
+    if QUEUE_MODE:
+        job, created = store.enqueue_job(config)
+        if not created:
+            return jsonify({"status": "running", "message": "Scraping is already in progress!", "job": job["id"]})
+        events.publish("status", {"status": "queued", "job": job["id"]})
+        return jsonify({"status": "started", "message": "Scrape queued. A worker will pick it up shortly.",
+                        "job": job["id"]})
+
     if scraper_t and scraper_t.is_alive():
         return jsonify({"status": "running", "message": "Scraping is already in progress!"})
-        
-    config = request.json if request.is_json else None
-        
+
     def scrape_job(cfg):
         # Running the full scraper
-        run_scrapers(dry_run=False, config=cfg)
+        from scraper import run_scrapers
+        events.publish("status", {"status": "running"})
+        try:
+            run_scrapers(dry_run=False, config=cfg)
+        finally:
+            events.publish("status", {"status": "idle"})
         
     scraper_t = threading.Thread(target=scrape_job, args=(config,))
     scraper_t.start()
@@ -56,21 +364,52 @@ def trigger_scrape():
 
 @app.route("/api/scrape/status")
 def scrape_status():
-    global scraper_t
+    """`running` while a scrape runs; in queue mode also `queued`, with the job's details."""
+    if QUEUE_MODE:
+        job = store.active_job()
+        return jsonify({"status": job["status"] if job else "idle", "job": job})
     if scraper_t and scraper_t.is_alive():
         return jsonify({"status": "running"})
     return jsonify({"status": "idle"})
 
 @app.route("/api/logs")
 def get_logs():
+    """
+    The last 75 log lines plus a `cursor`. With ?after=<cursor>, only the
+    lines written since then (`rotated` is true if the log rolled over).
+    """
     log_file = Path(__file__).parent / "scraper_run.log"
-    if not log_file.exists():
-        return jsonify({"logs": ["No logs yet. Click 'Run Scraper Now' to start!"]})
+    after = request.args.get("after")
     try:
-        with open(log_file, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-            # Return last N lines
-            return jsonify({"logs": [l.strip() for l in lines[-75:]]})
+        # The answer depends only on which file is there and how long it is,
+        # so that is the ETag; a 304 costs a stat() and no reads
+        try:
+            st = os.stat(log_file)
+            tag = "log-" + log_tail.make_cursor(st, st.st_size).replace(":", "-")
+        except FileNotFoundError:
+            tag = None
+        encoding = compression.negotiate(request.headers.get("Accept-Encoding", ""))
+        matched = tag and _not_modified(tag, encoding)
+        if matched:
+            return _json_body(b"", matched, status=304)
+
+        if after:
+            lines, cursor, rotated = log_tail.read_after(log_file, after)
+            data = {"logs": lines, "cursor": cursor, "rotated": rotated}
+        else:
+            lines, cursor = log_tail.tail(log_file, 75)
+            if cursor is None:
+                return jsonify({"logs": ["No logs yet. Click 'Run Scraper Now' to start!"], "cursor": None})
+            data = {"logs": [l.strip() for l in lines], "cursor": cursor}
+
+        body = app.json.dumps(data).encode("utf-8")
+        if encoding and len(body) >= compression.MIN_COMPRESS_BYTES:
+            body = compression.compress(body, encoding)
+        else:
+            encoding = None
+        return _json_body(body, tag, encoding)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"logs": [f"Error reading logs: {e}"]})
 
@@ -108,24 +447,43 @@ def dismiss_alert():
             os.replace(temp_path, alert_file)
     except Exception:
         pass
+    events.publish("alert", None)
     return jsonify({"status": "ok"})
 
+@app.route("/api/events")
+def event_stream():
+    """
+    Server-Sent Events: `status`, `log`, `alert` and `listings` events pushed
+    as they happen, so an idle dashboard costs no polling and no disk reads.
+    """
+    queue = events.bus.subscribe()
+    if QUEUE_MODE:
+        _start_bridge()
+    response = Response(
+        events.bus.stream(queue=queue),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # Also covers a client that leaves before the stream's first chunk
+    response.call_on_close(lambda: events.bus.unsubscribe(queue))
+    return response
+
 @app.route("/api/clear", methods=["POST"])
 def clear_data():
     """Clears all historical scraped data to start fresh."""
-    global scraper_t
-    if scraper_t and scraper_t.is_alive():
+    if _scrape_running():
         return jsonify({"status": "error", "message": "Cannot clear data while scraper is running!"}), 400
         
     try:
-        # Delete CSV Database
-        if DATA_FILE.exists():
-            DATA_FILE.unlink()
-            
-        # Delete JSON Logs memory
-        log_file = Path(__file__).parent / "internships_log.json"
-        if log_file.exists():
-            log_file.unlink()
+        # Empty the listing store (listings + run history)
+        store.clear()
+        get_seen_index()  # New store generation: rebuilds the (now empty) index
+        events.publish("listings", {"seq": store.current_seq(), "added": 0})
+
+        # Delete the CSV export and pre-SQLite JSON log so nothing old lingers on disk
+        for legacy_file in (CSV_FILE, CSV_SEGMENT_FILE, store.LEGACY_LOG_FILE):
+            if legacy_file.exists():
+                legacy_file.unlink()
             
         # Delete text log file
         txt_log = Path(__file__).parent / "scraper_run.log"
@@ -0,0 +1,222 @@
+"""
+Async Multi-Tab Scraping Engine
+───────────────────────────────
+Drives several tabs of one stealth browser context at once using
+`playwright.async_api`, so page loads, scroll loops and `page.content()` calls
+of different URLs overlap instead of running back to back.
+
+Concurrency is capped twice: MAX_TABS open tabs overall, and HOST_LIMITS tabs
+per host so no single site sees more parallel traffic than it tolerates.
+
+`fetch_pages()` is a plain (sync) generator — the event loop runs on a helper
+thread and finished pages are handed back as they complete, so callers such
+as `scrape_linkedin` stay ordinary sync functions and `run_scrapers` does not
+need to know anything about asyncio.
+
+Playwright's sync and async APIs cannot share a browser, so the async
+Chromium is a separate one, but it is not cold-started per call: each lane's
+BrowserPool owns one AsyncBrowser (event-loop thread + Chromium) that every
+fetch_pages() call in that lane reuses, and that closes with the pool. Each
+call gets a fresh context in it.
+"""
+
+import asyncio
+import random
+import threading
+from queue import Queue
+from urllib.parse import urlparse
+
+from loguru import logger
+from playwright.async_api import async_playwright
+from playwright_stealth import Stealth
+
+from scraper_utils import get_playwright_stealth_args, UNIT_ATTEMPTS
+from browser_pool import DEFAULT_USER_AGENT, DEFAULT_VIEWPORT, browser_session
+
+MAX_TABS = 4
+DEFAULT_HOST_LIMIT = 2
+HOST_LIMITS = {
+    "www.linkedin.com": 2,
+    "unstop.com": 3,
+}
+
+_DONE = object()
+
+
+class PageJob:
+    """One page to load: where to go, what to wait for and how to scroll it."""
+
+    def __init__(self, key, url, timeout=45000, wait_selector=None, wait_timeout=15000,
+                 prepare=None, scrolls=0, scroll_px=(600, 1400), scroll_pause=(1.0, 2.0),
+                 cooldown=(0.0, 0.0)):
+        self.key = key
+        self.url = url
+        self.timeout = timeout
+        self.wait_selector = wait_selector
+        self.wait_timeout = wait_timeout
+        self.prepare = prepare            # optional `async def prepare(page)` run after goto
+        self.scrolls = scrolls
+        self.scroll_px = scroll_px
+        self.scroll_pause = scroll_pause
+        self.cooldown = cooldown          # delay before the host slot is handed to the next job
+
+    @property
+    def host(self) -> str:
+        return urlparse(self.url).netloc
+
+
+class AsyncBrowser:
+    """A Chromium driven by playwright.async_api on its own event-loop thread, kept for reuse."""
+
+    def __init__(self, headless=True):
+        self.headless = headless
+        self.launches = 0
+        self._playwright = None
+        self._browser = None
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="async-engine", daemon=True)
+        self._thread.start()
+
+    async def browser(self):
+        """Launches Chromium lazily, and again if a previous instance crashed (runs on the loop)."""
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=self.headless,
+                                                                args=get_playwright_stealth_args())
+        self.launches += 1
+        logger.info(f"AsyncEngine: Launched Chromium (launch #{self.launches})")
+        return self._browser
+
+    def submit(self, coro):
+        """Schedules `coro` on the loop; returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def close(self):
+        async def shutdown():
+            for closer in (self._browser and self._browser.close, self._playwright and self._playwright.stop):
+                if closer:
+                    try:
+                        await closer()
+                    except Exception:
+                        pass
+            self._browser = self._playwright = None
+
+        try:
+            self.submit(shutdown()).result(timeout=30)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+        if not self._thread.is_alive():
+            self.loop.close()
+
+
+def fetch_pages(jobs, max_tabs=MAX_TABS, host_limits=None, headless=True, attempts=UNIT_ATTEMPTS,
+                user_agent=DEFAULT_USER_AGENT, viewport=None, **context_options):
+    """
+    Loads every PageJob in tabs of a single browser context and yields
+    `(job, html, error)` tuples in completion order. Exactly one of `html` /
+    `error` is set; each job gets `attempts` tries with backoff before its
+    error is reported. Closing the generator early cancels jobs not yet started.
+    The browser is this thread's shared AsyncBrowser (see browser_session).
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+
+    limits = dict(HOST_LIMITS)
+    limits.update(host_limits or {})
+    context_options.update({"user_agent": user_agent, "viewport": viewport or DEFAULT_VIEWPORT})
+
+    results = Queue()
+    stop = threading.Event()
+    with browser_session(headless=headless) as pool:
+        engine = pool.async_browser()
+        run = engine.submit(_run(engine, jobs, results, stop, max_tabs, limits, attempts, context_options))
+        try:
+            while True:
+                item = results.get()
+                if item is _DONE:
+                    break
+                if item[0] == "fatal":
+                    raise item[1]
+                yield item[1:]
+        finally:
+            stop.set()
+            try:
+                run.result()
+            except Exception:
+                pass  # Already reported through `results`
+
+
+async def _load(page, job: PageJob) -> str:
+    await page.goto(job.url, timeout=job.timeout)
+
+    if job.prepare:
+        await job.prepare(page)
+
+    if job.wait_selector:
+        try:
+            await page.wait_for_selector(job.wait_selector, timeout=job.wait_timeout)
+        except Exception:
+            logger.warning(f"AsyncEngine: Timeout waiting for '{job.wait_selector}' on {job.url}")
+
+    # Scroll to load lazy content, pausing like a human would
+    for _ in range(job.scrolls):
+        await page.mouse.wheel(0, random.randint(*job.scroll_px))
+        await asyncio.sleep(random.uniform(*job.scroll_pause))
+
+    return await page.content()
+
+
+async def _run(engine, jobs, results, stop, max_tabs, host_limits, attempts, context_options):
+    try:
+        browser = await engine.browser()
+        context = await browser.new_context(**context_options)
+        try:
+            tabs = asyncio.Semaphore(max_tabs)
+            hosts = {}
+
+            async def worker(job: PageJob):
+                if job.host not in hosts:
+                    hosts[job.host] = asyncio.Semaphore(host_limits.get(job.host, DEFAULT_HOST_LIMIT))
+
+                # Take the host slot first so a waiting job never sits on a tab slot
+                async with hosts[job.host]:
+                    if stop.is_set():
+                        return
+                    for attempt in range(1, attempts + 1):
+                        html, error = None, None
+                        async with tabs:
+                            page = await context.new_page()
+                            try:
+                                await Stealth().apply_stealth_async(page)
+                                html = await _load(page, job)
+                            except Exception as e:
+                                error = e
+                            finally:
+                                try:
+                                    await page.close()
+                                except Exception:
+                                    pass
+                        if error is None or attempt == attempts or stop.is_set():
+                            break
+                        logger.warning(f"AsyncEngine: Attempt {attempt}/{attempts} failed for {job.url}: {error}")
+                        await asyncio.sleep(min(10, 2 ** attempt))
+                    results.put(("page", job, html, error))
+                    await asyncio.sleep(random.uniform(*job.cooldown))
+
+            logger.info(f"AsyncEngine: Fetching {len(jobs)} pages with up to {max_tabs} tabs")
+            await asyncio.gather(*(worker(job) for job in jobs))
+        finally:
+            # The browser stays up for the lane's next call; only this call's context goes
+            try:
+                await context.close()
+            except Exception:
+                pass
+    except Exception as e:
+        results.put(("fatal", e))
+    finally:
+        results.put(_DONE)
@@ -0,0 +1,123 @@
+"""
+Micro-benchmark: keyword_matcher vs the per-keyword `in` loops it replaced.
+
+Builds a reproducible corpus of 100k listing titles + skills, runs the old
+loop-based checks and the compiled matchers over it, checks both give the
+same answer for every title, and prints the timings.
+
+    python benchmarks/keyword_matcher_bench.py [--titles 100000] [--repeat 3]
+
+Expect modest gains, roughly 1.1-1.5x with run-to-run noise: the lists are
+short, CPython's `in` is fast on short titles, and is_valid_internship
+spends much of its time outside keyword matching.
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import filters  # noqa: E402
+from keyword_matcher import KeywordMatcher  # noqa: E402
+
+ROLES = [
+    "Software Engineering Intern", "Data Analyst", "Machine Learning Intern", "Research Intern, Computer Vision",
+    "Marketing Associate", "Product Design Intern", "Backend Developer", "AI Research Intern (LLM)",
+    "Business Development Executive", "Summer Analyst", "Operations Manager", "NLP Engineer Intern",
+    "Full Stack Developer Intern", "Content Writer", "Quantitative Research Intern", "Robotics Software Intern",
+    "Senior Data Scientist", "Cloud Infrastructure Intern", "Generative AI Intern", "Deep Learning Research Intern",
+    "Speech Recognition Intern", "Finance Intern", "MLOps Intern", "German-speaking Sales Intern",
+]
+COMPANIES = ["Google", "Microsoft", "Acme Labs", "Tata Consultancy Services", "Flipkart", "Zomato", "OpenAI",
+             "Nvidia", "Infosys", "IISc Bangalore", "a seed-stage startup"]
+SKILLS = ["Python", "Java", "SQL", "Excel", "React", "PyTorch", "TensorFlow", "Communication", "AWS", "Docker",
+          "Figma", "C++", "Statistics", "Kubernetes", "Transformers", "Large Language Models", "Full-time availability"]
+
+# The checks as they were before keyword_matcher
+RSS_AI_KEYWORDS = [
+    "machine learning", "artificial intelligence", "deep learning", "nlp",
+    "data science", "computer vision", "ai", " ml ", "mlops", "generative",
+    "llm", "neural", "research intern", "ai intern", "ml intern",
+]
+
+
+def legacy_is_valid_internship(title, skills, source=""):
+    title_lower = title.lower()
+    text_to_check = title_lower + " " + " ".join(s.lower() for s in skills)
+    if "intern" not in title_lower and source not in ["internshala", "unstop"]:
+        return False
+    for exc in filters.EXCLUDE_KEYWORDS:
+        if exc in text_to_check:
+            return False
+    now = datetime.now()
+    target_year = now.year + (1 if now.month > 5 else 0)
+    for i in range(1, 10):
+        if str(target_year - i) in text_to_check:
+            return False
+    for inc in filters.INCLUDE_KEYWORDS:
+        if inc in text_to_check:
+            return True
+    return False
+
+
+def legacy_rss_matches(text):
+    text_lower = text.lower()
+    return any(kw in text_lower for kw in RSS_AI_KEYWORDS)
+
+
+def build_corpus(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    year = datetime.now().year
+    corpus = []
+    for _ in range(count):
+        title = rng.choice(ROLES)
+        if rng.random() < 0.3:
+            title += f" - Summer {rng.choice([year - 1, year, year + 1])}"
+        if rng.random() < 0.5:
+            title += f" at {rng.choice(COMPANIES)}"
+        corpus.append((title, rng.sample(SKILLS, rng.randint(2, 6))))
+    return corpus
+
+
+def timed(label, fn, items, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [fn(item) for item in items]
+        best = min(best, time.perf_counter() - start)
+    return label, best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--titles", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the best is reported")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.titles)
+    rss_matcher = KeywordMatcher({"ai_ml": RSS_AI_KEYWORDS})
+    texts = [f"{title} {' '.join(skills)}" for title, skills in corpus]
+
+    cases = [
+        ("is_valid_internship", corpus,
+         lambda item: legacy_is_valid_internship(*item), lambda item: filters.is_valid_internship(*item)),
+        ("rss AI/ML check", texts, legacy_rss_matches, rss_matcher.matches),
+    ]
+
+    print(f"{len(corpus):,} titles, best of {args.repeat}\n")
+    print(f"{'case':<22}{'loops':>10}{'matcher':>10}{'speedup':>10}")
+    for name, items, legacy, compiled in cases:
+        _, old_time, old_results = timed("loops", legacy, items, args.repeat)
+        _, new_time, new_results = timed("matcher", compiled, items, args.repeat)
+        if old_results != new_results:
+            mismatches = sum(a != b for a, b in zip(old_results, new_results))
+            raise SystemExit(f"{name}: results differ on {mismatches} titles")
+        print(f"{name:<22}{old_time:>9.3f}s{new_time:>9.3f}s{old_time / new_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
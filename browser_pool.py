@@ -0,0 +1,167 @@
+"""
+Shared Playwright Browser Pool
+──────────────────────────────
+Launches Chromium once and hands every browser scraper a stealth-configured
+page from a reusable context, instead of each scraper cold-starting its own
+`sync_playwright()` + Chromium.
+
+Playwright's sync API is bound to the thread that started it, so pools are
+per-thread: `run_scrapers` opens one `browser_session()` per lane worker and
+every scraper that worker runs shares the same browser. Contexts are keyed by
+their options (user agent, viewport, locale) and recycled after
+MAX_NAVIGATIONS_PER_CONTEXT main-frame navigations to keep cookies/memory
+from piling up. A context can only be swapped when a page is opened, so
+scrapers that walk many pages open a fresh `pool.page()` per page or unit
+rather than navigating one page throughout. The multi-tab async engine
+(async_engine.fetch_pages) keeps its own Chromium in the same pool, so it too
+launches once per lane.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from loguru import logger
+from playwright.sync_api import sync_playwright
+from playwright_stealth import Stealth
+
+from scraper_utils import get_playwright_stealth_args
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/122.0.0.0 Safari/537.36"
+)
+DEFAULT_VIEWPORT = {"width": 1440, "height": 900}
+MAX_NAVIGATIONS_PER_CONTEXT = 30
+
+_local = threading.local()
+
+
+class BrowserPool:
+    """One Chromium instance plus a small set of recyclable stealth contexts."""
+
+    def __init__(self, headless=True, max_navigations=MAX_NAVIGATIONS_PER_CONTEXT):
+        self.headless = headless
+        self.max_navigations = max_navigations
+        self.launches = 0
+        self._playwright = None
+        self._browser = None
+        self._contexts = {}  # options key -> {"context": ..., "navigations": int}
+        self._async_browser = None
+
+    def _ensure_browser(self):
+        """Launches Chromium lazily, and again if a previous instance crashed."""
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
+
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+
+        self._contexts.clear()
+        self._browser = self._playwright.chromium.launch(
+            headless=self.headless,
+            args=get_playwright_stealth_args(),
+        )
+        self.launches += 1
+        logger.info(f"BrowserPool: Launched Chromium ({threading.current_thread().name}, launch #{self.launches})")
+        return self._browser
+
+    def _context_for(self, options: dict) -> dict:
+        key = tuple(sorted((k, repr(v)) for k, v in options.items()))
+        entry = self._contexts.get(key)
+
+        if entry and entry["navigations"] >= self.max_navigations:
+            logger.debug(f"BrowserPool: Recycling context after {entry['navigations']} navigations")
+            try:
+                entry["context"].close()
+            except Exception:
+                pass
+            entry = None
+
+        if entry is None:
+            context = self._ensure_browser().new_context(**options)
+            entry = {"context": context, "navigations": 0}
+            self._contexts[key] = entry
+
+        return entry
+
+    @contextmanager
+    def page(self, user_agent=DEFAULT_USER_AGENT, viewport=None, **context_options):
+        """
+        Yields a fresh stealth page in a shared context. The page is closed on
+        exit; the context and browser stay alive for the next scraper.
+        Open one page per unit of work: recycling is checked here.
+        """
+        self._ensure_browser()
+        options = {"user_agent": user_agent, "viewport": viewport or DEFAULT_VIEWPORT, **context_options}
+        entry = self._context_for(options)
+
+        page = entry["context"].new_page()
+        Stealth().apply_stealth_sync(page)
+
+        def _count_navigation(frame):
+            if frame == page.main_frame:
+                entry["navigations"] += 1
+
+        page.on("framenavigated", _count_navigation)
+        try:
+            yield page
+        finally:
+            try:
+                page.close()
+            except Exception:
+                pass
+
+    def async_browser(self):
+        """This pool's async_engine.AsyncBrowser, created on first use and closed with the pool."""
+        if self._async_browser is None:
+            from async_engine import AsyncBrowser  # async_engine imports this module
+            self._async_browser = AsyncBrowser(headless=self.headless)
+        return self._async_browser
+
+    def close(self):
+        if self._async_browser is not None:
+            self._async_browser.close()
+            self._async_browser = None
+
+        for entry in self._contexts.values():
+            try:
+                entry["context"].close()
+            except Exception:
+                pass
+        self._contexts.clear()
+
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+
+@contextmanager
+def browser_session(headless=True):
+    """
+    Yields this thread's BrowserPool. If none is active (e.g. a scraper called
+    directly), a new pool is created for the duration of the block and shut
+    down afterwards; nested sessions reuse the outer pool.
+    """
+    pool = getattr(_local, "pool", None)
+    if pool is not None:
+        yield pool
+        return
+
+    pool = BrowserPool(headless=headless)
+    _local.pool = pool
+    try:
+        yield pool
+    finally:
+        _local.pool = None
+        pool.close()
@@ -0,0 +1,129 @@
+"""
+Run Checkpoints
+───────────────
+Remembers which units of the current run already finished — a unit is one
+LinkedIn search, one university query, one dork, one results page — so an
+interrupted run started again with `--resume` (or `"resume": true` in the
+/api/scrape config) skips straight to the work it had not done yet.
+
+Scrapers mark a unit done only after its batch has been handed back to
+`process_stream`. When a RunWriter buffers those batches, the checkpoint is
+`deferred`: marks are only persisted by the writer right after the rows they
+cover are committed, so a skipped unit never means lost listings.
+Outside of `run_scrapers` no checkpoint is active and nothing is skipped.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from loguru import logger
+
+CHECKPOINT_FILE = Path(__file__).parent / "scraper_checkpoint.json"
+
+
+class RunCheckpoint:
+    """Completed (source, unit) pairs of one run, persisted after every update."""
+
+    def __init__(self, path: Path = CHECKPOINT_FILE, enabled: bool = True):
+        self.path = path
+        self.enabled = enabled
+        self.started = None
+        self.config = None
+        self.completed = {}  # source -> set of unit keys
+        self.deferred = False  # if set, only save() persists marks
+        self._lock = threading.Lock()
+
+    def start(self, config: dict, resume: bool = False):
+        if not self.enabled:
+            return
+
+        if resume and self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                self.started = data.get("started")
+                self.config = data.get("config")
+                self.completed = {src: set(units) for src, units in data.get("completed", {}).items()}
+                done = sum(len(units) for units in self.completed.values())
+                logger.info(f"⏩ Resuming run from {self.started}: {done} units already completed.")
+                return
+            except Exception as e:
+                logger.warning(f"Could not read checkpoint, starting fresh: {e}")
+
+        self.started = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.config = config
+        self.completed = {}
+        with self._lock:
+            self._save()
+
+    def is_done(self, source: str, unit: str) -> bool:
+        return unit in self.completed.get(source, ())
+
+    def mark_done(self, source: str, unit: str):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.completed.setdefault(source, set()).add(unit)
+            if not self.deferred:
+                self._save()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {src: set(units) for src, units in self.completed.items()}
+
+    def save(self, completed: dict = None):
+        """Persists `completed` (a snapshot() taken earlier) or the current marks."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._save(completed)
+
+    def finish(self):
+        """The run completed cleanly: nothing left to resume."""
+        if not self.enabled:
+            return
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _save(self, completed: dict = None):
+        if completed is None:
+            completed = self.completed
+        data = {
+            "started": self.started,
+            "config": self.config,
+            "completed": {src: sorted(units) for src, units in completed.items()},
+        }
+
+        # Atomic write so a crash mid-save never leaves a torn checkpoint
+        fd, temp_path = tempfile.mkstemp(dir=self.path.parent, text=True)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.path)
+
+
+_active = RunCheckpoint(enabled=False)
+
+
+def get_checkpoint() -> RunCheckpoint:
+    """The checkpoint of the run in progress (a no-op one if there is none)."""
+    return _active
+
+
+def begin_run(config: dict, resume: bool = False) -> RunCheckpoint:
+    global _active
+    _active = RunCheckpoint()
+    _active.start(config, resume=resume)
+    return _active
+
+
+def end_run(completed: bool):
+    """Clears the checkpoint after a clean run; keeps it for `--resume` otherwise."""
+    global _active
+    if completed:
+        _active.finish()
+    _active = RunCheckpoint(enabled=False)
@@ -0,0 +1,111 @@
+"""
+Response Compression + Listing Snapshot
+───────────────────────────────────────
+gzip (always) and brotli (if the optional `brotli` package is installed)
+encoders for API responses, plus a pre-compressed snapshot of the full
+listing array in each payload format (rows and columnar, see
+store.to_columnar).
+
+The snapshot is written once at the end of each `run_scrapers` call, at the
+best compression level, and tagged with the store version it was built
+from. `/api/internships` serves it straight from disk, in whichever format
+was asked for, while the store is still at that version, so neither the scraper nor the dashboard has to
+re-serialize and re-compress the whole history for every page load.
+"""
+
+import gzip
+import json
+import os
+import tempfile
+
+from loguru import logger
+
+import store
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MIN_COMPRESS_BYTES = 1024  # smaller bodies are not worth the CPU / headers
+SNAPSHOT_FORMATS = ("rows", "columnar")
+SNAPSHOT_EXTENSIONS = {"gzip": "gz", "br": "br"}
+
+
+def snapshot_file(fmt: str, encoding: str):
+    return store.DATA_DIR / f"internships.snapshot.{fmt}.json.{SNAPSHOT_EXTENSIONS[encoding]}"
+
+
+def available_encodings() -> list:
+    """Supported content-codings, most preferred first."""
+    return (["br"] if brotli is not None else []) + ["gzip"]
+
+
+def negotiate(accept_encoding: str):
+    """Picks the best encoding the client accepts, or None for identity."""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    for encoding in available_encodings():
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, best: bool = False) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if best else 5)
+    if encoding == "gzip":
+        # mtime=0 keeps the output (and anything hashed from it) deterministic
+        return gzip.compress(body, compresslevel=9 if best else 6, mtime=0)
+    raise ValueError(f"unsupported encoding: {encoding}")
+
+
+# ── Snapshot ─────────────────────────────────────────────────────────────────
+
+def write_snapshot() -> int:
+    """
+    Compresses the full listing array in every payload format and available
+    encoding, and records the store version it reflects. Returns that version.
+    """
+    version = store.get_version()
+    listings = store.fetch_listings()
+    payloads = {"rows": listings, "columnar": store.to_columnar(listings)}
+
+    for fmt in SNAPSHOT_FORMATS:
+        body = json.dumps(payloads[fmt], sort_keys=True).encode("utf-8")
+        for encoding in available_encodings():
+            path = snapshot_file(fmt, encoding)
+            fd, temp_path = tempfile.mkstemp(dir=path.parent)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(compress(body, encoding, best=True))
+                os.replace(temp_path, path)
+            except Exception:
+                os.unlink(temp_path)
+                raise
+
+    # Marked valid only once every file is in place
+    store.set_meta("snapshot_version", str(version))
+    logger.debug(f"Wrote listing snapshots for store version {version} ({len(listings)} listings)")
+    return version
+
+
+def read_snapshot(version: int, encoding: str, fmt: str = "rows"):
+    """The snapshot bytes for `fmt` and `encoding` if they match store `version`, else None."""
+    if fmt not in SNAPSHOT_FORMATS or encoding not in SNAPSHOT_EXTENSIONS:
+        return None
+    if store.get_meta("snapshot_version") != str(version):
+        return None
+    path = snapshot_file(fmt, encoding)
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return None
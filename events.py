@@ -0,0 +1,104 @@
+"""
+In-Process Event Bus
+────────────────────
+Scraper code publishes what happens (status changes, log lines, action
+alerts, newly saved listings) and every open dashboard receives it over the
+`/api/events` Server-Sent Events stream, instead of each tab polling files
+on disk every few seconds.
+
+Subscribers get a bounded queue each; a subscriber that stops reading just
+misses events rather than blocking the scraper. The latest "status" and
+"alert" events are remembered so a dashboard that connects mid-run starts
+from the current state.
+"""
+
+import json
+import threading
+from queue import Queue, Full, Empty
+
+from loguru import logger
+
+SUBSCRIBER_QUEUE_SIZE = 500
+HEARTBEAT_SECONDS = 15
+STICKY_EVENTS = ("status", "alert")  # replayed to new subscribers
+
+
+class EventBus:
+    def __init__(self):
+        self._subscribers = set()
+        self._sticky = {}
+        self._lock = threading.Lock()
+
+    def publish(self, event: str, data):
+        with self._lock:
+            if event in STICKY_EVENTS:
+                self._sticky[event] = data
+            subscribers = list(self._subscribers)
+        for queue in subscribers:
+            try:
+                queue.put_nowait((event, data))
+            except Full:
+                pass  # A stalled client misses events instead of stalling the scraper
+
+    def subscribe(self) -> Queue:
+        queue = Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            for event, data in self._sticky.items():
+                queue.put_nowait((event, data))
+            self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: Queue):
+        with self._lock:
+            self._subscribers.discard(queue)
+
+    def has_subscribers(self) -> bool:
+        with self._lock:
+            return bool(self._subscribers)
+
+    def stream(self, heartbeat: float = HEARTBEAT_SECONDS, queue: Queue = None):
+        """
+        Yields Server-Sent Events text for one client until it disconnects.
+        Pass `queue` to stream a subscription made in advance.
+        """
+        queue = queue or self.subscribe()
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event, data = queue.get(timeout=heartbeat)
+                except Empty:
+                    yield ": ping\n\n"  # Keeps proxies from closing an idle stream
+                    continue
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        finally:
+            self.unsubscribe(queue)
+
+
+bus = EventBus()
+
+
+def publish(event: str, data):
+    bus.publish(event, data)
+
+
+def _log_sink(message):
+    publish("log", message.record["time"].strftime("%Y-%m-%d %H:%M:%S") + " | " + message.record["message"])
+
+
+_sink_id = None
+
+
+def install_log_sink():
+    """Streams every INFO+ log line to subscribers (same lines as scraper_run.log)."""
+    global _sink_id
+    if _sink_id is None:
+        _sink_id = logger.add(_log_sink, level="INFO", format="{message}")
+
+
+def remove_log_sink():
+    """Stops streaming this process's log lines (e.g. when another process does the scraping)."""
+    global _sink_id
+    if _sink_id is not None:
+        logger.remove(_sink_id)
+        _sink_id = None
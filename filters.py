@@ -1,6 +1,9 @@
 import re
 import dateparser
 from datetime import datetime
+from functools import lru_cache
+
+from keyword_matcher import KeywordMatcher
 
 INCLUDE_KEYWORDS = [
     "artificial intelligence", "machine learning", "deep learning",
@@ -20,6 +23,20 @@ EXCLUDE_KEYWORDS = [
     "japanese", "german", "french", "mandarin", "spanish", "korean"
 ]
 
+# Keywords that earn the +20 in calculate_match_score
+CORE_KEYWORDS = ["research", "deep learning", "computer vision", "generative ai", "nlp", "scientist"]
+
+_CORE_MATCHER = KeywordMatcher({"core": CORE_KEYWORDS})
+
+
+@lru_cache(maxsize=2)
+def _internship_matcher(target_year: int) -> KeywordMatcher:
+    """Exclusions plus the nine years before `target_year`, and inclusions."""
+    return KeywordMatcher({
+        "reject": EXCLUDE_KEYWORDS + [str(target_year - i) for i in range(1, 10)],
+        "include": INCLUDE_KEYWORDS,
+    })
+
 def is_valid_internship(title: str, skills: list, source: str = "") -> bool:
     """
     Checks if the internship title or skills match our desired keywords
@@ -36,25 +53,16 @@ def is_valid_internship(title: str, skills: list, source: str = "") -> bool:
     if not "intern" in title_lower and not is_internship_platform:
         return False
 
-    # Check for exclusions first
-    for exc in EXCLUDE_KEYWORDS:
-        if exc in text_to_check:
-            return False
-            
-    # Reject explicitly past years in title or text
     now = datetime.now()
     target_year = now.year + (1 if now.month > 5 else 0)
-    for i in range(1, 10):
-        past_year = str(target_year - i)
-        if past_year in text_to_check:
-            return False
+    matcher = _internship_matcher(target_year)
 
-    # Check for inclusions: Title OR Skills must have at least one keyword
-    for inc in INCLUDE_KEYWORDS:
-        if inc in text_to_check:
-            return True
+    # Exclusions and explicitly past years in title or text reject outright
+    if matcher.matches(text_to_check, "reject"):
+        return False
 
-    return False
+    # Title OR Skills must have at least one inclusion keyword
+    return matcher.matches(text_to_check, "include")
 
 def is_valid_stipend(stipend_str: str, numeric_val: float, is_india: bool) -> bool:
     """
@@ -137,12 +145,9 @@ def calculate_match_score(title: str, skills: list, org_type: str, stipend: floa
     skills_lower = [s.lower() for s in skills]
     text_to_check = title_lower + " " + " ".join(skills_lower)
     
-    core_keywords = ["research", "deep learning", "computer vision", "generative ai", "nlp", "scientist"]
-    for word in core_keywords:
-        if word in text_to_check:
-            score += 20
-            break
-            
+    if _CORE_MATCHER.matches(text_to_check):
+        score += 20
+
     if org_type in ["Institution", "Government"]:
         score += 15
         
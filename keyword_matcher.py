@@ -0,0 +1,60 @@
+"""
+Keyword Matcher
+───────────────
+Tells whether a text contains any keyword of a list, with one regex search
+instead of running `kw in text` for every entry of the list.
+
+Each category's keywords go into a character trie, which is emitted as a
+single regex with shared prefixes factored out, e.g.
+"ai(?: (?:intern|research))?". The search walks the text once and, at each
+position, only follows the branches that the next character allows, so the
+cost barely grows with the number of keywords. A search stops at the first
+hit, just like the `any(...)` loops it replaces. Each category is its own
+search (see matches()), so callers keep their short-circuit order, e.g.
+exclusions before inclusions.
+
+Matching is plain case-insensitive substring matching, the same semantics
+as the `in` checks it replaces.
+"""
+
+import re
+
+
+def _trie_pattern(keywords) -> str:
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[""] = True  # end of a keyword
+
+    def emit(node):
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # A keyword ends here, so what follows is optional
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+
+def _compile(keywords):
+    keywords = {kw.lower() for kw in keywords if kw}
+    if not keywords:
+        raise ValueError("KeywordMatcher needs at least one keyword per category")
+    return re.compile(_trie_pattern(keywords))
+
+
+class KeywordMatcher:
+    """Compiled matcher for {category: [keywords]}."""
+
+    def __init__(self, categories: dict):
+        self.names = tuple(categories)
+        self._searches = {name: _compile(keywords).search for name, keywords in categories.items()}
+        self._any = _compile([kw for keywords in categories.values() for kw in keywords]).search
+
+    def matches(self, text: str, category: str = None) -> bool:
+        """True if `text` contains any keyword (of `category`, if given)."""
+        search = self._any if category is None else self._searches[category]
+        return search((text or "").lower()) is not None
@@ -0,0 +1,184 @@
+"""
+Location Normalizer
+───────────────────
+Decides a listing's `location_type` (India / International / Remote) from
+what the listing itself says, once, when it is stored, rather than leaving
+each scraper to guess from the search query that found it and the
+dashboard to re-guess on every page view.
+
+Two prebuilt indexes do the work:
+
+  gazetteer      hash of city / country / region words and phrases, matched
+                 against the tokens of the location text (so "Indiana"
+                 never counts as "India"). Short forms that are also
+                 English words ("US") only count as the whole location.
+  domain trie    apply-link host suffixes, walked label by label from the
+                 TLD inward, so "iitb.ac.in" is Indian and "cmu.edu" is not
+
+The order of precedence:
+  1. remote wording in the location, or an explicit remote phrase in the
+     company name (generic words like "distributed" are only trusted in
+     the location: "Distributed Systems Lab" is not a remote listing)
+  2. the link's domain
+  3. places named in the location
+  4. whatever the scraper said
+
+Bump RULES_VERSION whenever the rules change: the store then
+re-normalizes every stored listing once (see store.renormalize_locations).
+"""
+
+import re
+from urllib.parse import urlparse
+
+RULES_VERSION = 3
+
+INDIA, INTERNATIONAL, REMOTE = "India", "International", "Remote"
+
+REMOTE_TERMS = ("remote", "work from home", "wfh", "anywhere", "distributed", "fully remote")
+COMPANY_REMOTE_TERMS = ("remote", "work from home", "fully remote")
+
+INDIA_PLACES = (
+    "india", "bharat",
+    "bangalore", "bengaluru", "mumbai", "bombay", "navi mumbai", "delhi", "new delhi", "ncr",
+    "hyderabad", "secunderabad", "pune", "chennai", "madras", "kolkata", "calcutta",
+    "ahmedabad", "noida", "greater noida", "gurgaon", "gurugram", "faridabad", "ghaziabad",
+    "kochi", "cochin", "thiruvananthapuram", "trivandrum", "coimbatore", "mysore", "mysuru",
+    "mangalore", "mangaluru", "jaipur", "chandigarh", "mohali", "indore", "bhopal", "nagpur",
+    "lucknow", "kanpur", "bhubaneswar", "visakhapatnam", "vizag", "vijayawada", "surat",
+    "vadodara", "goa", "guwahati", "patna", "ranchi", "dehradun", "roorkee", "kharagpur",
+    "karnataka", "maharashtra", "tamil nadu", "telangana", "kerala", "gujarat", "west bengal",
+    "uttar pradesh", "rajasthan", "haryana", "punjab", "odisha", "andhra pradesh",
+)
+
+INTERNATIONAL_PLACES = (
+    "usa", "united states", "america", "canada", "uk", "united kingdom", "england",
+    "scotland", "ireland", "germany", "france", "netherlands", "switzerland", "sweden",
+    "norway", "denmark", "finland", "austria", "belgium", "spain", "italy", "portugal",
+    "poland", "europe", "singapore", "japan", "korea", "china", "hong kong", "taiwan",
+    "australia", "new zealand", "uae", "dubai", "abu dhabi", "saudi arabia", "israel",
+    "brazil", "mexico",
+    "london", "cambridge", "oxford", "edinburgh", "berlin", "munich", "paris", "amsterdam",
+    "zurich", "stockholm", "toronto", "montreal", "vancouver", "new york", "san francisco",
+    "seattle", "boston", "mountain view", "palo alto", "bay area", "tokyo", "seoul",
+    "sydney", "melbourne", "tel aviv",
+)
+
+# Only recognised when they are the entire location: "Join us remotely" is not the US
+WHOLE_VALUE_PLACES = {
+    INTERNATIONAL: ("us", "u s", "u s a"),
+}
+
+# Host suffixes; a longer match wins, so ".edu.in" beats ".edu"
+DOMAIN_SUFFIXES = {
+    INDIA: ("ac.in", "edu.in", "co.in", "res.in", "gov.in", "nic.in", "org.in", "net.in"),
+    INTERNATIONAL: ("edu", "gov", "ac.uk", "co.uk", "de", "fr", "nl", "se", "fi", "dk", "no",
+                    "ch", "at", "be", "sg", "jp", "kr", "cn", "au", "nz", "ca", "ae", "sa",
+                    "il", "br"),
+}
+
+
+# ── Indexes (built once at import) ───────────────────────────────────────────
+
+def _build_gazetteer():
+    gazetteer = {}
+    # Later groups win on a clash, so remote wording takes precedence over places
+    for location_type, phrases in ((INTERNATIONAL, INTERNATIONAL_PLACES), (INDIA, INDIA_PLACES),
+                                   (REMOTE, REMOTE_TERMS)):
+        for phrase in phrases:
+            gazetteer[phrase] = location_type
+    return gazetteer, max(len(p.split()) for p in gazetteer)
+
+
+_GAZETTEER, _MAX_PHRASE_WORDS = _build_gazetteer()
+_WHOLE_VALUES = {value: location_type for location_type, values in WHOLE_VALUE_PLACES.items()
+                 for value in values}
+_VALUE = ""  # trie key holding a node's location type (never a valid host label)
+
+
+def _build_domain_trie():
+    trie = {}
+    for location_type, suffixes in DOMAIN_SUFFIXES.items():
+        for suffix in suffixes:
+            node = trie
+            for label in reversed(suffix.split(".")):
+                node = node.setdefault(label, {})
+            node[_VALUE] = location_type
+    return trie
+
+
+_DOMAIN_TRIE = _build_domain_trie()
+_TOKEN = re.compile(r"[a-z]+")
+
+
+# ── Lookups ──────────────────────────────────────────────────────────────────
+
+def _phrases(text: str):
+    """Every run of up to _MAX_PHRASE_WORDS consecutive words in `text`."""
+    tokens = _TOKEN.findall((text or "").lower())
+    for i in range(len(tokens)):
+        for n in range(1, min(_MAX_PHRASE_WORDS, len(tokens) - i) + 1):
+            yield " ".join(tokens[i:i + n])
+
+
+def places_in(text: str) -> set:
+    """Location types of every gazetteer word or phrase in `text`."""
+    whole = _WHOLE_VALUES.get(" ".join(_TOKEN.findall((text or "").lower())))
+    if whole:
+        return {whole}
+    found = set()
+    for phrase in _phrases(text):
+        location_type = _GAZETTEER.get(phrase)
+        if location_type:
+            found.add(location_type)
+    return found
+
+
+def domain_type(url: str):
+    """The location type implied by the link's host suffix, or None."""
+    url = (url or "").strip()
+    if not url:
+        return None
+    try:
+        host = urlparse(url if "//" in url else "//" + url).hostname or ""
+    except ValueError:
+        return None
+    node, location_type = _DOMAIN_TRIE, None
+    for label in reversed(host.split(".")):
+        node = node.get(label)
+        if node is None:
+            break
+        location_type = node.get(_VALUE, location_type)
+    return location_type
+
+
+def classify(location: str = "", url: str = "", company: str = "", default=None):
+    """The location type for one listing (`default` if nothing decides it)."""
+    in_location = places_in(location)
+    if REMOTE in in_location or any(p in COMPANY_REMOTE_TERMS for p in _phrases(company)):
+        return REMOTE
+
+    by_domain = domain_type(url)
+    if by_domain:
+        return by_domain
+
+    if INDIA in in_location:
+        return INDIA
+    if INTERNATIONAL in in_location:
+        return INTERNATIONAL
+    return default
+
+
+def normalize(record: dict) -> bool:
+    """Sets record["location_type"] in place. Returns True if it changed."""
+    current = record.get("location_type") or None
+    location_type = classify(record.get("location", ""), record.get("apply_link", ""),
+                             record.get("company_name", ""), default=current)
+    if location_type != current:
+        record["location_type"] = location_type
+        return True
+    return False
+
+
+def normalize_many(records) -> int:
+    """Normalizes a batch in place. Returns how many records changed."""
+    return sum(normalize(record) for record in records)
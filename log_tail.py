@@ -0,0 +1,97 @@
+"""
+Log Tail Reader
+───────────────
+Reads the end of scraper_run.log without loading the whole file: the last N
+lines come from seeking backwards in blocks, and new lines are read from a
+cursor onwards, so each call costs the bytes it returns, not the file size.
+
+A cursor is "<file id>:<byte offset>". loguru rotates the log by renaming
+it and starting a new file, so a changed file id (or a file shorter than the
+offset) means the cursor points into a rotated-away file. Reading then
+starts over at the top of the new file and reports `rotated`.
+"""
+
+import os
+from pathlib import Path
+
+BLOCK_SIZE = 8192
+MAX_READ_BYTES = 256 * 1024  # per read_after() call; the cursor picks up the rest
+
+
+def _file_id(st: os.stat_result) -> str:
+    # st_ino is the file index on Windows too; ctime covers filesystems without one
+    return str(st.st_ino or int(st.st_ctime))
+
+
+def make_cursor(st: os.stat_result, offset: int) -> str:
+    return f"{_file_id(st)}:{offset}"
+
+
+def parse_cursor(cursor: str):
+    """Returns (file id or None, offset); a bare number is a plain offset."""
+    file_id, _, offset = str(cursor).rpartition(":")
+    try:
+        return (file_id or None), max(0, int(offset))
+    except ValueError:
+        raise ValueError(f"invalid log cursor: {cursor}")
+
+
+def _decode(chunk: bytes) -> list:
+    return [line.rstrip("\r") for line in chunk.decode("utf-8", errors="replace").split("\n")]
+
+
+def tail(path: Path, count: int = 75):
+    """
+    The last `count` complete lines of `path` and a cursor just past them.
+    Returns ([], None) if the file does not exist.
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return [], None
+
+    with f:
+        st = os.fstat(f.fileno())
+        pos = st.st_size
+        data = b""
+        while pos > 0 and data.count(b"\n") <= count:
+            step = min(BLOCK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+
+    # Leave a half-written last line behind the cursor; it is returned once complete
+    cut = data.rfind(b"\n")
+    if cut == -1:
+        return [], make_cursor(st, pos)
+    lines = _decode(data[:cut])
+    if pos > 0:
+        lines = lines[1:]  # First line may be cut off mid-way
+    return lines[-count:], make_cursor(st, pos + cut + 1)
+
+
+def read_after(path: Path, cursor: str, max_bytes: int = MAX_READ_BYTES):
+    """
+    Complete lines written after `cursor`.
+    Returns (lines, new cursor, rotated).
+    """
+    file_id, offset = parse_cursor(cursor)
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return [], cursor, False
+
+    with f:
+        st = os.fstat(f.fileno())
+        rotated = (file_id is not None and file_id != _file_id(st)) or offset > st.st_size
+        if rotated:
+            offset = 0
+
+        f.seek(offset)
+        chunk = f.read(min(max_bytes, st.st_size - offset))
+
+    # Only hand out complete lines; a partial one stays behind the cursor
+    cut = chunk.rfind(b"\n")
+    if cut == -1:
+        return [], make_cursor(st, offset), rotated
+    return _decode(chunk[:cut]), make_cursor(st, offset + cut + 1), rotated
@@ -1,113 +1,190 @@
-import json
 import csv
-import pandas as pd
+import heapq
+import os
+import tempfile
+import threading
+import time
 from datetime import datetime
-from pathlib import Path
 
-# Paths relative to this file
-DATA_DIR = Path(__file__).parent
-LOG_FILE = DATA_DIR / "internships_log.json"
-CSV_FILE = DATA_DIR / "internships.csv"
+from loguru import logger
 
-CSV_HEADERS = [
-    "id", "company_name", "role_title", "location", "location_type",
-    "duration", "stipend", "stipend_numeric", "stipend_currency",
-    "required_skills", "application_deadline", "apply_link",
-    "source_platform", "date_scraped", "is_new", 
-    "org_type", "role_type", "match_score"
-]
+import store
+from seen_index import get_seen_index
+from checkpoint import get_checkpoint
+import events
+
+# Column order of a stored listing (also the CSV export header)
+CSV_HEADERS = store.COLUMNS
+
+# internships.csv stays around as a spreadsheet-friendly export of the store.
+# During a run new rows only ever get appended to a segment file (cost is the
+# size of the batch); compact_csv() merges the segment into the sorted export
+# once, at the end of run_scrapers, and swaps it in atomically.
+CSV_FILE = store.LEGACY_CSV_FILE
+CSV_SEGMENT_FILE = store.DATA_DIR / "internships.segment.csv"
 
 def load_log():
-    if LOG_FILE.exists():
-        with open(LOG_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+    """The old internships_log.json shape, now read from the listing store."""
     return {
-        "last_run": None,
-        "total_scraped": 0,
-        "seen_ids": [],
-        "run_history": []
+        "last_run": store.get_meta("last_run"),
+        "total_scraped": store.count_listings(),
+        "seen_ids": store.listing_ids(),
+        "run_history": store.fetch_run_history()
     }
 
-def save_log(log_data):
-    with open(LOG_FILE, "w", encoding="utf-8") as f:
-        json.dump(log_data, f, indent=2)
-
 def is_duplicate(internship_id: str, log_data: dict = None) -> bool:
-    if log_data is None:
-        log_data = load_log()
-    return internship_id in log_data.get("seen_ids", [])
+    if log_data is not None:
+        return internship_id in log_data.get("seen_ids", [])
+    return internship_id in get_seen_index()
 
 def append_to_csv(internships: list) -> int:
     """
-    Saves a list of internship dicts to CSV. 
-    Also updates the json log.
+    Saves a list of internship dicts to the listing store in one batch,
+    skipping ids already stored.
     Returns: Number of new records added.
     """
     if not internships:
         return 0
-        
-    log_data = load_log()
-    seen_ids = set(log_data.setdefault("seen_ids", []))
-    
-    new_records = []
-    
-    for item in internships:
-        if item["id"] not in seen_ids:
-            item["is_new"] = True
-            new_records.append(item)
-            seen_ids.add(item["id"])
-        
-    if not new_records:
+
+    # The seen index answers "already saved?" without touching the database
+    seen = get_seen_index()
+    unseen = [item for item in internships if item["id"] not in seen]
+    if not unseen:
         return 0
-        
-    log_data["seen_ids"] = list(seen_ids)
-    log_data["total_scraped"] = len(seen_ids)
-    today_str = datetime.now().strftime("%Y-%m-%d")
-    log_data["last_run"] = today_str
-    
-    file_exists = CSV_FILE.exists()
-    
-    with open(CSV_FILE, "a", newline="", encoding="utf-8") as f:
+
+    for item in unseen:
+        item["is_new"] = True
+
+    new_records = store.insert_listings(unseen)
+    seen.add_many(item["id"] for item in unseen)
+    if new_records:
+        store.set_meta("last_run", datetime.now().strftime("%Y-%m-%d"))
+        _append_segment(new_records)
+    return len(new_records)
+
+class RunWriter:
+    """
+    Write session for one scraper run. New rows are deduplicated against the
+    seen index as they arrive and buffered, then committed in one SQLite
+    transaction every FLUSH_ROWS rows or FLUSH_SECONDS seconds. close()
+    commits the last rows together with the run-history entry, so a run's
+    stats never disagree with the rows it saved. add() only queues rows;
+    `saved` counts the ones actually committed.
+    """
+
+    FLUSH_ROWS = 200
+    FLUSH_SECONDS = 5.0
+
+    def __init__(self, flush_rows: int = FLUSH_ROWS, flush_seconds: float = FLUSH_SECONDS):
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.seen = get_seen_index()
+        self.checkpoint = get_checkpoint()
+        self.checkpoint.deferred = True
+        self._pending = []
+        self._pending_ids = set()
+        self.saved = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, internships: list) -> int:
+        """Queues the listings not seen before for the next commit. Returns how many that was."""
+        with self._lock:
+            added = 0
+            for item in internships:
+                if item["id"] in self._pending_ids or item["id"] in self.seen:
+                    continue
+                item["is_new"] = True
+                self._pending.append(item)
+                self._pending_ids.add(item["id"])
+                added += 1
+
+            if len(self._pending) >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_seconds:
+                self._flush()
+            return added
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self, sources_failed: list, failed_units: dict = None) -> int:
+        """
+        Commits the remaining rows and the run history in one transaction.
+        Returns how many new listings the run saved.
+        """
+        with self._lock:
+            self._flush(run={
+                "saved_before": self.saved,
+                "sources_failed": sources_failed,
+                "failed_units": failed_units,
+            })
+            self.checkpoint.deferred = False
+        store.optimize()
+        return self.saved
+
+    def _flush(self, run: dict = None):
+        self._last_flush = time.monotonic()
+        if not self._pending and run is None:
+            return
+
+        # Units marked done so far only covered rows that are in self._pending by now
+        completed = self.checkpoint.snapshot()
+        rows = self._pending
+        new_records = store.write_batch(rows, datetime.now().strftime("%Y-%m-%d"), run=run)
+        self.seen.add_many(item["id"] for item in rows)
+        self._pending, self._pending_ids = [], set()
+
+        if new_records:
+            self.saved += len(new_records)
+            logger.info(f"Saved {len(new_records)} new listings ({self.saved} this run)")
+            _append_segment(new_records)
+            events.publish("listings", {"seq": store.current_seq(), "added": len(new_records)})
+        self.checkpoint.save(completed)
+
+def _append_segment(records: list):
+    file_exists = CSV_SEGMENT_FILE.exists()
+    with open(CSV_SEGMENT_FILE, "a", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=CSV_HEADERS)
         if not file_exists:
             writer.writeheader()
-        for rec in new_records:
-            filtered_rec = {k: rec.get(k, "") for k in CSV_HEADERS}
-            writer.writerow(filtered_rec)
-            
-    # Read and sort by date_scraped descending
+        for rec in records:
+            writer.writerow({k: rec.get(k, "") for k in CSV_HEADERS})
+
+def _read_csv_rows(path):
+    if not path.exists():
+        return
+    with open(path, newline="", encoding="utf-8") as f:
+        yield from csv.DictReader(f)
+
+def compact_csv() -> int:
+    """
+    Merges the segment into internships.csv, keeping it sorted by
+    date_scraped (newest first). The export is already sorted, so only the
+    segment gets sorted; the result is written to a temp file and swapped in
+    with os.replace so readers never see a half-written CSV.
+    Returns: Number of rows merged in.
+    """
+    if not CSV_SEGMENT_FILE.exists():
+        return 0
+
+    by_date = lambda row: row.get("date_scraped") or ""
+    segment = sorted(_read_csv_rows(CSV_SEGMENT_FILE), key=by_date, reverse=True)
+    merged = heapq.merge(_read_csv_rows(CSV_FILE), segment, key=by_date, reverse=True)
+
+    fd, temp_path = tempfile.mkstemp(dir=CSV_FILE.parent, suffix=".csv", text=True)
     try:
-        df = pd.read_csv(CSV_FILE)
-        if "date_scraped" in df.columns:
-            df["date_scraped"] = pd.to_datetime(df["date_scraped"], errors='coerce')
-            df = df.sort_values(by="date_scraped", ascending=False)
-            df["date_scraped"] = df["date_scraped"].dt.strftime("%Y-%m-%d")
-            df.to_csv(CSV_FILE, index=False)
-    except Exception as e:
-        print(f"Warning: Could not sort CSV: {e}")
-            
-    save_log(log_data)
-    return len(new_records)
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_HEADERS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(merged)
+        os.replace(temp_path, CSV_FILE)
+    except Exception:
+        os.unlink(temp_path)
+        raise
+
+    CSV_SEGMENT_FILE.unlink()
+    return len(segment)
     
-def update_run_history(new_listings_count: int, sources_failed: list):
-    log_data = load_log()
+def update_run_history(new_listings_count: int, sources_failed: list, failed_units: dict = None):
     today_str = datetime.now().strftime("%Y-%m-%d")
-    
-    # Check if we already have an entry for today
-    history = log_data.get("run_history", [])
-    today_entry = next((item for item in history if item["date"] == today_str), None)
-    
-    if today_entry:
-        today_entry["new_listings"] += new_listings_count
-        # Merge sources_failed without duplicates
-        today_entry["sources_failed"] = list(set(today_entry.get("sources_failed", []) + sources_failed))
-    else:
-        history.append({
-            "date": today_str,
-            "new_listings": new_listings_count,
-            "sources_failed": sources_failed
-        })
-        
-    log_data["run_history"] = history
-    log_data["last_run"] = today_str
-    save_log(log_data)
+    store.record_run(today_str, new_listings_count, sources_failed, failed_units)
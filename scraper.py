@@ -1,27 +1,51 @@
 import argparse
+import threading
+from queue import Queue, Empty
 from loguru import logger
-from output_handler import append_to_csv, update_run_history
+from output_handler import append_to_csv, compact_csv, RunWriter
 from filters import is_valid_internship, is_valid_stipend
+from browser_pool import browser_session
+from checkpoint import begin_run, end_run
+from compression import write_snapshot
+from scraper_utils import reset_unit_stats, unit_report, FAILURE_BUDGET, FailureBudgetExceeded
 
 # Import scrapers
-from sites.internshala import scrape_internshala
-from sites.unstop import scrape_unstop
+from sites.internshala import iter_internshala
+from sites.unstop import iter_unstop
 from sites.naukri import scrape_naukri
 from sites.government import scrape_government
 from sites.misc_india import scrape_shine, scrape_foundit, scrape_apna, scrape_cutshort
 from sites.international import scrape_international
 from sites.rss_feeds import scrape_linkedin as scrape_remotive, scrape_indeed as scrape_weworkremotely
-from sites.linkedin import scrape_linkedin  # NEW: direct LinkedIn Jobs page scraper
+from sites.linkedin import iter_linkedin  # NEW: direct LinkedIn Jobs page scraper
 from sites.bigtech import scrape_bigtech
 from sites.niche import scrape_niche_boards, scrape_aggregators
-from sites.universities import scrape_universities
-from sites.search_engine import scrape_search_engine
+from sites.universities import iter_universities
+from sites.search_engine import iter_search_engine
 
 logger.add("scraper_errors.log", rotation="1 MB", level="ERROR")
 # Human-readable logs for the UI
 logger.add("scraper_run.log", rotation="5 MB", level="INFO", format="{time:YYYY-MM-DD HH:mm:ss} | {message}")
 
-def process_and_save(source_name: str, raw_listings: list):
+# ── Execution lanes ──────────────────────────────────────────────────────────
+# Browser-heavy sources each drive their own Chromium, so they share a small
+# lane. Plain HTTP/RSS sources are cheap and fan out wider. Both DuckDuckGo
+# sources sit in a lane of one so they never hammer DDG at the same time.
+SOURCE_LANES = {
+    "internshala": "browser", "unstop": "browser", "naukri": "browser",
+    "linkedin": "browser", "shine": "browser", "foundit": "browser",
+    "apna": "browser", "cutshort": "browser", "international": "browser",
+    "remotive": "http", "weworkremotely": "http", "niche": "http",
+    "aggregators": "http", "bigtech": "http", "government": "http",
+    "search": "search", "universities": "search",
+}
+LANE_LIMITS = {"browser": 2, "http": 4, "search": 1}
+
+# Standalone append_to_csv calls (outside a RunWriter session) dedup against
+# the seen index before writing, so saves from concurrent lanes take turns.
+_save_lock = threading.Lock()
+
+def _filter_listings(source_name: str, raw_listings: list) -> list:
     valid_listings = []
     
     for item in raw_listings:
@@ -38,16 +62,95 @@ def process_and_save(source_name: str, raw_listings: list):
             continue
             
         valid_listings.append(item)
-    
-    if not valid_listings:
-        logger.info(f"[{source_name}] Searched through {len(raw_listings)} listings, but none matched our criteria.")
-        return 0
-        
-    added = append_to_csv(valid_listings)
-    logger.info(f"[{source_name}] Analyzed {len(raw_listings)} listings, found {len(valid_listings)} matches, and saved {added} brand new ones!")
-    return added
 
-def run_scrapers(dry_run=False, config=None):
+    return valid_listings
+
+def _as_batches(result):
+    """Scrapers either return one list of listings or yield lists as they go."""
+    return [result] if isinstance(result, list) else result
+
+def _check_failure_budget(source_name: str):
+    failed = unit_report(source_name)["failed"]
+    if len(failed) > FAILURE_BUDGET:
+        raise FailureBudgetExceeded(f"{len(failed)} units failed (budget {FAILURE_BUDGET})")
+
+def process_stream(source_name: str, batches, on_saved=None, writer: RunWriter = None) -> int:
+    """
+    Filters and saves each batch as soon as the scraper yields it, so the
+    dashboard sees listings while a long source is still running and a crash
+    late in the source keeps everything saved before it.
+    With a `writer`, batches are only queued in its buffered run session
+    (the writer counts and logs them when it commits); the return value is
+    then the number queued.
+    Without one, each batch is written at once and on_saved(added) is called
+    after every batch that added rows.
+    Raises FailureBudgetExceeded once the source failed too many fetch units.
+    """
+    total_raw = total_valid = total_added = 0
+
+    for batch in batches:
+        _check_failure_budget(source_name)
+        if not batch:
+            continue
+        valid_listings = _filter_listings(source_name, batch)
+        total_raw += len(batch)
+        total_valid += len(valid_listings)
+        if not valid_listings:
+            continue
+
+        if writer is not None:
+            added = writer.add(valid_listings)
+            if added:
+                total_added += added
+                logger.info(f"[{source_name}] Queued {added} new listings for saving ({total_added} so far)...")
+            continue
+
+        with _save_lock:
+            added = append_to_csv(valid_listings)
+        if added:
+            total_added += added
+            if on_saved:
+                on_saved(added)
+            logger.info(f"[{source_name}] Saved {added} new listings ({total_added} so far)...")
+
+    verb = "queued" if writer is not None else "saved"
+    if not total_valid:
+        logger.info(f"[{source_name}] Searched through {total_raw} listings, but none matched our criteria.")
+    else:
+        logger.info(f"[{source_name}] Analyzed {total_raw} listings, found {total_valid} matches, and {verb} {total_added} brand new ones!")
+    return total_added
+
+def _run_lanes(jobs: list, run_one):
+    """
+    Runs (source_name, scraper_func) jobs on bounded worker threads, one
+    worker pool per lane (see SOURCE_LANES / LANE_LIMITS). Blocks until done.
+    """
+    lanes = {}
+    for source_name, scraper_func in jobs:
+        lane = SOURCE_LANES.get(source_name, "http")
+        lanes.setdefault(lane, Queue()).put((source_name, scraper_func))
+
+    def worker(queue):
+        # Every scraper this worker runs shares one lazily-launched Chromium
+        with browser_session():
+            while True:
+                try:
+                    source_name, scraper_func = queue.get_nowait()
+                except Empty:
+                    return
+                run_one(source_name, scraper_func)
+
+    threads = []
+    for lane, queue in lanes.items():
+        for i in range(min(LANE_LIMITS.get(lane, 1), queue.qsize())):
+            t = threading.Thread(target=worker, args=(queue,), name=f"{lane}-lane-{i + 1}", daemon=True)
+            t.start()
+            threads.append(t)
+
+    for t in threads:
+        t.join()
+
+def run_scrapers(dry_run=False, config=None, concurrent=True, specific_source=None, resume=False):
     total_added = 0
     failed_sources = []
     
@@ -71,6 +174,8 @@ def run_scrapers(dry_run=False, config=None):
         except OSError:
             pass
     
+    concurrent = config.get("concurrent", concurrent)
+    resume = config.get("resume", resume)
     req_regions = set([r.lower() for r in config.get("regions", [])])
     req_sources = set([s.lower() for s in config.get("sources", [])])
     
@@ -78,7 +183,7 @@ def run_scrapers(dry_run=False, config=None):
     
     # Map scrapers to explicit UI checkboxes
     if "internshala" in req_sources: 
-        scrapers_to_run["internshala"] = scrape_internshala
+        scrapers_to_run["internshala"] = iter_internshala
         
     if "naukri" in req_sources: 
         scrapers_to_run.update({
@@ -87,10 +192,10 @@ def run_scrapers(dry_run=False, config=None):
         })
         
     if "unstop" in req_sources: 
-        scrapers_to_run["unstop"] = scrape_unstop
+        scrapers_to_run["unstop"] = iter_unstop
         
     if "linkedin" in req_sources: 
-        scrapers_to_run["linkedin"] = scrape_linkedin
+        scrapers_to_run["linkedin"] = iter_linkedin
         
     if "bigtech" in req_sources: 
         scrapers_to_run["bigtech"] = scrape_bigtech
@@ -102,41 +207,90 @@ def run_scrapers(dry_run=False, config=None):
             "international": scrape_international, 
             "niche": scrape_niche_boards, 
             "aggregators": scrape_aggregators, 
-            "search": scrape_search_engine
+            "search": iter_search_engine
         })
         
     if "government" in req_sources: 
         scrapers_to_run["government"] = scrape_government
         
     if "universities" in req_sources:
-        scrapers_to_run["universities"] = scrape_universities
+        scrapers_to_run["universities"] = iter_universities
+
+    if specific_source:
+        scrapers_to_run = {k: v for k, v in scrapers_to_run.items() if k == specific_source.lower()}
 
     if not scrapers_to_run:
         logger.warning("No scrapers matched the provided configuration filters!")
         return 0
 
-    for source_name, scraper_func in scrapers_to_run.items():
+    # Dry runs save nothing, so they must not mark any unit as done either
+    writer = None
+    if not dry_run:
+        begin_run(config, resume=resume)
+        writer = RunWriter()
+
+    reset_unit_stats()
+    stats_lock = threading.Lock()
+    failed_units = {}
+
+    def run_one(source_name, scraper_func):
         try:
             logger.info(f"🚀 Starting to check {source_name} for new opportunities...")
             if source_name in ["linkedin", "search"]:
-                listings = scraper_func(config=config)
+                batches = _as_batches(scraper_func(config=config))
             else:
-                listings = scraper_func()
+                batches = _as_batches(scraper_func())
             if not dry_run:
-                added = process_and_save(source_name, listings)
-                total_added += added
+                # The writer counts rows as they are committed, so a crash never over-reports
+                process_stream(source_name, batches, writer=writer)
             else:
-                logger.info(f"[{source_name}] DRY-RUN: Found {len(listings)} raw listings.")
+                found = 0
+                for batch in batches:
+                    _check_failure_budget(source_name)
+                    found += len(batch)
+                logger.info(f"[{source_name}] DRY-RUN: Found {found} raw listings.")
+            _check_failure_budget(source_name)
+            report = unit_report(source_name)
+            if report["failed"] and not report["ok"]:
+                raise RuntimeError(f"all {len(report['failed'])} fetch units failed")
         except Exception as e:
             logger.error(f"Failed {source_name}: {str(e)}")
-            failed_sources.append(source_name)
+            with stats_lock:
+                failed_sources.append(source_name)
+        finally:
+            report = unit_report(source_name)
+            if report["failed"]:
+                logger.warning(f"[{source_name}] {len(report['failed'])} fetch units failed after retries ({report['ok']} ok).")
+                with stats_lock:
+                    failed_units[source_name] = report["failed"]
+
+    if concurrent:
+        lanes = sorted(set(SOURCE_LANES.get(name, "http") for name in scrapers_to_run))
+        logger.info(f"Running {len(scrapers_to_run)} sources concurrently across lanes: {', '.join(lanes)}")
+        _run_lanes(list(scrapers_to_run.items()), run_one)
+    else:
+        with browser_session():
+            for source_name, scraper_func in scrapers_to_run.items():
+                run_one(source_name, scraper_func)
             
     if not dry_run:
-        update_run_history(total_added, failed_sources)
+        # Last rows and the run history land in the same transaction
+        total_added = writer.close(failed_sources, failed_units)
+        try:
+            merged = compact_csv()
+            if merged:
+                logger.info(f"Exported {merged} new listings to internships.csv")
+        except Exception as e:
+            logger.error(f"Could not compact internships.csv export: {e}")
+        try:
+            write_snapshot()
+        except Exception as e:
+            logger.error(f"Could not write the compressed listing snapshot: {e}")
+        end_run(completed=not failed_sources)
         
     logger.info("========================================")
     logger.info("✅ All scraping tasks completed!")
-    logger.info(f"Sources checked: {len(scrapers) - len(failed_sources)} successful, {len(failed_sources)} failed.")
+    logger.info(f"Sources checked: {len(scrapers_to_run) - len(failed_sources)} successful, {len(failed_sources)} failed.")
     if not dry_run:
         logger.info(f"🎉 Total new internships added today: {total_added}")
     logger.info("========================================")
@@ -145,6 +299,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Automated AI/ML Internship Scraper")
     parser.add_argument("--dry-run", action="store_true", help="Run scrapers without saving to CSV")
     parser.add_argument("--source", type=str, help="Run a specific source only")
+    parser.add_argument("--sequential", action="store_true", help="Run sources one after another instead of in parallel lanes")
+    parser.add_argument("--resume", action="store_true", help="Skip searches/pages the last interrupted run already finished")
     args = parser.parse_args()
     
-    run_scrapers(dry_run=args.dry_run, specific_source=args.source)
+    run_scrapers(dry_run=args.dry_run, concurrent=not args.sequential, specific_source=args.source, resume=args.resume)
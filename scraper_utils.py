@@ -1,19 +1,23 @@
 import time
 import random
 import json
+import threading
 from pathlib import Path
 from fake_useragent import UserAgent
-from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception_type
+from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception_type, Retrying
 from loguru import logger
 import requests
 
+import events
+
 # Shared alert file — written by scrapers, served by Flask via /api/alerts
 _ALERT_FILE = Path(__file__).parent / "scraper_alerts.json"
 
 def action_required(source: str, message: str, kind: str = "captcha"):
     """
     Signal that the scraper needs human attention (CAPTCHA, popup, login).
-    Writes to scraper_alerts.json; the dashboard polls this and shows a banner.
+    Pushed to open dashboards over /api/events (which show a banner) and
+    written to scraper_alerts.json for /api/alerts.
     
     kind: 'captcha' | 'popup' | 'login' | 'info'
     """
@@ -28,6 +32,7 @@ def action_required(source: str, message: str, kind: str = "captcha"):
         _ALERT_FILE.write_text(json.dumps(alert), encoding="utf-8")
     except Exception as e:
         logger.debug(f"Failed to write alert file: {e}")
+    events.publish("alert", alert)
     logger.warning(f"⚠️  ACTION REQUIRED [{source}]: {message}")
 
 def action_resolved(source: str):
@@ -40,6 +45,7 @@ def action_resolved(source: str):
             if data.get("source") == source:
                 data["resolved"] = True
                 _ALERT_FILE.write_text(json.dumps(data), encoding="utf-8")
+                events.publish("alert", None)
     except Exception as e:
         logger.debug(f"Failed to resolve alert: {e}")
     logger.info(f"✅ [{source}] Continuing after manual step...")
@@ -81,6 +87,60 @@ def get_playwright_stealth_args():
         '--window-size=1920,1080'
     ]
 
+# ── Fetch-unit retries ───────────────────────────────────────────────────────
+# A "unit" is one page.goto, one feed, one search query. Units retry on their
+# own with backoff, so one flaky URL no longer relaunches a whole scraper and
+# re-fetches every page it already had. Exhausted units are recorded per
+# source; run_scrapers aborts a source once it exceeds FAILURE_BUDGET and
+# reports the failed units in the run history.
+UNIT_ATTEMPTS = 3
+FAILURE_BUDGET = 5
+
+class UnitFailed(Exception):
+    """A fetch unit failed on every attempt (already logged and recorded)."""
+
+class FailureBudgetExceeded(Exception):
+    """A source failed more units than FAILURE_BUDGET allows."""
+
+_unit_stats = {}  # source -> {"ok": int, "failed": [unit, ...]}
+_unit_lock = threading.Lock()
+
+def reset_unit_stats():
+    with _unit_lock:
+        _unit_stats.clear()
+
+def record_unit_result(source: str, unit: str, error: Exception = None):
+    """Counts a finished unit for `source`; pass the error if it failed for good."""
+    with _unit_lock:
+        stats = _unit_stats.setdefault(source, {"ok": 0, "failed": []})
+        if error is None:
+            stats["ok"] += 1
+        else:
+            stats["failed"].append(unit)
+    if error is not None:
+        logger.error(f"[{source}] Giving up on {unit}: {error}")
+
+def unit_report(source: str) -> dict:
+    with _unit_lock:
+        stats = _unit_stats.get(source, {"ok": 0, "failed": []})
+        return {"ok": stats["ok"], "failed": list(stats["failed"])}
+
+def retry_unit(source: str, unit: str, func, *args, attempts=UNIT_ATTEMPTS, **kwargs):
+    """
+    Calls func(*args, **kwargs) with exponential-backoff retries for this unit
+    only. Returns its result, or raises UnitFailed once every attempt failed.
+    """
+    try:
+        for attempt in Retrying(wait=wait_exponential(multiplier=1, min=2, max=10),
+                                stop=stop_after_attempt(attempts), reraise=True):
+            with attempt:
+                result = func(*args, **kwargs)
+    except Exception as e:
+        record_unit_result(source, unit, e)
+        raise UnitFailed(f"{unit}: {e}") from e
+    record_unit_result(source, unit)
+    return result
+
 # Retry decorator for raw requests
 def requests_retry_session(retries=3):
     """Returns a requests session configured with retries and realistic headers."""
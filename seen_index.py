@@ -0,0 +1,334 @@
+"""
+Seen-ID Index
+─────────────
+Remembers every listing id ever saved, so deduplication never has to load
+the whole history. Ids are md5 hex strings; the index stores them as raw
+16-byte digests in three files:
+
+  seen_ids.idx    sorted digests, memory-mapped and binary-searched
+  seen_ids.log    digests added since the last compaction, append-only
+  seen_ids.bloom  Bloom filter over both, memory-mapped
+  seen_ids.gen    the store generation (store.generation()) the ids belong to
+
+Opening the index maps the files instead of reading them, so start-up time
+and RAM stay flat however many ids there are. A lookup is a Bloom check
+(most new ids stop there), then a set lookup in the small log, then an
+O(log n) bisect of the sorted file. Once the log grows past
+COMPACT_THRESHOLD it is merged into the sorted file. Every file is replaced
+atomically, and the Bloom filter is replaced before the sorted file it
+covers, so a crash can never make an id look unseen.
+
+The index is only a cache of the store's primary keys, and callers trust
+its hits. What keeps it honest is the store generation: get_seen_index()
+rebuilds it from the store whenever the generation differs from the one it
+was built for (the store was cleared, replaced or recreated by another
+process).
+"""
+
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from bisect import bisect_left
+from pathlib import Path
+
+from loguru import logger
+
+DATA_DIR = Path(__file__).parent
+INDEX_FILE = DATA_DIR / "seen_ids.idx"
+LOG_FILE = DATA_DIR / "seen_ids.log"
+BLOOM_FILE = DATA_DIR / "seen_ids.bloom"
+GENERATION_FILE = DATA_DIR / "seen_ids.gen"
+
+DIGEST_SIZE = 16
+COMPACT_THRESHOLD = 50_000
+BLOOM_BITS_PER_ID = 10      # ~1% false positives with BLOOM_HASHES = 7
+BLOOM_HASHES = 7
+BLOOM_MIN_CAPACITY = 65_536
+_BLOOM_HEADER = struct.Struct("<4sQI")  # magic, number of bits, number of hashes
+_BLOOM_MAGIC = b"SIB1"
+
+
+def to_digest(internship_id: str) -> bytes:
+    """The 16-byte digest for an id (its own bytes if it already is an md5 hex string)."""
+    if len(internship_id) == 32:
+        try:
+            return bytes.fromhex(internship_id)
+        except ValueError:
+            pass
+    return hashlib.md5(internship_id.encode()).digest()
+
+
+def _map(path: Path, write: bool = False):
+    """Memory-maps a file, or returns None for a missing/empty one."""
+    if not path.exists() or path.stat().st_size == 0:
+        return None
+    with open(path, "r+b" if write else "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if write else mmap.ACCESS_READ)
+
+
+def _atomic_write(path: Path, chunks):
+    fd, temp_path = tempfile.mkstemp(dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(temp_path, path)
+    except Exception:
+        os.unlink(temp_path)
+        raise
+
+
+class _SortedDigests:
+    """Read-only sequence view over a mapped sorted-digest file, for bisect."""
+
+    def __init__(self, mm):
+        self.mm = mm
+
+    def __len__(self):
+        return len(self.mm) // DIGEST_SIZE if self.mm is not None else 0
+
+    def __getitem__(self, i):
+        return self.mm[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __contains__(self, digest):
+        i = bisect_left(self, digest)
+        return i < len(self) and self[i] == digest
+
+
+class _Bloom:
+    """Bloom filter in a mapped file; bits are double-hashed from the digest itself."""
+
+    def __init__(self, mm):
+        self.mm = mm
+        magic, self.bits, self.hashes = _BLOOM_HEADER.unpack_from(mm, 0)
+        if magic != _BLOOM_MAGIC or len(mm) < _BLOOM_HEADER.size + (self.bits + 7) // 8:
+            raise ValueError("corrupt Bloom filter")
+
+    @staticmethod
+    def _positions(digest, bits, hashes):
+        h1, h2 = struct.unpack("<QQ", digest)
+        return [(h1 + i * h2) % bits for i in range(hashes)]
+
+    @classmethod
+    def build(cls, digests, capacity):
+        bits = max(capacity, BLOOM_MIN_CAPACITY) * BLOOM_BITS_PER_ID
+        array = bytearray((bits + 7) // 8)
+        for digest in digests:
+            for pos in cls._positions(digest, bits, BLOOM_HASHES):
+                array[pos >> 3] |= 1 << (pos & 7)
+        return _BLOOM_HEADER.pack(_BLOOM_MAGIC, bits, BLOOM_HASHES) + bytes(array)
+
+    def add(self, digest):
+        base = _BLOOM_HEADER.size
+        for pos in self._positions(digest, self.bits, self.hashes):
+            self.mm[base + (pos >> 3)] |= 1 << (pos & 7)
+
+    def __contains__(self, digest):
+        base = _BLOOM_HEADER.size
+        return all(self.mm[base + (pos >> 3)] & (1 << (pos & 7))
+                   for pos in self._positions(digest, self.bits, self.hashes))
+
+
+class SeenIndex:
+    """Persistent set of listing ids: sorted file + append log + Bloom filter."""
+
+    def __init__(self, index_path: Path = INDEX_FILE, log_path: Path = LOG_FILE,
+                 bloom_path: Path = BLOOM_FILE, generation_path: Path = GENERATION_FILE,
+                 compact_threshold: int = COMPACT_THRESHOLD):
+        self.index_path = index_path
+        self.log_path = log_path
+        self.bloom_path = bloom_path
+        self.generation_path = generation_path
+        self.compact_threshold = compact_threshold
+        self._lock = threading.RLock()
+        self._open()
+
+    def _open(self):
+        self._sorted = _SortedDigests(_map(self.index_path))
+        self.generation = self.generation_path.read_text().strip() if self.generation_path.exists() else None
+
+        self._recent = set()
+        if self.log_path.exists():
+            data = self.log_path.read_bytes()
+            usable = len(data) - len(data) % DIGEST_SIZE  # drop a torn trailing write
+            self._recent = {data[i:i + DIGEST_SIZE] for i in range(0, usable, DIGEST_SIZE)}
+
+        try:
+            mm = _map(self.bloom_path, write=True)
+            self._bloom = _Bloom(mm) if mm is not None else None
+        except (ValueError, struct.error):
+            self._bloom = None
+
+        if self._bloom is None and (len(self._sorted) or self._recent):
+            logger.info("SeenIndex: Rebuilding Bloom filter")
+            self._write_bloom(self._all_digests(), len(self._sorted) + len(self._recent))
+        elif self._bloom is not None:
+            # The log may hold ids written after the filter was last saved
+            for digest in self._recent:
+                self._bloom.add(digest)
+
+    def _close_maps(self):
+        # Windows cannot replace a file that is still mapped
+        for mm in (self._sorted.mm, self._bloom.mm if self._bloom else None):
+            if mm is not None:
+                mm.close()
+        self._sorted = _SortedDigests(None)
+        self._bloom = None
+
+    def _all_digests(self):
+        return heapq.merge(self._sorted, sorted(self._recent))
+
+    def _write_bloom(self, digests, count):
+        if self._bloom is not None:
+            self._bloom.mm.close()
+            self._bloom = None
+        _atomic_write(self.bloom_path, [_Bloom.build(digests, count * 2)])
+        self._bloom = _Bloom(_map(self.bloom_path, write=True))
+
+    def __len__(self):
+        return len(self._sorted) + len(self._recent)
+
+    def contains_digest(self, digest: bytes) -> bool:
+        with self._lock:
+            if self._bloom is not None and digest not in self._bloom:
+                return False
+            return digest in self._recent or digest in self._sorted
+
+    def __contains__(self, internship_id: str) -> bool:
+        return self.contains_digest(to_digest(internship_id))
+
+    def add_many(self, internship_ids) -> int:
+        """Appends ids not seen before to the log. Returns how many were new."""
+        with self._lock:
+            fresh = {}  # dict keeps insertion order and dedups within the batch
+            for internship_id in internship_ids:
+                digest = to_digest(internship_id)
+                if digest not in fresh and not self.contains_digest(digest):
+                    fresh[digest] = None
+            if not fresh:
+                return 0
+
+            with open(self.log_path, "ab") as f:
+                f.write(b"".join(fresh))
+            self._recent.update(fresh)
+            if self._bloom is None:
+                self._write_bloom(self._all_digests(), len(self))
+            else:
+                for digest in fresh:
+                    self._bloom.add(digest)
+
+            if len(self._recent) >= self.compact_threshold:
+                self.compact()
+            return len(fresh)
+
+    def add(self, internship_id: str) -> bool:
+        return self.add_many([internship_id]) == 1
+
+    def compact(self):
+        """Merges the append log into the sorted file."""
+        with self._lock:
+            if not self._recent:
+                return
+            count = len(self)
+
+            # Merge into a temp file first; the Bloom filter must cover it before it goes live
+            fd, merged_path = tempfile.mkstemp(dir=self.index_path.parent)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    last = None
+                    for digest in self._all_digests():
+                        if digest != last:
+                            f.write(digest)
+                            last = digest
+                self._close_maps()
+                merged = _map(Path(merged_path))
+                try:
+                    bloom = _Bloom.build(_SortedDigests(merged), count * 2)
+                finally:
+                    if merged is not None:
+                        merged.close()
+                _atomic_write(self.bloom_path, [bloom])
+                os.replace(merged_path, self.index_path)
+            except Exception:
+                if os.path.exists(merged_path):
+                    os.unlink(merged_path)
+                self._open()
+                raise
+
+            self.log_path.unlink(missing_ok=True)
+            self._open()
+            logger.debug(f"SeenIndex: Compacted {count} ids into {self.index_path.name}")
+
+    def set_generation(self, generation: str):
+        with self._lock:
+            _atomic_write(self.generation_path, [generation.encode()])
+            self.generation = generation
+
+    def clear(self):
+        with self._lock:
+            self._close_maps()
+            for path in (self.index_path, self.log_path, self.bloom_path, self.generation_path):
+                path.unlink(missing_ok=True)
+            self._open()
+
+    def close(self):
+        with self._lock:
+            self._close_maps()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_seen_index() -> SeenIndex:
+    """
+    The process-wide index, checked against the store's generation on every
+    call. When it was built for another generation (or never), it is
+    rebuilt from the ids in the listing store.
+    """
+    import store
+
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SeenIndex()
+        generation = store.generation()
+        if _index.generation != generation:
+            if _index.generation is not None and len(_index):
+                logger.warning("SeenIndex: The listing store was cleared or replaced; rebuilding the index")
+            _index.clear()
+            _bootstrap(_index)
+            _index.set_generation(generation)
+        return _index
+
+
+def reset_seen_index():
+    """
+    Closes the process-wide index, so the next get_seen_index() reopens it
+    from disk. Long-lived processes call this between runs, since another
+    process may have cleared the files in the meantime.
+    """
+    global _index
+    with _index_lock:
+        if _index is not None:
+            _index.close()
+            _index = None
+
+
+def _bootstrap(index: SeenIndex):
+    import store
+
+    # Only ids the store really has, so every hit means "stored"
+    ids = store.listing_ids()
+    if ids:
+        index.add_many(ids)
+        index.compact()
+        logger.info(f"SeenIndex: Seeded with {len(ids)} ids")
@@ -0,0 +1,40 @@
+"""
+Production Server
+─────────────────
+Serves the dashboard from a multi-threaded WSGI server instead of Flask's
+debug server, with scraping moved out of the web process: POST /api/scrape
+queues a job, and a separate `python worker.py` runs it.
+
+    python serve.py                 # waitress (any OS)
+    python worker.py                # in a second terminal
+
+On Linux/macOS several server processes can share the queue:
+
+    gunicorn -w 4 -k gthread --threads 16 serve:application
+
+Every open dashboard holds one thread for its /api/events stream, so leave
+threads to spare (hence gthread rather than gunicorn's sync workers).
+"""
+
+import argparse
+
+import app as dashboard
+
+dashboard.enable_queue_mode()
+application = dashboard.app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the dashboard in production (scrapes run in worker.py)")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=16, help="Request threads, incl. one per open event stream")
+    args = parser.parse_args()
+
+    try:
+        from waitress import serve
+    except ImportError:
+        raise SystemExit("waitress is not installed: pip install waitress (or use gunicorn, see serve.py)")
+
+    print(f"Serving on http://{args.host}:{args.port} - start `python worker.py` to run scrapes")
+    serve(application, host=args.host, port=args.port, threads=args.threads)
@@ -5,7 +5,7 @@ import random
 import hashlib
 from datetime import datetime
 from loguru import logger
-from scraper_utils import requests_retry_session, human_delay
+from scraper_utils import requests_retry_session, human_delay, retry_unit, UnitFailed
 from filters import calculate_match_score
 
 def scrape_government():
@@ -30,7 +30,7 @@ def scrape_government():
             # as a general lead that requires manual checking.
             
             session = requests_retry_session()
-            response = session.get(url, timeout=15, verify=False) # Govt sites often have SSL issues
+            response = retry_unit("government", url, session.get, url, timeout=15, verify=False) # Govt sites often have SSL issues
             
             if response.status_code == 200:
                 html = response.text.lower()
@@ -72,6 +72,8 @@ def scrape_government():
                     
             human_delay(2.0, 5.0)
             
+        except UnitFailed:
+            pass  # Logged and counted against the source's failure budget
         except Exception as e:
             logger.error(f"Failed to scrape {name} ({url}): {e}")
             
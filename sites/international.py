@@ -1,4 +1,3 @@
-from playwright.sync_api import sync_playwright
 import time
 import random
 from bs4 import BeautifulSoup
@@ -7,24 +6,16 @@ from datetime import datetime
 from loguru import logger
 from filters import calculate_match_score
 import re
-from playwright_stealth import Stealth
-from scraper_utils import human_delay, get_playwright_stealth_args
-from tenacity import retry, wait_exponential, stop_after_attempt
+from scraper_utils import human_delay, retry_unit, UnitFailed
+from browser_pool import browser_session
 
-@retry(wait=wait_exponential(multiplier=1, min=2, max=10), stop=stop_after_attempt(3))
 def parse_weworkremotely():
     results = []
-    with sync_playwright() as p:
+    with browser_session() as pool, pool.page() as page:
         try:
-            browser = p.chromium.launch(
-                headless=True,
-                args=get_playwright_stealth_args()
-            )
-            page = browser.new_page()
-            Stealth().apply_stealth_sync(page)
             url = "https://weworkremotely.com/remote-jobs/search?term=internship+machine+learning"
             logger.info(f"Scraping WeWorkRemotely: {url}")
-            page.goto(url, timeout=30000)
+            retry_unit("international", url, page.goto, url, timeout=30000)
             human_delay(3.0, 5.0)
             
             html = page.content()
@@ -80,7 +71,8 @@ def parse_weworkremotely():
                     })
                 except Exception as e:
                     continue
-            browser.close()
+        except UnitFailed:
+            pass  # Logged and counted against the source's failure budget
         except Exception as e:
             logger.error(f"WeWorkRemotely error: {e}")
             raise e
@@ -1,4 +1,3 @@
-from playwright.sync_api import sync_playwright
 import time
 import random
 from bs4 import BeautifulSoup
@@ -7,14 +6,20 @@ from datetime import datetime
 import re
 from loguru import logger
 from filters import calculate_match_score, parse_summer_dates
-from playwright_stealth import Stealth
-from scraper_utils import human_delay, get_playwright_stealth_args
-from tenacity import retry, wait_exponential, stop_after_attempt
+from scraper_utils import human_delay, retry_unit, UnitFailed
+from location_normalizer import classify as classify_location
+from browser_pool import browser_session
+from checkpoint import get_checkpoint
 
 URLS = [
     "https://internshala.com/internships/artificial-intelligence-ai,data-science,deep-learning,machine-learning,natural-language-processing-nlp-internship/"
 ]
 
+PAGE_OPTIONS = {
+    "user_agent": 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    "viewport": {'width': 1920, 'height': 1080},
+}
+
 def parse_stipend(stipend_str: str):
     stipend_str = stipend_str.replace(",", "").replace("₹", "").strip()
     match = re.search(r'(\d+)', stipend_str)
@@ -22,37 +27,30 @@ def parse_stipend(stipend_str: str):
         return float(match.group(1))
     return 0
 
-@retry(wait=wait_exponential(multiplier=1, min=2, max=10), stop=stop_after_attempt(3))
-def scrape_internshala():
-    all_internships = []
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,
-            args=get_playwright_stealth_args()
-        )
-        context = browser.new_context(
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            viewport={'width': 1920, 'height': 1080}
-        )
-        page = context.new_page()
-        Stealth().apply_stealth_sync(page)
-        
+def iter_internshala():
+    """Scrapes Internshala page by page, yielding each results page as one batch."""
+    checkpoint = get_checkpoint()
+    with browser_session() as pool:
         for base_url in URLS:
             page_num = 1
             while True:
                 url = f"{base_url}page-{page_num}/" if page_num > 1 else base_url
+                if checkpoint.is_done("internshala", url):
+                    page_num += 1
+                    continue
                 logger.info(f"Scraping Internshala: {url} ...")
                 
                 try:
-                    # Internshala can block simple bots, fake user agent or simple timeout wait is good
-                    page.goto(url, timeout=45000)
-                    human_delay(2.5, 4.5)
-                    
-                    html = page.content()
+                    # A page per results page, so the pool can recycle the context mid-scrape
+                    with pool.page(**PAGE_OPTIONS) as page:
+                        # Internshala can block simple bots, fake user agent or simple timeout wait is good
+                        retry_unit("internshala", url, page.goto, url, timeout=45000)
+                        human_delay(2.5, 4.5)
+                        html = page.content()
                     soup = BeautifulSoup(html, "lxml")
                     
                     listings = soup.find_all("div", class_="individual_internship")
+                    batch = []
                     
                     if not listings:
                         break # no more pages or empty page
@@ -82,7 +80,7 @@ def scrape_internshala():
                             if not parse_summer_dates(starts_text):
                                 continue # Fails summer constraint
                                 
-                            location_type = "Remote" if "Work From Home" in location or "Remote" in location else "India"
+                            location_type = classify_location(location, default="India")
                             
                             duration = ""
                             duration_elem = listing.find("div", string=re.compile("Duration", re.IGNORECASE))
@@ -136,10 +134,13 @@ def scrape_internshala():
                                 "match_score": match_score
                             }
                             
-                            all_internships.append(record)
+                            batch.append(record)
                         except Exception as e:
                             logger.exception(f"Error parsing listing on {url}: {e}")
                             
+                    yield batch
+                    checkpoint.mark_done("internshala", url)
+                    
                     # To not overload the server
                     human_delay(1.5, 3.5)
                     
@@ -150,10 +151,10 @@ def scrape_internshala():
                         
                     page_num += 1
                     
-                except Exception as e:
-                    logger.error(f"Failed to load INTERNSHALA {url}: {e}")
-                    raise e
-                    
-        browser.close()
-        
-    return all_internships
+                except UnitFailed:
+                    # Keep the pages already scraped; later pages can't be reached reliably
+                    break
+
+def scrape_internshala():
+    """Collects every batch from iter_internshala() into a single list."""
+    return [record for batch in iter_internshala() for record in batch]
@@ -15,15 +15,16 @@ Verified selectors (Feb 2026):
 """
 
 import hashlib
-import random
+import urllib.parse
 from datetime import datetime
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
-from playwright_stealth import Stealth
 from loguru import logger
 
 from filters import calculate_match_score
-from scraper_utils import human_delay, get_playwright_stealth_args
+from async_engine import PageJob, fetch_pages
+from scraper_utils import record_unit_result
+from location_normalizer import classify as classify_location
+from checkpoint import get_checkpoint
 
 # ── Every major location × every major AI/ML keyword ─────────────────────────
 # LinkedIn's f_JT=I = Internship job type, f_E=1 = Entry level
@@ -122,29 +123,26 @@ SEARCH_CONFIGS = [
 BASE_URL = "https://www.linkedin.com/jobs/search/?keywords={kw}&location={loc}&f_JT=I&f_E=1"
 
 
-def _close_popups(page):
+async def _close_popups(page):
     """Dismiss LinkedIn's sign-in modal and cookie banners if they appear."""
     try:
         # Cookie accept
-        page.locator("button[action-type='ACCEPT']").click(timeout=3000)
+        await page.locator("button[action-type='ACCEPT']").click(timeout=3000)
     except Exception:
         pass
     try:
         # Sign-in modal close
-        page.locator("button.modal__dismiss").click(timeout=3000)
+        await page.locator("button.modal__dismiss").click(timeout=3000)
     except Exception:
         pass
     try:
-        page.locator("button[aria-label='Dismiss']").click(timeout=3000)
+        await page.locator("button[aria-label='Dismiss']").click(timeout=3000)
     except Exception:
         pass
 
 
-def scrape_linkedin(config=None):
-    """
-    Scrapes LinkedIn public job search pages for AI/ML internships.
-    Runs fully headless. Filters internal query list based on given config.
-    """
+def _select_configs(config=None):
+    """Returns the SEARCH_CONFIGS entries matching the requested regions/topics."""
     if config is None:
         config = {
             "regions": ["india", "worldwide", "usa", "europe", "remote"],
@@ -161,193 +159,191 @@ def scrape_linkedin(config=None):
         logger.warning("LinkedIn: No regions specified, using defaults")
         req_regions = [r.lower() for r in default_regions]
 
-    all_internships = []
+    selected = []
+    for kw, loc, label in SEARCH_CONFIGS:
+        # Filter by config parameters
+        kw_lower = kw.lower()
+        loc_lower = loc.lower()
+        
+        # Check region map
+        is_india = "india" in loc_lower
+        is_remote = "remote" in loc_lower or "anywhere" in loc_lower
+        is_worldwide = "worldwide" in loc_lower
+        is_europe = "europe" in loc_lower or "kingdom" in loc_lower or "germany" in loc_lower or "france" in loc_lower or "netherlands" in loc_lower or "switzerland" in loc_lower or "sweden" in loc_lower or "denmark" in loc_lower or "finland" in loc_lower or "spain" in loc_lower or "italy" in loc_lower or "belgium" in loc_lower or "austria" in loc_lower
+        is_usa = "united states" in loc_lower or "bay area" in loc_lower or "seattle" in loc_lower or "boston" in loc_lower or "york" in loc_lower
+        
+        # Default map to worldwide if none of above
+        region_match = False
+        if "india" in req_regions and is_india: region_match = True
+        if "usa" in req_regions and is_usa: region_match = True
+        if "europe" in req_regions and is_europe: region_match = True
+        if "remote" in req_regions and is_remote: region_match = True
+        if "worldwide" in req_regions and (is_worldwide or (not is_india and not is_usa and not is_europe and not is_remote)): region_match = True
+        
+        if not region_match:
+            continue
+            
+        # Topic match
+        topic_match = False
+        if "ai" in req_topics and ("artificial intelligence" in kw_lower or "ai " in kw_lower or " ai" in kw_lower or kw_lower.startswith("ai") or "robotics" in kw_lower): topic_match = True
+        if "ml" in req_topics and ("machine learning" in kw_lower or "reinforcement" in kw_lower or "rl " in kw_lower): topic_match = True
+        if "dl" in req_topics and "deep learning" in kw_lower: topic_match = True
+        if "ds" in req_topics and "data science" in kw_lower: topic_match = True
+        if "cv" in req_topics and "computer vision" in kw_lower: topic_match = True
+        if "nlp" in req_topics and "natural language" in kw_lower: topic_match = True
+        if "research" in req_topics and "research" in kw_lower: topic_match = True
+        if "llm/genai" in req_topics and ("generative" in kw_lower or "large language" in kw_lower): topic_match = True
+        
+        # Allow fallback if no specific topic arrays given
+        if req_topics and not topic_match:
+            # If user chose specific topics and this config query matches none of them, skip.
+            continue
+
+        selected.append((kw, loc, label))
+
+    return selected
+
+
+def _parse_cards(html, loc, label, seen):
+    """Parses one LinkedIn search results page into records, skipping ids already in `seen`."""
+    records = []
+    soup = BeautifulSoup(html, "lxml")
+
+    # LinkedIn guest page uses these card selectors
+    cards = soup.find_all("div", class_=lambda c: c and "base-card" in c)
+    if not cards:
+        # Fallback: look for job cards with data attributes
+        cards = soup.find_all("li", class_=lambda c: c and "jobs-search__results-list" in (c or ""))
+    logger.info(f"LinkedIn [{label}]: Found {len(cards)} cards")
+
+    for card in cards:
+        try:
+            # Title
+            title_elem = (
+                card.find("h3", class_=lambda c: c and "base-search-card__title" in c)
+                or card.find("h3")
+            )
+            if not title_elem:
+                continue
+            role_title = title_elem.get_text(strip=True)
+
+            # Company
+            comp_elem = (
+                card.find("h4", class_=lambda c: c and "base-search-card__subtitle" in c)
+                or card.find("a", class_=lambda c: c and "hidden-nested-link" in (c or ""))
+                or card.find("h4")
+            )
+            company_name = (
+                comp_elem.get_text(strip=True) if comp_elem else "Unknown"
+            )
+
+            # Location
+            loc_elem = card.find(
+                "span",
+                class_=lambda c: c and "job-search-card__location" in c,
+            )
+            location = (
+                loc_elem.get_text(strip=True) if loc_elem else loc
+            )
+            location_type = classify_location(location, default="International")
+
+            # Apply link
+            link_elem = card.find(
+                "a",
+                class_=lambda c: c and "base-card__full-link" in (c or ""),
+            ) or card.find("a", href=True)
+            apply_link = link_elem["href"] if link_elem else ""
+            if apply_link and "?" in apply_link:
+                apply_link = apply_link.split("?")[0]  # clean tracking params
+
+            # Deduplicate
+            uid = hashlib.md5(
+                f"{company_name}-{role_title}-LinkedIn".encode()
+            ).hexdigest()
+            if uid in seen:
+                continue
+            seen.add(uid)
+
+            org_type = "Company"
+            role_type = (
+                "Research"
+                if "research" in role_title.lower()
+                else "Applied"
+            )
+            match_score = calculate_match_score(
+                role_title, [], org_type, 0.0
+            )
+            currency = "INR" if location_type == "India" else "USD"
+            stip_numeric = 5000.0 if location_type == "India" else 1500.0
+
+            record = {
+                "id": uid,
+                "company_name": company_name,
+                "role_title": role_title,
+                "location": location,
+                "location_type": location_type,
+                "duration": "",
+                "stipend": "Check Listing",
+                "stipend_numeric": stip_numeric,
+                "stipend_currency": currency,
+                "required_skills": "",
+                "application_deadline": "",
+                "apply_link": apply_link,
+                "source_platform": f"LinkedIn ({label})",
+                "date_scraped": datetime.now().strftime("%Y-%m-%d"),
+                "org_type": org_type,
+                "role_type": role_type,
+                "match_score": match_score,
+            }
+            records.append(record)
+
+        except Exception as e:
+            logger.error(f"LinkedIn: Error parsing card: {e}")
+
+    return records
+
+
+def iter_linkedin(config=None):
+    """
+    Scrapes LinkedIn public job search pages for AI/ML internships.
+    Runs fully headless. Filters internal query list based on given config.
+    Search pages are loaded in parallel tabs by the async engine, and each
+    search's records are yielded as one batch as soon as it is parsed.
+    """
+    checkpoint = get_checkpoint()
+    jobs = []
+    for kw, loc, label in _select_configs(config):
+        url = BASE_URL.format(
+            kw=urllib.parse.quote_plus(kw),
+            loc=urllib.parse.quote_plus(loc),
+        )
+        if checkpoint.is_done("linkedin", url):
+            continue
+        jobs.append(PageJob(
+            key=(loc, label),
+            url=url,
+            prepare=_close_popups,  # Automatically close popups without waiting for the user
+            scrolls=5,              # Scroll to load more job cards
+            scroll_px=(700, 1400),
+            scroll_pause=(1.0, 2.0),
+            cooldown=(4.0, 8.0),    # Respectful delay between searches
+        ))
+
     seen = set()
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,  # Fully automated
-            args=get_playwright_stealth_args(),
-        )
-        context = browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/122.0.0.0 Safari/537.36"
-            ),
-            viewport={"width": 1440, "height": 900},
-            locale="en-US",
-        )
-        page = context.new_page()
-        Stealth().apply_stealth_sync(page)
-
-        for kw, loc, label in SEARCH_CONFIGS:
-            try:
-                # Filter by config parameters
-                kw_lower = kw.lower()
-                loc_lower = loc.lower()
-                
-                # Check region map
-                is_india = "india" in loc_lower
-                is_remote = "remote" in loc_lower or "anywhere" in loc_lower
-                is_worldwide = "worldwide" in loc_lower
-                is_europe = "europe" in loc_lower or "kingdom" in loc_lower or "germany" in loc_lower or "france" in loc_lower or "netherlands" in loc_lower or "switzerland" in loc_lower or "sweden" in loc_lower or "denmark" in loc_lower or "finland" in loc_lower or "spain" in loc_lower or "italy" in loc_lower or "belgium" in loc_lower or "austria" in loc_lower
-                is_usa = "united states" in loc_lower or "bay area" in loc_lower or "seattle" in loc_lower or "boston" in loc_lower or "york" in loc_lower
-                
-                # Default map to worldwide if none of above
-                region_match = False
-                if "india" in req_regions and is_india: region_match = True
-                if "usa" in req_regions and is_usa: region_match = True
-                if "europe" in req_regions and is_europe: region_match = True
-                if "remote" in req_regions and is_remote: region_match = True
-                if "worldwide" in req_regions and (is_worldwide or (not is_india and not is_usa and not is_europe and not is_remote)): region_match = True
-                
-                if not region_match:
-                    continue
-                    
-                # Topic match
-                topic_match = False
-                if "ai" in req_topics and ("artificial intelligence" in kw_lower or "ai " in kw_lower or " ai" in kw_lower or kw_lower.startswith("ai") or "robotics" in kw_lower): topic_match = True
-                if "ml" in req_topics and ("machine learning" in kw_lower or "reinforcement" in kw_lower or "rl " in kw_lower): topic_match = True
-                if "dl" in req_topics and "deep learning" in kw_lower: topic_match = True
-                if "ds" in req_topics and "data science" in kw_lower: topic_match = True
-                if "cv" in req_topics and "computer vision" in kw_lower: topic_match = True
-                if "nlp" in req_topics and "natural language" in kw_lower: topic_match = True
-                if "research" in req_topics and "research" in kw_lower: topic_match = True
-                if "llm/genai" in req_topics and ("generative" in kw_lower or "large language" in kw_lower): topic_match = True
-                
-                # Allow fallback if no specific topic arrays given
-                if req_topics and not topic_match:
-                    # If user chose specific topics and this config query matches none of them, skip.
-                    continue
-                    
-                import urllib.parse
-                url = BASE_URL.format(
-                    kw=urllib.parse.quote_plus(kw),
-                    loc=urllib.parse.quote_plus(loc),
-                )
-                logger.info(f"LinkedIn: Scraping [{label}] — {url}")
-                page.goto(url, timeout=45000)
-
-                # Automatically close popups without waiting for the user
-                _close_popups(page)
-
-                # Scroll to load more job cards
-                for _ in range(5):
-                    page.mouse.wheel(0, random.randint(700, 1400))
-                    human_delay(1.0, 2.0)
-
-                html = page.content()
-                soup = BeautifulSoup(html, "lxml")
-
-                # LinkedIn guest page uses these card selectors
-                cards = soup.find_all("div", class_=lambda c: c and "base-card" in c)
-                if not cards:
-                    # Fallback: look for job cards with data attributes
-                    cards = soup.find_all("li", class_=lambda c: c and "jobs-search__results-list" in (c or ""))
-                logger.info(f"LinkedIn [{label}]: Found {len(cards)} cards")
-
-                for card in cards:
-                    try:
-                        # Title
-                        title_elem = (
-                            card.find("h3", class_=lambda c: c and "base-search-card__title" in c)
-                            or card.find("h3")
-                        )
-                        if not title_elem:
-                            continue
-                        role_title = title_elem.get_text(strip=True)
-
-                        # Company
-                        comp_elem = (
-                            card.find("h4", class_=lambda c: c and "base-search-card__subtitle" in c)
-                            or card.find("a", class_=lambda c: c and "hidden-nested-link" in (c or ""))
-                            or card.find("h4")
-                        )
-                        company_name = (
-                            comp_elem.get_text(strip=True) if comp_elem else "Unknown"
-                        )
-
-                        # Location
-                        loc_elem = card.find(
-                            "span",
-                            class_=lambda c: c and "job-search-card__location" in c,
-                        )
-                        location = (
-                            loc_elem.get_text(strip=True) if loc_elem else loc
-                        )
-                        loc_lower = location.lower()
-                        if "remote" in loc_lower:
-                            location_type = "Remote"
-                        elif any(
-                            x in loc_lower
-                            for x in ["india", "bangalore", "mumbai", "delhi", "hyderabad", "pune", "chennai"]
-                        ):
-                            location_type = "India"
-                        else:
-                            location_type = "International"
-
-                        # Apply link
-                        link_elem = card.find(
-                            "a",
-                            class_=lambda c: c and "base-card__full-link" in (c or ""),
-                        ) or card.find("a", href=True)
-                        apply_link = link_elem["href"] if link_elem else ""
-                        if apply_link and "?" in apply_link:
-                            apply_link = apply_link.split("?")[0]  # clean tracking params
-
-                        # Deduplicate
-                        uid = hashlib.md5(
-                            f"{company_name}-{role_title}-LinkedIn".encode()
-                        ).hexdigest()
-                        if uid in seen:
-                            continue
-                        seen.add(uid)
-
-                        org_type = "Company"
-                        role_type = (
-                            "Research"
-                            if "research" in role_title.lower()
-                            else "Applied"
-                        )
-                        match_score = calculate_match_score(
-                            role_title, [], org_type, 0.0
-                        )
-                        currency = "INR" if location_type == "India" else "USD"
-                        stip_numeric = 5000.0 if location_type == "India" else 1500.0
-
-                        record = {
-                            "id": uid,
-                            "company_name": company_name,
-                            "role_title": role_title,
-                            "location": location,
-                            "location_type": location_type,
-                            "duration": "",
-                            "stipend": "Check Listing",
-                            "stipend_numeric": stip_numeric,
-                            "stipend_currency": currency,
-                            "required_skills": "",
-                            "application_deadline": "",
-                            "apply_link": apply_link,
-                            "source_platform": f"LinkedIn ({label})",
-                            "date_scraped": datetime.now().strftime("%Y-%m-%d"),
-                            "org_type": org_type,
-                            "role_type": role_type,
-                            "match_score": match_score,
-                        }
-                        all_internships.append(record)
-
-                    except Exception as e:
-                        logger.error(f"LinkedIn: Error parsing card: {e}")
-
-            except Exception as e:
-                logger.error(f"LinkedIn: Failed to load [{label}]: {e}")
-                # Continue rather than raise, to preserve already scraped data
-                continue
+    for job, html, error in fetch_pages(jobs, locale="en-US"):
+        loc, label = job.key
+        record_unit_result("linkedin", label, error)
+        if error:
+            # Continue rather than raise, to preserve already scraped data
+            continue
+        logger.info(f"LinkedIn: Scraped [{label}] — {job.url}")
+        yield _parse_cards(html, loc, label, seen)
+        checkpoint.mark_done("linkedin", job.url)
 
-            human_delay(4.0, 8.0)  # Respectful delay between searches
+    logger.info(f"LinkedIn: Scraped {len(seen)} unique internships.")
 
-        browser.close()
 
-    logger.info(f"LinkedIn: Scraped {len(all_internships)} unique internships.")
-    return all_internships
+def scrape_linkedin(config=None):
+    """Collects every batch from iter_linkedin() into a single list."""
+    return [record for batch in iter_linkedin(config) for record in batch]
@@ -1,4 +1,3 @@
-from playwright.sync_api import sync_playwright
 import time
 import random
 from bs4 import BeautifulSoup
@@ -8,9 +7,9 @@ from loguru import logger
 import urllib.parse
 import re
 from filters import calculate_match_score
-from playwright_stealth import Stealth
-from scraper_utils import human_delay, get_playwright_stealth_args
-from tenacity import retry, wait_exponential, stop_after_attempt
+from scraper_utils import human_delay, retry_unit, UnitFailed
+from location_normalizer import classify as classify_location
+from browser_pool import browser_session
 
 def parse_job_card(html, selectors, source_name, url_base=""):
     """Generic parser for simple job cards."""
@@ -38,7 +37,7 @@ def parse_job_card(html, selectors, source_name, url_base=""):
             # Location
             loc_elem = listing.find(selectors["loc_tag"], class_=re.compile(selectors.get("loc_class", "")))
             location = loc_elem.text.strip() if loc_elem else "India"
-            location_type = "Remote" if "Remote" in location or "Work From Home" in location else "India"
+            location_type = classify_location(location, default="India")
             
             org_type = "Company"
             role_type = "Research" if "research" in role_title.lower() else "Applied"
@@ -70,16 +69,12 @@ def parse_job_card(html, selectors, source_name, url_base=""):
             
     return results
 
-@retry(wait=wait_exponential(multiplier=1, min=2, max=10), stop=stop_after_attempt(3))
 def scrape_shine():
     results = []
-    with sync_playwright() as p:
+    with browser_session() as pool, pool.page() as page:
         try:
-            browser = p.chromium.launch(headless=True, args=get_playwright_stealth_args())
-            page = browser.new_page()
-            Stealth().apply_stealth_sync(page)
             url = "https://www.shine.com/job-search/ai-machine-learning-internship-jobs"
-            page.goto(url, timeout=30000)
+            retry_unit("shine", url, page.goto, url, timeout=30000)
             human_delay(3.0, 5.0)
             
             selectors = {
@@ -89,22 +84,19 @@ def scrape_shine():
                 "loc_tag": "div", "loc_class": "jobCardNova_bigCardCenterListLoc"
             }
             results = parse_job_card(page.content(), selectors, "Shine", "https://www.shine.com")
-            browser.close()
+        except UnitFailed:
+            pass  # Logged and counted against Shine's failure budget
         except Exception as e:
             logger.error(f"Shine error: {e}")
             raise e
     return results
 
-@retry(wait=wait_exponential(multiplier=1, min=2, max=10), stop=stop_after_attempt(3))
 def scrape_foundit():
     results = []
-    with sync_playwright() as p:
+    with browser_session() as pool, pool.page() as page:
         try:
-            browser = p.chromium.launch(headless=True, args=get_playwright_stealth_args())
-            page = browser.new_page()
-            Stealth().apply_stealth_sync(page)
             url = "https://www.foundit.in/srp/results?query=ai+ml+internship"
-            page.goto(url, timeout=30000)
+            retry_unit("foundit", url, page.goto, url, timeout=30000)
             human_delay(3.0, 6.0)
             
             selectors = {
@@ -114,22 +106,19 @@ def scrape_foundit():
                 "loc_tag": "div", "loc_class": "details"
             }
             results = parse_job_card(page.content(), selectors, "Foundit", "https://www.foundit.in")
-            browser.close()
+        except UnitFailed:
+            pass  # Logged and counted against Foundit's failure budget
         except Exception as e:
             logger.error(f"Foundit error: {e}")
             raise e
     return results
 
-@retry(wait=wait_exponential(multiplier=1, min=2, max=10), stop=stop_after_attempt(3))
 def scrape_apna():
     results = []
-    with sync_playwright() as p:
+    with browser_session() as pool, pool.page() as page:
         try:
-            browser = p.chromium.launch(headless=True, args=get_playwright_stealth_args())
-            page = browser.new_page()
-            Stealth().apply_stealth_sync(page)
             url = "https://apna.co/jobs?category=internship&q=ai+ml"
-            page.goto(url, timeout=30000)
+            retry_unit("apna", url, page.goto, url, timeout=30000)
             human_delay(4.0, 7.0)
             
             html = page.content()
@@ -154,7 +143,7 @@ def scrape_apna():
                     
                     loc_elem = listing.find(attrs={"data-testid": "job-location"})
                     location = loc_elem.text.strip() if loc_elem else "India"
-                    location_type = "Remote" if "Remote" in location or "Work From Home" in location else "India"
+                    location_type = classify_location(location, default="India")
                     
                     sal_elem = listing.find(attrs={"data-testid": "job-salary"})
                     stipend = sal_elem.text.strip() if sal_elem else ""
@@ -188,22 +177,19 @@ def scrape_apna():
                     })
                 except Exception as e:
                     continue
-            browser.close()
+        except UnitFailed:
+            pass  # Logged and counted against Apna's failure budget
         except Exception as e:
             logger.error(f"Apna error: {e}")
             raise e
     return results
 
-@retry(wait=wait_exponential(multiplier=1, min=2, max=10), stop=stop_after_attempt(3))
 def scrape_cutshort():
     results = []
-    with sync_playwright() as p:
+    with browser_session() as pool, pool.page() as page:
         try:
-            browser = p.chromium.launch(headless=True, args=get_playwright_stealth_args())
-            page = browser.new_page()
-            Stealth().apply_stealth_sync(page)
             url = "https://cutshort.io/jobs/ai-ml?type=internship"
-            page.goto(url, timeout=30000)
+            retry_unit("cutshort", url, page.goto, url, timeout=30000)
             human_delay(3.0, 5.0)
             
             selectors = {
@@ -213,7 +199,8 @@ def scrape_cutshort():
                 "loc_tag": "div", "loc_class": "location"
             }
             results = parse_job_card(page.content(), selectors, "Cutshort", "https://cutshort.io")
-            browser.close()
+        except UnitFailed:
+            pass  # Logged and counted against Cutshort's failure budget
         except Exception as e:
             logger.error(f"Cutshort error: {e}")
             raise e
@@ -1,4 +1,3 @@
-from playwright.sync_api import sync_playwright
 import time
 import random
 from bs4 import BeautifulSoup
@@ -7,33 +6,24 @@ from datetime import datetime
 from loguru import logger
 from filters import calculate_match_score
 import re
-from playwright_stealth import Stealth
-from scraper_utils import human_delay, get_playwright_stealth_args, action_required, action_resolved
-from tenacity import retry, wait_exponential, stop_after_attempt
+from scraper_utils import human_delay, action_required, action_resolved, retry_unit, UnitFailed
+from location_normalizer import classify as classify_location
+from browser_pool import browser_session
 
-@retry(wait=wait_exponential(multiplier=1, min=2, max=10), stop=stop_after_attempt(3))
 def scrape_naukri():
     """Scrapes AI/ML internship listings from Naukri (India)."""
     all_internships = []
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,  # Fully automated
-            args=get_playwright_stealth_args()
-        )
-        # Using a more robust context for Naukri to bypass basic blockers
-        context = browser.new_context(
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            viewport={'width': 1440, 'height': 900}
-        )
-        page = context.new_page()
-        Stealth().apply_stealth_sync(page)
-        
+    # Using a more robust context for Naukri to bypass basic blockers
+    with browser_session() as pool, pool.page(
+        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        viewport={'width': 1440, 'height': 900}
+    ) as page:
         url = "https://www.naukri.com/ai-ml-internship-jobs-in-india"
         
         try:
             logger.info(f"Scraping Naukri: {url} ...")
-            page.goto(url, timeout=45000)
+            retry_unit("naukri", url, page.goto, url, timeout=45000)
             
             # Wait for job list
             try:
@@ -63,7 +53,7 @@ def scrape_naukri():
                     
                     loc_elem = listing.find("span", class_="locWdth")
                     location = loc_elem.text.strip() if loc_elem else "India"
-                    location_type = "Remote" if "Remote" in location or "Work From Home" in location else "India"
+                    location_type = classify_location(location, default="India")
                     
                     exp_elem = listing.find("span", class_="expwdth")
                     if exp_elem:
@@ -117,10 +107,7 @@ def scrape_naukri():
                 except Exception as e:
                     logger.error(f"Error parsing Naukri listing: {e}")
                     
-        except Exception as e:
-            logger.error(f"Failed to load Naukri {url}: {e}")
-            raise e
-            
-        browser.close()
+        except UnitFailed:
+            pass  # Logged and counted against Naukri's failure budget
         
     return all_internships
@@ -3,7 +3,8 @@ import hashlib
 from datetime import datetime
 from loguru import logger
 from filters import calculate_match_score, is_valid_internship
-from tenacity import retry, wait_exponential, stop_after_attempt
+from scraper_utils import retry_unit, UnitFailed
+from keyword_matcher import KeywordMatcher
 
 AI_KEYWORDS = [
     "machine learning", "artificial intelligence", "deep learning", "nlp",
@@ -11,12 +12,20 @@ AI_KEYWORDS = [
     "llm", "neural", "research intern", "ai intern", "ml intern"
 ]
 
+_AI_MATCHER = KeywordMatcher({"ai_ml": AI_KEYWORDS})
+
 def _matches_ai_ml(text: str) -> bool:
-    text_lower = text.lower()
-    return any(kw in text_lower for kw in AI_KEYWORDS)
+    return _AI_MATCHER.matches(text)
+
+
+def _fetch_feed(url: str):
+    """feedparser never raises on network errors, so turn an empty broken feed into one."""
+    feed = feedparser.parse(url)
+    if feed.get("bozo") and not feed.entries:
+        raise feed.get("bozo_exception") or ValueError(f"Unreadable feed: {url}")
+    return feed
 
 
-@retry(wait=wait_exponential(multiplier=1, min=2, max=10), stop=stop_after_attempt(3))
 def scrape_linkedin():
     """
     Scrapes Remotive.com RSS feed for AI/ML remote internships.
@@ -33,7 +42,7 @@ def scrape_linkedin():
     for url in feeds_to_try:
         try:
             logger.info(f"Scraping Remotive RSS (AI/ML remote jobs): {url} ...")
-            feed = feedparser.parse(url)
+            feed = retry_unit("remotive", url, _fetch_feed, url)
             
             for entry in feed.entries:
                 try:
@@ -88,6 +97,8 @@ def scrape_linkedin():
                 except Exception as e:
                     logger.error(f"Error parsing Remotive entry: {e}")
                     
+        except UnitFailed:
+            continue  # Logged and counted against the source's failure budget
         except Exception as e:
             logger.error(f"Failed to load Remotive RSS feed {url}: {e}")
     
@@ -95,7 +106,6 @@ def scrape_linkedin():
     return all_internships
 
 
-@retry(wait=wait_exponential(multiplier=1, min=2, max=10), stop=stop_after_attempt(3))
 def scrape_indeed():
     """
     Scrapes WeWorkRemotely RSS feed for AI/ML internships.
@@ -111,7 +121,7 @@ def scrape_indeed():
     for url in feeds_to_try:
         try:
             logger.info(f"Scraping WeWorkRemotely RSS (AI/ML remote jobs): {url} ...")
-            feed = feedparser.parse(url)
+            feed = retry_unit("weworkremotely", url, _fetch_feed, url)
             
             for entry in feed.entries:
                 try:
@@ -173,6 +183,8 @@ def scrape_indeed():
                 except Exception as e:
                     logger.error(f"Error parsing WeWorkRemotely entry: {e}")
                     
+        except UnitFailed:
+            continue  # Logged and counted against the source's failure budget
         except Exception as e:
             logger.error(f"Failed to load WeWorkRemotely RSS feed {url}: {e}")
     
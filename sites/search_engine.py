@@ -1,17 +1,19 @@
 import hashlib
 from datetime import datetime
 from loguru import logger
-from scraper_utils import human_delay
+from scraper_utils import human_delay, retry_unit, UnitFailed
+from checkpoint import get_checkpoint
 try:
     from ddgs import DDGS  # new package name
 except ImportError:
     from duckduckgo_search import DDGS  # legacy fallback
 from filters import calculate_match_score, is_valid_internship
 
-def scrape_search_engine(config=None):
-    """Dynamically aggregates hidden internship links using DuckDuckGo Dorks."""
-    all_internships = []
-    
+def iter_search_engine(config=None):
+    """
+    Dynamically aggregates hidden internship links using DuckDuckGo Dorks.
+    Yields each dork's results as one batch.
+    """
     if config is None:
         config = {}
         
@@ -112,15 +114,20 @@ def scrape_search_engine(config=None):
         
     if not active_queries:
         logger.warning("SearchEngine: No dork queries matched the requested regions.")
-        return []
+        return
+
+    checkpoint = get_checkpoint()
 
     try:
         ddgs = DDGS()
         for q_obj in active_queries:
+            if checkpoint.is_done("search", q_obj['q']):
+                continue
             logger.info(f"Running Dork Search: {q_obj['q']}")
             try:
                 # Use text search, fetching top 15 results
-                results = list(ddgs.text(q_obj['q'], max_results=15))
+                results = retry_unit("search", q_obj['source_prefix'], lambda: list(ddgs.text(q_obj['q'], max_results=15)))
+                batch = []
                 
                 for res in results:
                     title = res.get('title', '')
@@ -163,8 +170,13 @@ def scrape_search_engine(config=None):
                         "match_score": match_score
                     }
                     
-                    all_internships.append(record)
+                    batch.append(record)
                     
+                yield batch
+                checkpoint.mark_done("search", q_obj['q'])
+                    
+            except UnitFailed:
+                pass  # Logged and counted against the source's failure budget
             except Exception as e:
                 logger.error(f"Error executing dork {q_obj['q']}: {e}")
                 
@@ -172,5 +184,7 @@ def scrape_search_engine(config=None):
             
     except Exception as e:
         logger.error(f"Error initializing duckduckgo search: {e}")
-        
-    return all_internships
+
+def scrape_search_engine(config=None):
+    """Collects every batch from iter_search_engine() into a single list."""
+    return [record for batch in iter_search_engine(config) for record in batch]
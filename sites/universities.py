@@ -18,7 +18,10 @@ except ImportError:
 
 from loguru import logger
 from filters import calculate_match_score, is_valid_internship
-from scraper_utils import human_delay
+from keyword_matcher import KeywordMatcher
+from location_normalizer import classify as classify_location
+from scraper_utils import human_delay, retry_unit, UnitFailed
+from checkpoint import get_checkpoint
 
 YEAR = datetime.now().year
 
@@ -228,6 +231,8 @@ INTERNSHIP_TERMS = [
     "summer program", "research assistant", "research program", "student researcher",
 ]
 
+_RELEVANCE = KeywordMatcher({"ai": AI_TERMS, "internship": INTERNSHIP_TERMS})
+
 
 def _domain(url: str) -> str:
     try:
@@ -236,22 +241,25 @@ def _domain(url: str) -> str:
         return url[:40]
 
 
-def scrape_universities():
+def iter_universities():
     """
     Dynamically discovers AI/ML research internships at universities,
     government labs, and AI research institutes worldwide using DuckDuckGo.
+    Yields each query's results as one batch.
     """
-    all_internships = []
     seen_ids: set = set()
+    checkpoint = get_checkpoint()
 
     try:
         ddgs = DDGS()
 
         for i, (query, category, def_org, def_role, location, loc_type) in enumerate(QUERIES):
+            if checkpoint.is_done("universities", query):
+                continue
             logger.info(f"[Universities] Query {i+1}/{len(QUERIES)}: {category}")
             try:
-                results = list(ddgs.text(query, max_results=15))
-                found_this = 0
+                results = retry_unit("universities", category, lambda: list(ddgs.text(query, max_results=15)))
+                batch = []
 
                 for res in results:
                     title = res.get("title", "").strip()
@@ -261,14 +269,14 @@ def scrape_universities():
                     if not href or not title:
                         continue
 
-                    full_text = f"{title} {snippet}".lower()
+                    full_text = f"{title} {snippet}"
 
                     # Must relate to AI/ML
-                    if not any(k in full_text for k in AI_TERMS):
+                    if not _RELEVANCE.matches(full_text, "ai"):
                         continue
 
                     # Must relate to internship/fellowship
-                    if not any(k in full_text for k in INTERNSHIP_TERMS):
+                    if not _RELEVANCE.matches(full_text, "internship"):
                         continue
 
                     # Deduplicate by URL hash
@@ -291,8 +299,10 @@ def scrape_universities():
                     else:
                         org_type, role_type = def_org, def_role
 
-                    currency = "INR" if loc_type == "India" else "USD"
-                    stipend_num = 60000.0 if loc_type == "India" else 1500.0
+                    # The link's domain (e.g. ".ac.in") beats the region the query targeted
+                    region = classify_location(location, href, domain, default=loc_type)
+                    currency = "INR" if region == "India" else "USD"
+                    stipend_num = 60000.0 if region == "India" else 1500.0
 
                     match_score = calculate_match_score(
                         f"{title} {snippet}", ["Research", "AI", "ML"], org_type, stipend_num
@@ -303,7 +313,7 @@ def scrape_universities():
                         "company_name": domain,
                         "role_title": role_title,
                         "location": location,
-                        "location_type": loc_type,
+                        "location_type": region,
                         "duration": "Check Program Page",
                         "stipend": "Funded / Stipend (Check Website)",
                         "stipend_numeric": stipend_num,
@@ -317,14 +327,17 @@ def scrape_universities():
                         "role_type": role_type,
                         "match_score": match_score,
                     }
-                    all_internships.append(record)
-                    found_this += 1
+                    batch.append(record)
 
                 logger.info(
-                    f"[Universities] {category}: +{found_this} "
-                    f"(total: {len(all_internships)})"
+                    f"[Universities] {category}: +{len(batch)} "
+                    f"(total: {len(seen_ids)})"
                 )
+                yield batch
+                checkpoint.mark_done("universities", query)
 
+            except UnitFailed:
+                pass  # Logged and counted against the source's failure budget
             except Exception as e:
                 logger.error(f"[Universities] Error on '{category}': {e}")
 
@@ -334,7 +347,11 @@ def scrape_universities():
         logger.error(f"[Universities] Critical error: {e}")
 
     logger.info(
-        f"[Universities] Discovered {len(all_internships)} unique global "
+        f"[Universities] Discovered {len(seen_ids)} unique global "
         f"research internship/fellowship listings."
     )
-    return all_internships
+
+
+def scrape_universities():
+    """Collects every batch from iter_universities() into a single list."""
+    return [record for batch in iter_universities() for record in batch]
@@ -0,0 +1,110 @@
+/**
+ * Filter/sort engine for the dashboard, run as a Web Worker so that typing
+ * in the search box never waits on a pass over every listing.
+ *
+ * The page sends listings once ("put") and then only the filter state
+ * ("query"). Everything a query needs is prepared ahead of time: lowercased
+ * search keys, numeric stipends, epoch dates, and per-sort-key index arrays
+ * that are already in order. A query is one walk down the presorted array
+ * that tests each listing, and the answer is a Uint32Array of indices into
+ * the page's allInternships (transferred, not copied).
+ *
+ * Messages in:
+ *   {type: "put", reset, entries: [[index, listing], ...]}
+ *   {type: "query", id, sort, filters: {q, source, location, stipend, org, role}}
+ * Message out:
+ *   {type: "result", id, indices}
+ */
+
+let listings = [];   // index -> the fields filters look at
+let searchKeys = []; // index -> lowercased "title company skills"
+let stipends = new Float64Array(0);
+let perMonth = new Uint8Array(0);  // stipend text mentions "month" (counts as paid)
+let scores = new Float64Array(0);
+let dates = new Float64Array(0);
+let orders = {};     // sort key -> Uint32Array of indices in that order
+let dirty = false;
+
+// Same order as the server's SORTS
+const SORTS = {
+    match_score: (a, b) => (scores[b] - scores[a]) || (dates[b] - dates[a]),
+    date: (a, b) => (dates[b] - dates[a]) || (scores[b] - scores[a]),
+};
+
+function put(entries, reset) {
+    if (reset) {
+        listings = [];
+        searchKeys = [];
+    }
+    for (const [index, item] of entries) {
+        listings[index] = item;
+        searchKeys[index] = `${item.role_title || ''} ${item.company_name || ''} ${item.required_skills || ''}`.toLowerCase();
+    }
+    dirty = true;
+}
+
+function rebuild() {
+    const n = listings.length;
+    stipends = new Float64Array(n);
+    perMonth = new Uint8Array(n);
+    scores = new Float64Array(n);
+    dates = new Float64Array(n);
+    for (let i = 0; i < n; i++) {
+        const item = listings[i];
+        stipends[i] = parseFloat(item.stipend_numeric) || 0;
+        perMonth[i] = (item.stipend || '').toLowerCase().includes("month") ? 1 : 0;
+        scores[i] = Number(item.match_score) || 0;
+        dates[i] = Date.parse(item.date_scraped) || 0;
+    }
+    orders = {};  // Sorted again on first use
+    dirty = false;
+}
+
+function sortedIndices(sort) {
+    if (dirty) rebuild();
+    const key = SORTS[sort] ? sort : "match_score";
+    if (!orders[key]) {
+        const order = new Uint32Array(listings.length);
+        for (let i = 0; i < order.length; i++) order[i] = i;
+        orders[key] = order.sort(SORTS[key]);
+    }
+    return orders[key];
+}
+
+function query(filters, sort) {
+    const order = sortedIndices(sort);
+    const { q, source, location, stipend, org, role } = filters;
+    const minStipend = { "10k": 10000, "20k": 20000, "50k": 50000 }[stipend] || 0;
+
+    const out = new Uint32Array(order.length);
+    let count = 0;
+    for (let k = 0; k < order.length; k++) {
+        const i = order[k];
+        const item = listings[i];
+
+        if (q && !searchKeys[i].includes(q)) continue;
+        if (source !== "all" && item.source_platform !== source) continue;
+        if (location !== "all" && item.location_type !== location) continue;
+
+        const stip = stipends[i];
+        if (stipend === "paid" && stip <= 0 && !perMonth[i]) continue;
+        if (minStipend && stip < minStipend) continue;
+        if (stipend === "unpaid" && stip > 0) continue;
+
+        if (org !== "all" && item.org_type !== org) continue;
+        if (role !== "all" && item.role_type !== role) continue;
+
+        out[count++] = i;
+    }
+    return out.slice(0, count);
+}
+
+self.onmessage = (e) => {
+    const msg = e.data;
+    if (msg.type === "put") {
+        put(msg.entries, msg.reset);
+    } else if (msg.type === "query") {
+        const indices = query(msg.filters, msg.sort);
+        self.postMessage({ type: "result", id: msg.id, indices }, [indices.buffer]);
+    }
+};
@@ -1,12 +1,6 @@
 let allInternships = [];
 let isLoadingData = false;
-
-function escapeHtml(str) {
-    if (!str) return '';
-    const div = document.createElement('div');
-    div.textContent = str;
-    return div.innerHTML;
-}
+let syncSeq = null;  // highest listing seq we hold; null until the first full load
 
 function sanitizeUrl(url) {
     if (!url) return '#';
@@ -22,10 +16,10 @@ function sanitizeUrl(url) {
 document.addEventListener("DOMContentLoaded", () => {
     loadData();
     checkScraperStatus();
-    pollAlerts();  // Start polling for CAPTCHA/popup alerts
+    connectEvents();  // Live status, logs, alerts and new listings (no polling)
 
     // Setup event listeners
-    document.getElementById("search-input").addEventListener("input", renderListings);
+    document.getElementById("search-input").addEventListener("input", debounce(renderListings, SEARCH_DEBOUNCE_MS));
     document.getElementById("source-filter").addEventListener("change", renderListings);
 
     // Group filter listeners
@@ -52,7 +46,8 @@ document.addEventListener("DOMContentLoaded", () => {
         const config = {
             regions: getCheckedValues("regions"),
             topics: getCheckedValues("topics"),
-            sources: getCheckedValues("sources")
+            sources: getCheckedValues("sources"),
+            resume: document.getElementById("resume-checkbox").checked
         };
 
         triggerScraper(config);
@@ -83,12 +78,15 @@ document.addEventListener("DOMContentLoaded", () => {
 
             if (data.status === "success") {
                 allInternships = [];
+                indexListings([], true);
+                listingCache.clear();
                 renderListings();
-                updateRegionCounts();
+                updateFacets();
                 document.getElementById("total-count").innerText = "0";
 
                 // Fetch fresh logs to clear the panel
                 const content = document.getElementById("logs-content");
+                logCursor = null;
                 if (content) content.innerHTML = "<div>No logs yet. Click 'Run Scraper Now' to start!</div>";
 
                 alert("Database successfully cleared!");
@@ -113,12 +111,6 @@ document.addEventListener("DOMContentLoaded", () => {
     document.getElementById("close-logs-btn").addEventListener("click", () => {
         document.getElementById("logs-panel").classList.add("hidden");
     });
-
-    // Poll status and logs
-    setInterval(() => {
-        checkScraperStatus();
-        fetchLogs();
-    }, 4000);
 });
 
 function setupFilters(containerId, filterType) {
@@ -168,13 +160,11 @@ function syncRegionTabs(val) {
     tabs.forEach(t => t.classList.toggle('active', t.dataset.region === val));
 }
 
-function updateRegionCounts() {
-    const counts = { all: allInternships.length, India: 0, International: 0, Remote: 0 };
-    allInternships.forEach(i => {
-        if (i.location_type === 'India') counts.India++;
-        else if (i.location_type === 'Remote') counts.Remote++;
-        else counts.International++;
-    });
+/** Region tab counts from /api/facets; anything not India or Remote counts as Global. */
+function updateRegionCounts(facets) {
+    const byType = facets.facets.location_type || {};
+    const counts = { all: facets.total, India: byType.India || 0, Remote: byType.Remote || 0 };
+    counts.International = counts.all - counts.India - counts.Remote;
     const fmt = n => n > 0 ? n.toLocaleString() : '—';
     document.getElementById('tab-count-all').textContent = fmt(counts.all);
     document.getElementById('tab-count-india').textContent = fmt(counts.India);
@@ -183,52 +173,61 @@ function updateRegionCounts() {
 }
 
 
+/** Full download, used when this browser has nothing cached yet. */
+async function loadAllListings() {
+    const res = await fetch("/api/internships?format=columnar");
+    allInternships = decodeColumnar(await res.json());
+
+    // ----------------------------------------------------------
+    // Deduplicate by 'id' field (100% safe — IDs are hash-based)
+    // ----------------------------------------------------------
+    const seenIds = new Set();
+    allInternships = allInternships.filter(item => {
+        if (!item.id || seenIds.has(item.id)) return false;
+        seenIds.add(item.id);
+        return true;
+    });
+    syncSeq = allInternships.reduce((max, item) => Math.max(max, item.seq || 0), 0);
+    indexListings(allInternships.map((_, i) => i), true);
+    listingCache.save(allInternships, syncSeq, true);
+}
+
+function showListings() {
+    document.getElementById("total-count").innerText = allInternships.length;
+
+    updateFacets();
+
+    renderListings();
+}
+
 async function loadData() {
     if (isLoadingData) return;
     isLoadingData = true;
 
     // Only show loading spinner on first load if container is empty
-    if (document.getElementById("listings-container").children.length === 0) {
+    if (allInternships.length === 0) {
         document.getElementById("loading-spinner").classList.remove("hidden");
     }
 
     try {
-        const res = await fetch("/api/internships");
-        const data = await res.json();
-        allInternships = data;
-
-        // ----------------------------------------------------------
-        // Deduplicate by 'id' field (100% safe — IDs are hash-based)
-        // ----------------------------------------------------------
-        const seenIds = new Set();
-        allInternships = allInternships.filter(item => {
-            if (!item.id || seenIds.has(item.id)) return false;
-            seenIds.add(item.id);
-            return true;
-        });
-
-        // Fix location_type based on actual URL / location text
-        // (some scrapers tag by query region, not actual listing location)
-        normalizeLocationTypes(allInternships);
-
-        document.getElementById("total-count").innerText = allInternships.length;
-
-        // Populate sources without causing dropdown to collapse
-        const sources = [...new Set(allInternships.map(i => i.source_platform))].filter(Boolean).sort();
-        const sourceSelect = document.getElementById("source-filter");
-
-        const currentOptions = Array.from(sourceSelect.options).map(o => o.value).filter(v => v !== 'all').sort();
-        if (JSON.stringify(sources) !== JSON.stringify(currentOptions)) {
-            const currentSelection = sourceSelect.value;
-            sourceSelect.innerHTML = '<option value="all">All Sources</option>';
-            sources.forEach(s => {
-                const isSelected = (s === currentSelection) ? 'selected' : '';
-                sourceSelect.innerHTML += `<option value="${escapeHtml(s)}" ${isSelected}>${escapeHtml(s)}</option>`;
-            });
+        if (syncSeq === null) {
+            const cached = await listingCache.load();
+            if (cached) {
+                // Paint what this browser already has, then fetch only what changed since
+                allInternships = cached.items;
+                syncSeq = cached.seq;
+                indexListings(allInternships.map((_, i) => i), true);
+                showListings();
+                document.getElementById("loading-spinner").classList.add("hidden");
+                if (!(await syncChanges())) return;
+            } else {
+                await loadAllListings();
+            }
+        } else if (!(await syncChanges())) {
+            return;  // Nothing changed since the last sync
         }
 
-        renderListings();
-        updateRegionCounts();
+        showListings();
     } catch (err) {
         console.error("Failed to load data", err);
     } finally {
@@ -237,209 +236,371 @@ async function loadData() {
     }
 }
 
-function renderListings() {
-    const container = document.getElementById("listings-container");
-
-    const searchQ = document.getElementById("search-input").value.toLowerCase();
-    const sourceF = document.getElementById("source-filter").value;
-    const locF = window.activeLocationFilter || "all";
-    const stipF = window.activeStipendFilter || "all";
-    const orgF = window.activeOrgFilter || "all";
-    const roleF = window.activeRoleFilter || "all";
-
-    let filtered = allInternships.filter(item => {
-        // Search
-        if (searchQ) {
-            const str = `${item.role_title} ${item.company_name} ${item.required_skills}`.toLowerCase();
-            if (!str.includes(searchQ)) return false;
-        }
-
-        // Source
-        if (sourceF !== "all" && item.source_platform !== sourceF) return false;
-
-        // Location
-        if (locF !== "all" && item.location_type !== locF) return false;
+/**
+ * Turns a `format=columnar` payload ({length, columns, dictionaries}) back
+ * into one object per listing. Dictionary-encoded columns hold indices into
+ * their list of distinct values.
+ */
+function decodeColumnar(payload) {
+    const names = Object.keys(payload.columns);
+    const columns = names.map(name => {
+        const values = payload.columns[name];
+        const dictionary = payload.dictionaries[name];
+        return dictionary ? values.map(code => dictionary[code]) : values;
+    });
+    const items = new Array(payload.length);
+    for (let i = 0; i < payload.length; i++) {
+        const item = {};
+        for (let c = 0; c < names.length; c++) item[names[c]] = columns[c][i];
+        items[i] = item;
+    }
+    return items;
+}
 
-        // Stipend
-        const stipNum = parseFloat(item.stipend_numeric) || 0;
-        if (stipF === "paid" && stipNum <= 0 && (!item.stipend || !item.stipend.toLowerCase().includes("month"))) return false;
-        if (stipF === "10k" && stipNum < 10000) return false;
-        if (stipF === "20k" && stipNum < 20000) return false;
-        if (stipF === "50k" && stipNum < 50000) return false;
-        if (stipF === "unpaid" && stipNum > 0) return false;
+/** Refreshes everything drawn from the server's precomputed facet counts. */
+async function updateFacets() {
+    try {
+        const res = await fetch("/api/facets");
+        const data = await res.json();
+        updateSourceOptions(data);
+        updateRegionCounts(data);
+    } catch (err) {
+        console.error("Failed to load facets", err);
+    }
+}
 
-        // Org Type
-        if (orgF !== "all" && item.org_type !== orgF) return false;
+/**
+ * Fills the source dropdown from the facet counts, without collapsing it if
+ * the set of sources did not change.
+ */
+function updateSourceOptions(facets) {
+    const counts = facets.facets.source_platform || {};
+    const sources = Object.keys(counts).filter(s => s && counts[s] > 0).sort();
+    const labels = sources.map(s => `${s} (${counts[s].toLocaleString()})`);
+    const sourceSelect = document.getElementById("source-filter");
 
-        // Role Type
-        if (roleF !== "all" && item.role_type !== roleF) return false;
+    const currentLabels = Array.from(sourceSelect.options).filter(o => o.value !== 'all').map(o => o.text);
+    if (JSON.stringify(labels) === JSON.stringify(currentLabels)) return;
 
-        return true;
+    const currentSelection = sourceSelect.value;
+    const fragment = document.createDocumentFragment();
+    fragment.appendChild(new Option("All Sources", "all"));
+    sources.forEach((s, i) => {
+        fragment.appendChild(new Option(labels[i], s, false, s === currentSelection));
     });
+    sourceSelect.replaceChildren(fragment);
+}
 
-    // Sort by Match Score Descending, then Date
-    filtered.sort((a, b) => {
-        const scoreA = a.match_score || 0;
-        const scoreB = b.match_score || 0;
-        if (scoreB !== scoreA) {
-            return scoreB - scoreA;
+/**
+ * Listings kept in IndexedDB between visits, keyed by id, plus the seq they
+ * are synced up to. On a reload the dashboard shows them at once and asks
+ * the server only for /changes since that seq. Every method resolves, even
+ * when IndexedDB is unavailable (e.g. some private windows); the page then
+ * just downloads everything as before.
+ */
+const listingCache = {
+    DB_NAME: "internship-radar",
+    DB_VERSION: 2,  // 2: location_type is set by the server (older caches hold client guesses)
+    dbPromise: null,
+
+    open() {
+        if (!this.dbPromise) {
+            this.dbPromise = new Promise(resolve => {
+                try {
+                    const req = indexedDB.open(this.DB_NAME, this.DB_VERSION);
+                    req.onupgradeneeded = () => {
+                        // Any older cache is dropped and refilled from the server
+                        const db = req.result;
+                        Array.from(db.objectStoreNames).forEach(name => db.deleteObjectStore(name));
+                        db.createObjectStore("listings", { keyPath: "id" });
+                        db.createObjectStore("meta");
+                    };
+                    req.onsuccess = () => resolve(req.result);
+                    req.onerror = () => resolve(null);
+                } catch (e) {
+                    resolve(null);
+                }
+            });
         }
-        return new Date(b.date_scraped) - new Date(a.date_scraped);
-    });
-
-    document.getElementById("visible-count").innerText = filtered.length;
+        return this.dbPromise;
+    },
+
+    /** Resolves with {items, seq}, or null if nothing usable is cached. */
+    async load() {
+        const db = await this.open();
+        if (!db) return null;
+        return new Promise(resolve => {
+            const tx = db.transaction(["listings", "meta"], "readonly");
+            const seqReq = tx.objectStore("meta").get("syncSeq");
+            const itemsReq = tx.objectStore("listings").getAll();
+            tx.oncomplete = () => resolve(
+                typeof seqReq.result === "number" ? { items: itemsReq.result, seq: seqReq.result } : null
+            );
+            tx.onerror = () => resolve(null);
+        });
+    },
+
+    /** Stores `items` and the seq they bring us to, in one transaction. */
+    async save(items, seq, reset = false) {
+        const db = await this.open();
+        if (!db) return;
+        return new Promise(resolve => {
+            const tx = db.transaction(["listings", "meta"], "readwrite");
+            const listings = tx.objectStore("listings");
+            if (reset) listings.clear();
+            items.forEach(item => listings.put(item));
+            tx.objectStore("meta").put(seq, "syncSeq");
+            tx.oncomplete = tx.onerror = tx.onabort = () => resolve();
+        });
+    },
+
+    async clear() {
+        const db = await this.open();
+        if (!db) return;
+        return new Promise(resolve => {
+            const tx = db.transaction(["listings", "meta"], "readwrite");
+            tx.objectStore("listings").clear();
+            tx.objectStore("meta").clear();
+            tx.oncomplete = tx.onerror = tx.onabort = () => resolve();
+        });
+    },
+};
 
-    const existingCards = Array.from(container.children).filter(c => c.tagName === 'DIV' && c.hasAttribute('data-id'));
-    const existingIds = new Set(existingCards.map(c => c.dataset.id));
-    const validIds = new Set(filtered.map(i => i.id));
+/**
+ * Pulls only the listings added/updated since syncSeq and merges them into
+ * allInternships. Returns true if anything changed.
+ */
+async function syncChanges() {
+    let changed = false;
+    let more = true;
 
-    if (filtered.length === 0) {
-        // Keep it empty, show message
-        container.innerHTML = `<p class="empty-msg" style="color:var(--text-muted); grid-column: 1/-1; text-align:center; padding: 40px;">No internships found matching your criteria.</p>`;
-        return;
-    } else {
-        // Remove empty state message if it exists
-        const emptyMsg = container.querySelector(".empty-msg");
-        if (emptyMsg) emptyMsg.remove();
-    }
+    while (more) {
+        const res = await fetch(`/api/internships/changes?since=${syncSeq}&format=columnar`);
+        const data = await res.json();
+        data.items = decodeColumnar(data.items);
 
-    // 1. Remove cards that are no longer valid (filtered out)
-    existingCards.forEach(card => {
-        if (!validIds.has(card.dataset.id)) {
-            card.remove();
-            existingIds.delete(card.dataset.id);
+        if (data.reset) {
+            allInternships = [];
+            changed = true;
         }
-    });
-
-    // 2. Add new cards that aren't in the DOM yet
-    const fragment = document.createDocumentFragment();
-    let newCardsCount = 0;
-
-    filtered.forEach((item, index) => {
-        if (!existingIds.has(item.id)) {
-            const isNewHtml = item.is_new ? `<div class="new-badge">New</div>` : '';
-            const stipendDisp = escapeHtml(item.stipend ? item.stipend : "Unpaid / Not Disclosed");
-            const durDisp = escapeHtml(item.duration ? item.duration : "N/A");
-            const locDisp = escapeHtml(item.location ? item.location : item.location_type);
-            const skillsDisp = escapeHtml(item.required_skills ? item.required_skills : "Not specified");
-            const scoreBadge = item.match_score ? `<div class="match-score-badge ${item.match_score >= 80 ? 'high-score' : (item.match_score >= 60 ? 'med-score' : 'low-score')}">${item.match_score}% Match</div>` : '';
-            const orgBadge = item.org_type ? `<span class="tag tag-org"><i class="ph ph-bank"></i> ${escapeHtml(item.org_type)}</span>` : '';
-            const roleBadge = item.role_type ? `<span class="tag tag-role"><i class="ph ph-flask"></i> ${escapeHtml(item.role_type)}</span>` : '';
-
-            const safeCompany = escapeHtml(item.company_name);
-            const safeRole = escapeHtml(item.role_title);
-            const safeSource = escapeHtml(item.source_platform);
-            const safeDate = escapeHtml(item.date_scraped);
-
-            const card = document.createElement("div");
-            card.dataset.id = item.id;
-
-            // Only animate the newly added cards that fit in the first page view to prevent lag 
-            if (newCardsCount < 30) {
-                card.className = "card animate-in";
-                card.style.animationDelay = `${(newCardsCount * 0.04).toFixed(2)}s`;
-            } else {
-                card.className = "card";
-            }
-
-            card.innerHTML = `
-                ${isNewHtml}
-                ${scoreBadge}
-                <div class="card-header" style="margin-top: ${item.match_score ? '20px' : '0'};">
-                    <div class="company-name"><i class="ph ph-buildings"></i> ${safeCompany}</div>
-                </div>
-                <h3 class="role-title">${safeRole}</h3>
-                
-                <div class="tags">
-                    <span class="tag tag-loc"><i class="ph ph-map-pin"></i> ${locDisp}</span>
-                    <span class="tag tag-stipend"><i class="ph ph-money"></i> ${stipendDisp}</span>
-                    ${orgBadge}
-                    ${roleBadge}
-                </div>
-                
-                <div class="skills-list">
-                    <strong>Skills:</strong> ${skillsDisp}
-                </div>
-                
-                <div class="card-footer">
-                    <span class="source-info">Via ${safeSource} &bull; ${safeDate}</span>
-                    <a href="${sanitizeUrl(item.apply_link)}" target="_blank" rel="noopener noreferrer" class="apply-btn">View Details</a>
-                </div>
-            `;
-            fragment.appendChild(card);
-            newCardsCount++;
+        const touched = [];
+        if (data.items.length) {
+            const indexById = new Map(allInternships.map((item, i) => [item.id, i]));
+            data.items.forEach(item => {
+                if (!item.id) return;
+                if (indexById.has(item.id)) {
+                    // A new object, so the grid refills any card showing the old one
+                    allInternships[indexById.get(item.id)] = item;
+                    touched.push(indexById.get(item.id));
+                } else {
+                    indexById.set(item.id, allInternships.length);
+                    touched.push(allInternships.length);
+                    allInternships.push(item);
+                }
+            });
+            changed = true;
         }
-    });
+        if (data.reset || touched.length) {
+            indexListings(touched, data.reset);
+            listingCache.save(touched.map(i => allInternships[i]), data.seq, data.reset);
+        } else {
+            listingCache.save([], data.seq);
+        }
+        syncSeq = data.seq;
+        more = data.more;
+    }
+    return changed;
+}
 
-    // Append all new cards at once
-    container.appendChild(fragment);
+// ── Filtering (in static/filter_worker.js) ──────────────────────────────────
+const filterWorker = new Worker("/static/filter_worker.js");
+const SEARCH_DEBOUNCE_MS = 150;
+let visibleIndices = new Uint32Array(0);  // allInternships indices after filters + sort; the grid shows a window of it
+let latestQuery = 0;
+
+function debounce(fn, ms) {
+    let timer = null;
+    return (...args) => {
+        clearTimeout(timer);
+        timer = setTimeout(() => fn(...args), ms);
+    };
+}
 
-    // Completely eliminate UI flickering: DO NOT physically detach/reattach DOM nodes to sort them.
-    // Since the container is a CSS Grid, we can flawlessly sort them visually using the flex/grid 'order' property.
-    const idToNode = new Map();
-    Array.from(container.children).forEach(c => {
-        if (c.tagName === 'DIV' && c.hasAttribute('data-id')) {
-            idToNode.set(c.dataset.id, c);
-        }
+/**
+ * Sends the worker the listings at `indices` of allInternships (only the
+ * fields it filters and sorts on). `reset` drops everything it held first.
+ */
+function indexListings(indices, reset = false) {
+    const entries = indices.map(i => {
+        const item = allInternships[i];
+        return [i, {
+            role_title: item.role_title, company_name: item.company_name, required_skills: item.required_skills,
+            source_platform: item.source_platform, location_type: item.location_type,
+            stipend: item.stipend, stipend_numeric: item.stipend_numeric,
+            org_type: item.org_type, role_type: item.role_type,
+            match_score: item.match_score, date_scraped: item.date_scraped,
+        }];
     });
+    filterWorker.postMessage({ type: "put", reset, entries });
+}
 
-    filtered.forEach((item, index) => {
-        const cardNode = idToNode.get(String(item.id));
-        if (cardNode) {
-            cardNode.style.order = index;
-        }
+function renderListings() {
+    filterWorker.postMessage({
+        type: "query",
+        id: ++latestQuery,
+        sort: "match_score",  // Match score descending, then date
+        filters: {
+            q: document.getElementById("search-input").value.toLowerCase(),
+            source: document.getElementById("source-filter").value,
+            location: window.activeLocationFilter || "all",
+            stipend: window.activeStipendFilter || "all",
+            org: window.activeOrgFilter || "all",
+            role: window.activeRoleFilter || "all",
+        },
     });
 }
 
+filterWorker.onmessage = (e) => {
+    if (e.data.id !== latestQuery) return;  // A newer query is already on its way
+    visibleIndices = e.data.indices;
+
+    document.getElementById("visible-count").innerText = visibleIndices.length;
+    document.getElementById("empty-msg").classList.toggle("hidden", visibleIndices.length > 0);
+
+    grid.attach();
+    grid.update();
+};
+
 /**
- * Re-classify location_type based on actual URL domain and location text.
- * This overrides query-based tagging (e.g. a Virginia Tech page found via
- * an "India Edu" query must not be labelled location_type="India").
+ * Windowed card grid. Only the rows in (or OVERSCAN_ROWS around) the
+ * viewport have card nodes; padding on the grid stands in for the rest, so
+ * the scrollbar still spans the whole list. Cards have a fixed height
+ * (--card-height), which makes the visible range plain arithmetic.
+ *
+ * Nodes are cloned from #card-template once and recycled: list index i
+ * always goes to pool slot i % pool.length, placed with `order`, so
+ * scrolling by a row refills only that row's cards and a filter change
+ * only refills cards whose listing actually changed.
  */
-function normalizeLocationTypes(items) {
-    const INDIA_DOMAINS = ['.ac.in', '.edu.in', '.co.in', '.res.in', '.gov.in', '.nic.in', '.org.in', '.net.in'];
-    const INDIA_CITIES = ['bangalore', 'bengaluru', 'mumbai', 'delhi', 'hyderabad', 'pune', 'chennai', 'kolkata',
-        'ahmedabad', 'noida', 'gurgaon', 'gurugram', 'india'];
-    const REMOTE_TERMS = ['remote', 'work from home', 'wfh', 'anywhere', 'distributed'];
-    // Foreign TLDs that should NEVER be India
-    const FOREIGN_DOMAINS = ['.edu', '.gov', '.ac.uk', '.co.uk', '.de', '.fr', '.nl', '.se',
-        '.fi', '.dk', '.no', '.ch', '.at', '.be', '.sg', '.jp', '.kr',
-        '.cn', '.au', '.nz', '.ca', '.ae', '.sa', '.il', '.br'];
-
-    items.forEach(item => {
-        const url = (item.apply_link || '').toLowerCase();
-        const loc = (item.location || '').toLowerCase();
-        const comp = (item.company_name || '').toLowerCase();
-
-        // REMOTE check first
-        if (REMOTE_TERMS.some(t => loc.includes(t) || comp.includes(t))) {
-            item.location_type = 'Remote';
-            return;
-        }
-
-        // INDIA check: URL domain or location text
-        const isIndiaUrl = INDIA_DOMAINS.some(d => url.includes(d));
-        const isIndiaLoc = INDIA_CITIES.some(c => loc.includes(c));
-        // Explicit foreign domain → definitely NOT India
-        const isForeignUrl = FOREIGN_DOMAINS.some(d => {
-            // match domain suffix precisely: .edu must not match .edu.in
-            const idx = url.indexOf(d);
-            if (idx === -1) return false;
-            // Check the char immediately after is not a letter (i.e., .edu not followed by .in)
-            const after = url[idx + d.length];
-            return !after || !/[a-z]/.test(after);
+const grid = {
+    OVERSCAN_ROWS: 2,
+    pool: [],
+    container: null,
+    scroller: null,
+    columns: 1,
+    rowHeight: 1,
+    framePending: false,
+
+    attach() {
+        if (this.container) return;
+        this.container = document.getElementById("listings-container");
+        this.scroller = this.container.closest(".main-scroll-area");
+        this.template = document.getElementById("card-template");
+        this.basePadding = parseFloat(getComputedStyle(this.container).paddingBottom) || 0;
+        this.scroller.addEventListener("scroll", () => this.schedule(), { passive: true });
+        window.addEventListener("resize", () => this.schedule());
+    },
+
+    schedule() {
+        if (this.framePending) return;
+        this.framePending = true;
+        requestAnimationFrame(() => {
+            this.framePending = false;
+            this.update();
         });
-
-        if (isForeignUrl && !isIndiaUrl) {
-            item.location_type = 'International';
-        } else if (isIndiaUrl || isIndiaLoc) {
-            item.location_type = 'India';
+    },
+
+    measure() {
+        const style = getComputedStyle(this.container);
+        this.columns = Math.max(1, style.gridTemplateColumns.split(" ").filter(Boolean).length);
+        this.rowHeight = parseFloat(style.gridAutoRows) + parseFloat(style.rowGap || 0);
+    },
+
+    resizePool(size) {
+        while (this.pool.length < size) {
+            const card = this.template.content.firstElementChild.cloneNode(true);
+            card.fields = {};
+            card.querySelectorAll("[data-field]").forEach(el => { card.fields[el.dataset.field] = el; });
+            card.classList.add("hidden");
+            this.container.appendChild(card);
+            this.pool.push(card);
         }
-        // otherwise keep stored value
-    });
+        while (this.pool.length > size) this.pool.pop().remove();
+        // Slot assignments depend on the pool size; force every card to refill
+        this.pool.forEach(card => { card.item = null; card.index = -1; });
+    },
+
+    update() {
+        if (!this.container) return;
+        this.measure();
+
+        const total = visibleIndices.length;
+        const rows = Math.ceil(total / this.columns);
+        const gridTop = this.container.getBoundingClientRect().top
+            - this.scroller.getBoundingClientRect().top + this.scroller.scrollTop;
+        const viewTop = this.scroller.scrollTop - gridTop;
+        const visibleRows = Math.ceil(this.scroller.clientHeight / this.rowHeight) + 1;
+
+        const firstRow = Math.min(Math.max(0, Math.floor(viewTop / this.rowHeight) - this.OVERSCAN_ROWS), Math.max(0, rows - 1));
+        const lastRow = Math.min(rows, firstRow + visibleRows + 2 * this.OVERSCAN_ROWS);
+        const first = firstRow * this.columns;
+        const last = Math.min(total, lastRow * this.columns);
+
+        const poolSize = (visibleRows + 2 * this.OVERSCAN_ROWS) * this.columns;
+        if (this.pool.length !== poolSize) this.resizePool(poolSize);
+
+        this.container.style.paddingTop = `${firstRow * this.rowHeight}px`;
+        this.container.style.paddingBottom = `${this.basePadding + Math.max(0, rows - lastRow) * this.rowHeight}px`;
+
+        const used = new Set();
+        for (let i = first; i < last; i++) {
+            const card = this.pool[i % this.pool.length];
+            const item = allInternships[visibleIndices[i]];
+            if (!item) continue;  // allInternships was replaced; a fresh result is on its way
+            used.add(card);
+            if (card.item !== item) fillCard(card, item);
+            if (card.index !== i) {
+                card.style.order = i;
+                card.index = i;
+            }
+            card.classList.remove("hidden");
+        }
+        this.pool.forEach(card => {
+            if (!used.has(card)) {
+                card.classList.add("hidden");
+                card.item = null;
+                card.index = -1;
+            }
+        });
+    },
+};
+
+function fillCard(card, item) {
+    const f = card.fields;
+    card.item = item;
+    card.dataset.id = item.id;
+
+    f.new.classList.toggle("hidden", !item.is_new);
+    f.score.classList.toggle("hidden", !item.match_score);
+    if (item.match_score) {
+        f.score.className = `match-score-badge ${item.match_score >= 80 ? 'high-score' : (item.match_score >= 60 ? 'med-score' : 'low-score')}`;
+        f.score.textContent = `${item.match_score}% Match`;
+    }
+    f.header.style.marginTop = item.match_score ? '20px' : '0';
+
+    f.company.textContent = item.company_name || '';
+    f.role.textContent = item.role_title || '';
+    f.location.textContent = item.location ? item.location : (item.location_type || '');
+    f.stipend.textContent = item.stipend ? item.stipend : "Unpaid / Not Disclosed";
+    f.org.classList.toggle("hidden", !item.org_type);
+    f["org-text"].textContent = item.org_type || '';
+    f["role-type"].classList.toggle("hidden", !item.role_type);
+    f["role-type-text"].textContent = item.role_type || '';
+    f.skills.textContent = item.required_skills ? item.required_skills : "Not specified";
+    f.source.textContent = `Via ${item.source_platform || ''} • ${item.date_scraped || ''}`;
+    f.link.href = sanitizeUrl(item.apply_link);
 }
 
-
 async function triggerScraper(config) {
     setScrapingState(true);
     try {
@@ -460,7 +621,7 @@ async function checkScraperStatus() {
     try {
         const res = await fetch("/api/scrape/status");
         const data = await res.json();
-        if (data.status === "running") {
+        if (isBusy(data.status)) {
             setScrapingState(true);
             // LIVE UPDATES: Fetch data as it's scraped
             loadData();
@@ -470,6 +631,9 @@ async function checkScraperStatus() {
     } catch (err) { }
 }
 
+// "queued" only happens under serve.py, while the job waits for worker.py
+const isBusy = (status) => status === "running" || status === "queued";
+
 let wasRunning = false;
 function setScrapingState(isRunning) {
     const btn = document.getElementById("trigger-scrape-btn");
@@ -496,46 +660,99 @@ function setScrapingState(isRunning) {
     }
 }
 
+/**
+ * Subscribes to /api/events. The server pushes scraper status, log lines,
+ * action-required alerts and "listings saved" notices as they happen; the
+ * browser reconnects on its own if the stream drops.
+ */
+function connectEvents() {
+    const source = new EventSource("/api/events");
+
+    source.addEventListener("status", (e) => {
+        setScrapingState(isBusy(JSON.parse(e.data).status));
+    });
+
+    source.addEventListener("log", (e) => appendLogLine(JSON.parse(e.data)));
+
+    source.addEventListener("alert", (e) => showAlert(JSON.parse(e.data)));
+
+    // New rows were committed: pull just the delta
+    source.addEventListener("listings", () => loadData());
+
+    // Events sent while we were disconnected are lost, so catch up on (re)connect
+    source.addEventListener("open", () => {
+        loadData();
+        fetchLogs();
+    });
+}
+
+const MAX_LOG_LINES = 75;
+
+// Cursor into scraper_run.log just past the lines on screen, so reopening the
+// panel or reconnecting fetches only what was written since (?after=).
+// Live lines carry no cursor, so showing one resets it and the next fetch
+// reloads the tail instead of repeating lines already on screen.
+let logCursor = null;
+
+function appendLogLine(line) {
+    const panel = document.getElementById("logs-panel");
+    if (!panel || panel.classList.contains("hidden")) return;  // fetchLogs() catches up when opened
+
+    logCursor = null;
+    addLogLines([line]);
+}
+
+function addLogLines(lines, replace = false) {
+    const content = document.getElementById("logs-content");
+    const isScrolledToBottom = content.scrollHeight - content.clientHeight <= content.scrollTop + 10;
+
+    if (replace) content.replaceChildren();
+    for (const line of lines) {
+        const div = document.createElement("div");
+        div.textContent = line;
+        content.appendChild(div);
+    }
+    while (content.children.length > MAX_LOG_LINES) content.firstElementChild.remove();
+
+    if (isScrolledToBottom) {
+        content.scrollTop = content.scrollHeight;
+    }
+}
+
 async function fetchLogs() {
     const panel = document.getElementById("logs-panel");
     if (panel && panel.classList.contains("hidden")) return;
 
     try {
-        const res = await fetch("/api/logs");
+        const after = logCursor;
+        const res = await fetch(after ? `/api/logs?after=${encodeURIComponent(after)}` : "/api/logs");
+        if (!res.ok) {
+            // Unusable cursor: start over from the tail
+            logCursor = null;
+            if (after) fetchLogs();
+            return;
+        }
         const data = await res.json();
-        const content = document.getElementById("logs-content");
-
-        const isScrolledToBottom = content.scrollHeight - content.clientHeight <= content.scrollTop + 10;
+        if (logCursor !== after) return;  // A live line arrived meanwhile; the next fetch reloads
 
-        content.innerHTML = data.logs.map(l => `<div>${l}</div>`).join("");
-
-        if (isScrolledToBottom) {
-            content.scrollTop = content.scrollHeight;
-        }
+        addLogLines(data.logs, !after || data.rotated);
+        logCursor = data.cursor || null;
     } catch (e) {
         console.error("Failed to fetch logs", e);
     }
 }
 
-async function pollAlerts() {
-    try {
-        const res = await fetch("/api/alerts");
-        const data = await res.json();
-        const banner = document.getElementById("action-banner");
+function showAlert(alert) {
+    const banner = document.getElementById("action-banner");
 
-        if (data.alert) {
-            document.getElementById("action-title").innerText = `Action Required [${data.alert.source}]`;
-            document.getElementById("action-message").innerText = data.alert.message;
-            if (!banner.classList.contains("show")) {
-                banner.classList.add("show");
-            }
-        } else {
-            banner.classList.remove("show");
+    if (alert && !alert.resolved) {
+        document.getElementById("action-title").innerText = `Action Required [${alert.source}]`;
+        document.getElementById("action-message").innerText = alert.message;
+        if (!banner.classList.contains("show")) {
+            banner.classList.add("show");
         }
-    } catch (err) {
-        // ignore fetch errs
-    } finally {
-        setTimeout(pollAlerts, 2000);
+    } else {
+        banner.classList.remove("show");
     }
 }
 
@@ -0,0 +1,1031 @@
+"""
+SQLite Listing Store
+────────────────────
+All scraped listings, the run history and the last-run date live in one
+SQLite database (internships.db) instead of internships.csv plus
+internships_log.json. Saving a batch is a single batched `INSERT OR IGNORE`
+(the primary key does the deduplication), and readers get indexed queries
+instead of re-parsing the whole CSV.
+
+The database runs in WAL mode, so the dashboard can keep reading while a
+scrape is writing. Each thread gets its own connection. Every write that
+changes what the dashboard shows bumps a version counter (`get_version()`),
+which readers use to tell whether anything they cached is stale, even when
+the writer is another process.
+
+Every stored listing also carries `seq`, an ingestion sequence number that
+only ever grows (a row that is rewritten gets a new one). `fetch_changes()`
+returns the rows after a given seq, plus a reset flag if the store was
+cleared since, so clients can sync deltas instead of reloading everything.
+
+Existing CSV/JSON data is imported once, the first time the store is opened
+(or explicitly with `python store.py --import`).
+"""
+
+import argparse
+import base64
+import csv
+import json
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from loguru import logger
+
+import location_normalizer
+
+DATA_DIR = Path(__file__).parent
+DB_FILE = DATA_DIR / "internships.db"
+LEGACY_CSV_FILE = DATA_DIR / "internships.csv"
+LEGACY_LOG_FILE = DATA_DIR / "internships_log.json"
+
+COLUMNS = [
+    "id", "company_name", "role_title", "location", "location_type",
+    "duration", "stipend", "stipend_numeric", "stipend_currency",
+    "required_skills", "application_deadline", "apply_link",
+    "source_platform", "date_scraped", "is_new",
+    "org_type", "role_type", "match_score"
+]
+NUMERIC_COLUMNS = {"stipend_numeric": float, "match_score": float}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS internships (
+    id                   TEXT PRIMARY KEY,
+    company_name         TEXT,
+    role_title           TEXT,
+    location             TEXT,
+    location_type        TEXT,
+    duration             TEXT,
+    stipend              TEXT,
+    stipend_numeric      REAL,
+    stipend_currency     TEXT,
+    required_skills      TEXT,
+    application_deadline TEXT,
+    apply_link           TEXT,
+    source_platform      TEXT,
+    date_scraped         TEXT,
+    is_new               INTEGER,
+    org_type             TEXT,
+    role_type            TEXT,
+    match_score          REAL,
+    seq                  INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_internships_date_scraped ON internships(date_scraped);
+CREATE INDEX IF NOT EXISTS idx_internships_source_platform ON internships(source_platform);
+CREATE INDEX IF NOT EXISTS idx_internships_location_type ON internships(location_type);
+CREATE INDEX IF NOT EXISTS idx_internships_match_score ON internships(match_score);
+-- Keyset pagination orders (see SORTS); expressions must match them exactly
+CREATE INDEX IF NOT EXISTS idx_internships_by_score
+    ON internships(COALESCE(match_score, 0) DESC, COALESCE(date_scraped, '') DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_internships_by_date
+    ON internships(COALESCE(date_scraped, '') DESC, COALESCE(match_score, 0) DESC, id DESC);
+
+CREATE TABLE IF NOT EXISTS run_history (
+    date           TEXT PRIMARY KEY,
+    new_listings   INTEGER NOT NULL DEFAULT 0,
+    sources_failed TEXT NOT NULL DEFAULT '[]',
+    failed_units   TEXT NOT NULL DEFAULT '{}'
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+
+-- One row per clear(), so delta-sync clients know to drop what they have
+CREATE TABLE IF NOT EXISTS tombstones (
+    seq INTEGER PRIMARY KEY
+);
+
+-- Scrape requests from the dashboard, run by worker.py (see the Scrape jobs section)
+CREATE TABLE IF NOT EXISTS jobs (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    config       TEXT,
+    status       TEXT NOT NULL DEFAULT 'queued',  -- queued | running | done | failed
+    worker       TEXT,
+    created_at   REAL NOT NULL,
+    started_at   REAL,
+    heartbeat_at REAL,
+    finished_at  REAL,
+    error        TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+"""
+
+# Full-text index over the searchable columns. It is an external-content FTS5
+# table keyed on seq and kept in sync by triggers, so every insert/update/
+# delete of a listing updates the index in the same transaction.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS internships_fts USING fts5(
+    role_title, company_name, required_skills,
+    content='internships', content_rowid='seq',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS internships_fts_insert AFTER INSERT ON internships BEGIN
+    INSERT INTO internships_fts (rowid, role_title, company_name, required_skills)
+    VALUES (new.seq, new.role_title, new.company_name, new.required_skills);
+END;
+CREATE TRIGGER IF NOT EXISTS internships_fts_delete AFTER DELETE ON internships BEGIN
+    INSERT INTO internships_fts (internships_fts, rowid, role_title, company_name, required_skills)
+    VALUES ('delete', old.seq, old.role_title, old.company_name, old.required_skills);
+END;
+CREATE TRIGGER IF NOT EXISTS internships_fts_update AFTER UPDATE ON internships BEGIN
+    INSERT INTO internships_fts (internships_fts, rowid, role_title, company_name, required_skills)
+    VALUES ('delete', old.seq, old.role_title, old.company_name, old.required_skills);
+    INSERT INTO internships_fts (rowid, role_title, company_name, required_skills)
+    VALUES (new.seq, new.role_title, new.company_name, new.required_skills);
+END;
+"""
+# The text the paged `q` filter matches as a substring, plus a trigram index
+# over it: the index narrows `q` to candidate rows without a table scan, and
+# the LIKE on the candidates keeps the result exactly the substring match.
+# The index's external content is a view, so the text is not stored twice.
+SEARCH_TEXT_SQL = "(COALESCE({row}role_title, '') || ' ' || COALESCE({row}company_name, '') || ' ' || COALESCE({row}required_skills, ''))"
+TRIGRAM_MIN_CHARS = 3  # trigram MATCH finds nothing for shorter strings
+TRIGRAM_SCHEMA = f"""
+CREATE VIEW IF NOT EXISTS internships_search_text AS
+    SELECT seq, {SEARCH_TEXT_SQL.format(row="")} AS text FROM internships;
+CREATE VIRTUAL TABLE IF NOT EXISTS internships_trigram USING fts5(
+    text, content='internships_search_text', content_rowid='seq', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS internships_trigram_insert AFTER INSERT ON internships BEGIN
+    INSERT INTO internships_trigram (rowid, text) VALUES (new.seq, {SEARCH_TEXT_SQL.format(row="new.")});
+END;
+CREATE TRIGGER IF NOT EXISTS internships_trigram_delete AFTER DELETE ON internships BEGIN
+    INSERT INTO internships_trigram (internships_trigram, rowid, text)
+    VALUES ('delete', old.seq, {SEARCH_TEXT_SQL.format(row="old.")});
+END;
+CREATE TRIGGER IF NOT EXISTS internships_trigram_update AFTER UPDATE ON internships BEGIN
+    INSERT INTO internships_trigram (internships_trigram, rowid, text)
+    VALUES ('delete', old.seq, {SEARCH_TEXT_SQL.format(row="old.")});
+    INSERT INTO internships_trigram (rowid, text) VALUES (new.seq, {SEARCH_TEXT_SQL.format(row="new.")});
+END;
+"""
+# Facet counts, kept current by triggers so /api/facets never scans listings.
+# Stipends are counted in exclusive buckets; facets() adds them up into the
+# overlapping stipend filters the dashboard offers (see STIPEND_FILTERS).
+FACETS = ("location_type", "source_platform", "org_type", "role_type", "stipend")
+FACET_FILTER_PARAMS = {"location_type": "location_type", "source_platform": "source",
+                       "org_type": "org_type", "role_type": "role_type", "stipend": "stipend"}
+STIPEND_BUCKET_SQL = """CASE
+    WHEN COALESCE({row}stipend_numeric, 0) >= 50000 THEN '50k'
+    WHEN COALESCE({row}stipend_numeric, 0) >= 20000 THEN '20k'
+    WHEN COALESCE({row}stipend_numeric, 0) >= 10000 THEN '10k'
+    WHEN COALESCE({row}stipend_numeric, 0) > 0 THEN 'under_10k'
+    WHEN LOWER(COALESCE({row}stipend, '')) LIKE '%month%' THEN 'monthly_undisclosed'
+    ELSE 'unpaid'
+END"""
+STIPEND_BUCKETS_PER_FILTER = {
+    "paid": ("50k", "20k", "10k", "under_10k", "monthly_undisclosed"),
+    "10k": ("50k", "20k", "10k"),
+    "20k": ("50k", "20k"),
+    "50k": ("50k",),
+    "unpaid": ("monthly_undisclosed", "unpaid"),
+}
+
+
+def _facet_values(row: str) -> str:
+    """VALUES rows (facet, value) for the listing `row` ('new' / 'old') inside a trigger."""
+    values = [f"('{f}', COALESCE({row}.{f}, ''))" for f in FACETS if f != "stipend"]
+    values.append(f"('stipend', {STIPEND_BUCKET_SQL.format(row=row + '.')})")
+    return ", ".join(values)
+
+
+FACET_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS facet_counts (
+    facet TEXT NOT NULL,
+    value TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (facet, value)
+);
+CREATE TRIGGER IF NOT EXISTS facet_counts_insert AFTER INSERT ON internships BEGIN
+    INSERT INTO facet_counts (facet, value, count)
+    SELECT column1, column2, 1 FROM (VALUES {_facet_values('new')}) WHERE true
+    ON CONFLICT (facet, value) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS facet_counts_delete AFTER DELETE ON internships BEGIN
+    UPDATE facet_counts SET count = count - 1
+    WHERE (facet, value) IN (VALUES {_facet_values('old')});
+END;
+CREATE TRIGGER IF NOT EXISTS facet_counts_update
+AFTER UPDATE OF location_type, source_platform, org_type, role_type, stipend, stipend_numeric ON internships BEGIN
+    UPDATE facet_counts SET count = count - 1
+    WHERE (facet, value) IN (VALUES {_facet_values('old')});
+    INSERT INTO facet_counts (facet, value, count)
+    SELECT column1, column2, 1 FROM (VALUES {_facet_values('new')}) WHERE true
+    ON CONFLICT (facet, value) DO UPDATE SET count = count + 1;
+END;
+"""
+
+FTS_WEIGHTS = (10.0, 4.0, 1.0)  # bm25 weight of role_title, company_name, required_skills
+fts_enabled = True  # False if this SQLite build lacks FTS5; search falls back to LIKE
+trigram_enabled = True  # False without the FTS5 trigram tokenizer (SQLite < 3.34); `q` scans
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = set()  # database paths whose schema/import already ran in this process
+
+
+def get_connection(path: Path = None) -> sqlite3.Connection:
+    """This thread's connection to the store, created (and the schema set up) on first use."""
+    path = Path(path or DB_FILE)
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    conn = connections.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _ensure_schema(conn, path)
+        connections[path] = conn
+    return conn
+
+
+def close_connection(path: Path = None):
+    """Closes this thread's connection (e.g. before deleting the database file)."""
+    path = Path(path or DB_FILE)
+    conn = getattr(_local, "connections", {}).pop(path, None)
+    if conn is not None:
+        conn.close()
+
+
+def _ensure_schema(conn: sqlite3.Connection, path: Path):
+    with _init_lock:
+        if path in _initialized:
+            return
+        conn.executescript(SCHEMA)
+        _migrate(conn)
+        if path == DB_FILE and get_meta("legacy_imported", conn=conn) is None:
+            import_legacy(conn=conn)
+        if get_meta("location_rules", conn=conn) != str(location_normalizer.RULES_VERSION):
+            renormalize_locations(conn=conn)
+        optimize(conn=conn)
+        _initialized.add(path)
+
+
+def _migrate(conn: sqlite3.Connection):
+    """Brings databases created by older versions up to the current SCHEMA."""
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(internships)")}
+    if "seq" not in columns:
+        with conn:
+            conn.execute("ALTER TABLE internships ADD COLUMN seq INTEGER")
+            conn.execute("UPDATE internships SET seq = rowid")
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) "
+                "SELECT 'seq', COALESCE(MAX(seq), 0) FROM internships"
+            )
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_internships_seq ON internships(seq)")
+    _setup_fts(conn)
+    _setup_trigram(conn)
+    _setup_facets(conn)
+
+
+def _setup_facets(conn: sqlite3.Connection):
+    existed = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'facet_counts'").fetchone()
+    conn.executescript(FACET_SCHEMA)
+    if not existed:
+        # Count listings stored before the table existed
+        with conn:
+            for facet in FACETS:
+                expr = STIPEND_BUCKET_SQL.format(row="") if facet == "stipend" else f"COALESCE({facet}, '')"
+                conn.execute(
+                    f"INSERT INTO facet_counts (facet, value, count) "
+                    f"SELECT '{facet}', {expr} AS v, COUNT(*) FROM internships GROUP BY v"
+                )
+
+
+def _setup_fts(conn: sqlite3.Connection):
+    global fts_enabled
+    existed = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'internships_fts'").fetchone()
+    try:
+        conn.executescript(FTS_SCHEMA)
+    except sqlite3.OperationalError as e:
+        fts_enabled = False
+        logger.warning(f"Store: SQLite has no FTS5 ({e}); /api/search falls back to substring matching")
+        return
+    if not existed:
+        # Index listings stored before the FTS table existed
+        with conn:
+            conn.execute("INSERT INTO internships_fts (internships_fts) VALUES ('rebuild')")
+
+
+def _setup_trigram(conn: sqlite3.Connection):
+    global trigram_enabled
+    existed = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'internships_trigram'").fetchone()
+    try:
+        conn.executescript(TRIGRAM_SCHEMA)
+    except sqlite3.OperationalError as e:
+        trigram_enabled = False
+        logger.warning(f"Store: No FTS5 trigram tokenizer ({e}); the paged q filter scans instead")
+        return
+    if not existed:
+        with conn:
+            conn.execute("INSERT INTO internships_trigram (internships_trigram) VALUES ('rebuild')")
+
+
+def optimize(conn: sqlite3.Connection = None):
+    """
+    Refreshes the planner statistics. Without them SQLite tends to pick a
+    filter index and sort every match instead of walking a pagination index.
+    """
+    conn = conn or get_connection()
+    has_stats = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+    ).fetchone()
+    conn.execute("PRAGMA optimize" if has_stats else "ANALYZE")
+
+
+# ── Meta ─────────────────────────────────────────────────────────────────────
+
+def get_meta(key: str, default=None, conn: sqlite3.Connection = None):
+    conn = conn or get_connection()
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row["value"] if row else default
+
+
+def set_meta(key: str, value, conn: sqlite3.Connection = None):
+    conn = conn or get_connection()
+    with conn:
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+
+def get_version(conn: sqlite3.Connection = None) -> int:
+    """Increases with every committed change to listings or run history."""
+    return int(get_meta("version", 0, conn=conn))
+
+
+def generation(conn: sqlite3.Connection = None) -> str:
+    """
+    Token identifying this store's current contents. It changes whenever
+    listings are removed (clear), and a fresh or replaced database gets a
+    new one, so caches of "ids already stored" (seen_index) can tell that
+    they no longer apply.
+    """
+    conn = conn or get_connection()
+    token = get_meta("generation", conn=conn)
+    if token is None:
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', ?)", (uuid.uuid4().hex,))
+        token = get_meta("generation", conn=conn)
+    return token
+
+
+def _bump_version(conn: sqlite3.Connection):
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES ('version', 1) "
+        "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+    )
+
+
+def current_seq(conn: sqlite3.Connection = None) -> int:
+    """The highest sequence number handed out so far."""
+    return int(get_meta("seq", 0, conn=conn))
+
+
+def _reserve_seq(conn: sqlite3.Connection, count: int) -> int:
+    """Reserves `count` sequence numbers inside the caller's transaction; returns the first."""
+    # UPDATE first so the write lock is held before the counter is read
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES ('seq', ?) "
+        "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + ?",
+        (count, count),
+    )
+    return current_seq(conn=conn) - count + 1
+
+
+# ── Listings ─────────────────────────────────────────────────────────────────
+
+def _to_row(record: dict) -> tuple:
+    row = []
+    for col in COLUMNS:
+        value = record.get(col, "")
+        if col in NUMERIC_COLUMNS:
+            try:
+                value = NUMERIC_COLUMNS[col](value) if value not in ("", None) else None
+            except (TypeError, ValueError):
+                value = None
+        elif col == "is_new":
+            value = 1 if str(value).lower() in ("1", "true") else 0
+        row.append(value)
+    return tuple(row)
+
+
+def _from_row(row: sqlite3.Row) -> dict:
+    record = {col: ("" if row[col] is None else row[col]) for col in COLUMNS}
+    record["is_new"] = bool(row["is_new"])
+    record["seq"] = row["seq"]
+    return record
+
+
+def _insert(conn: sqlite3.Connection, records: list) -> list:
+    if not records:
+        return []
+    location_normalizer.normalize_many(records)
+    # Ignored duplicates leave gaps in seq; it only has to grow, not be dense
+    first_seq = _reserve_seq(conn, len(records))
+    new_records = []
+    for i, record in enumerate(records):
+        cur = conn.execute(
+            f"INSERT OR IGNORE INTO internships ({', '.join(COLUMNS)}, seq) "
+            f"VALUES ({', '.join('?' * (len(COLUMNS) + 1))})",
+            _to_row(record) + (first_seq + i,),
+        )
+        if cur.rowcount:
+            new_records.append(record)
+    if new_records:
+        _bump_version(conn)
+    return new_records
+
+
+def insert_listings(records: list, conn: sqlite3.Connection = None) -> list:
+    """
+    Inserts records in one transaction, ignoring ids already stored.
+    Returns the records that were actually new.
+    """
+    if not records:
+        return []
+    conn = conn or get_connection()
+    with conn:
+        return _insert(conn, records)
+
+
+def write_batch(records: list, date: str, run: dict = None, conn: sqlite3.Connection = None) -> list:
+    """
+    Inserts records and, if given, the run's history stats
+    (`{"saved_before", "sources_failed", "failed_units"}`) in a single
+    transaction, stamping `date` as the last run. The run's new-listing count
+    is `saved_before` (rows the run committed earlier) plus the rows this
+    batch adds. Returns the new records.
+    """
+    conn = conn or get_connection()
+    with conn:
+        new_records = _insert(conn, records)
+        if run is not None:
+            _record_run(conn, date, run["saved_before"] + len(new_records), run["sources_failed"],
+                        run.get("failed_units"))
+        elif new_records:
+            _set_last_run(conn, date)
+    return new_records
+
+
+def has_listing(internship_id: str, conn: sqlite3.Connection = None) -> bool:
+    conn = conn or get_connection()
+    return conn.execute("SELECT 1 FROM internships WHERE id = ?", (internship_id,)).fetchone() is not None
+
+
+def count_listings(conn: sqlite3.Connection = None) -> int:
+    conn = conn or get_connection()
+    return conn.execute("SELECT COUNT(*) FROM internships").fetchone()[0]
+
+
+def fetch_listings(conn: sqlite3.Connection = None) -> list:
+    """Every stored listing, newest first."""
+    conn = conn or get_connection()
+    rows = conn.execute("SELECT * FROM internships ORDER BY date_scraped DESC")
+    return [_from_row(row) for row in rows]
+
+
+# ── Columnar encoding ────────────────────────────────────────────────────────
+# The compact wire format behind `format=columnar`: one array per column
+# instead of one object per listing, so key names are sent once, and
+# low-cardinality columns are dictionary-encoded (each value is an index into
+# the column's list of distinct values).
+
+DICTIONARY_COLUMNS = ("source_platform", "location_type", "org_type", "role_type",
+                      "stipend_currency", "duration", "date_scraped")
+
+
+def to_columnar(records: list) -> dict:
+    """
+    {"format": "columnar", "length", "columns", "dictionaries"} for a list of
+    listings. A column named in `dictionaries` holds indices into that list.
+    """
+    names = list(records[0]) if records else COLUMNS + ["seq"]
+    columns = {name: [record.get(name) for record in records] for name in names}
+    dictionaries = {}
+    for name in DICTIONARY_COLUMNS:
+        if name not in columns:
+            continue
+        codes = {}
+        columns[name] = [codes.setdefault(value, len(codes)) for value in columns[name]]
+        dictionaries[name] = list(codes)
+    return {"format": "columnar", "length": len(records), "columns": columns, "dictionaries": dictionaries}
+
+
+# ── Filtered pages ───────────────────────────────────────────────────────────
+# Same filters as the dashboard's sidebar. Pages are keyset-paginated: the
+# cursor is the sort key of the last row served, so page N costs the same as
+# page 1 and rows inserted mid-scroll never shift later pages.
+
+SORTS = {
+    "match_score": ("COALESCE(match_score, 0)", "COALESCE(date_scraped, '')", "id"),
+    "date_scraped": ("COALESCE(date_scraped, '')", "COALESCE(match_score, 0)", "id"),
+}
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+STIPEND_FILTERS = {
+    "paid": "(COALESCE(stipend_numeric, 0) > 0 OR LOWER(COALESCE(stipend, '')) LIKE '%month%')",
+    "10k": "COALESCE(stipend_numeric, 0) >= 10000",
+    "20k": "COALESCE(stipend_numeric, 0) >= 20000",
+    "50k": "COALESCE(stipend_numeric, 0) >= 50000",
+    "unpaid": "COALESCE(stipend_numeric, 0) <= 0",
+}
+
+
+def _encode_cursor(key) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> list:
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception:
+        raise ValueError("invalid cursor")
+    if not isinstance(key, list) or len(key) != 3:
+        raise ValueError("invalid cursor")
+    return key
+
+
+def _filter_clause(filters: dict, use_indexes: bool = True):
+    """
+    WHERE clauses + params for the dashboard filters; unknown/'all' values are
+    ignored. use_indexes=False writes `+column` so SQLite walks the sort index
+    instead of a filter index.
+    """
+    clauses, params = [], []
+    prefix = "" if use_indexes else "+"
+
+    q = (filters.get("q") or "").strip()
+    if q:
+        if trigram_enabled and len(q) >= TRIGRAM_MIN_CHARS:
+            # Candidates from the trigram index; the LIKE below decides
+            clauses.append(f"{prefix}seq IN (SELECT rowid FROM internships_trigram WHERE internships_trigram MATCH ?)")
+            params.append('"' + q.replace('"', '""') + '"')
+        escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        clauses.append(SEARCH_TEXT_SQL.format(row="") + " LIKE ? ESCAPE '\\'")
+        params.append(f"%{escaped}%")
+
+    for param, column in (("source", "source_platform"), ("location_type", "location_type"),
+                          ("org_type", "org_type"), ("role_type", "role_type")):
+        value = filters.get(param)
+        if value and value != "all":
+            clauses.append(f"{prefix}{column} = ?")
+            params.append(value)
+
+    stipend = filters.get("stipend")
+    if stipend and stipend != "all":
+        if stipend not in STIPEND_FILTERS:
+            raise ValueError(f"unknown stipend filter: {stipend}")
+        clauses.append(STIPEND_FILTERS[stipend])
+
+    return clauses, params
+
+
+def query_listings(filters: dict = None, sort: str = "match_score", limit: int = DEFAULT_PAGE_SIZE,
+                   cursor: str = None, conn: sqlite3.Connection = None) -> dict:
+    """
+    One page of listings matching `filters` (q, source, location_type,
+    stipend, org_type, role_type), best first by `sort`. `q` is a
+    case-insensitive substring of title, company and skills, as in the
+    dashboard's own filter.
+    Returns {"items", "total", "next_cursor"}; next_cursor is None on the last page.
+    """
+    if sort not in SORTS:
+        raise ValueError(f"unknown sort: {sort}")
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    conn = conn or get_connection()
+
+    clauses, params = _filter_clause(filters or {})
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    total = conn.execute(f"SELECT COUNT(*) FROM internships {where}", params).fetchone()[0]
+
+    # A broad filter matches plenty of rows early in the sort index, so walking
+    # that index beats fetching every match through a filter index and sorting.
+    # Only narrow filters (under 2% of rows) go through their own index.
+    if clauses and total:
+        table_size = conn.execute("SELECT MAX(rowid) FROM internships").fetchone()[0] or total
+        if total / table_size >= 0.02:
+            clauses, params = _filter_clause(filters or {}, use_indexes=False)
+
+    keys = SORTS[sort]
+    page_clauses, page_params = list(clauses), list(params)
+    if cursor:
+        page_clauses.append(f"({', '.join(keys)}) < (?, ?, ?)")
+        page_params.extend(_decode_cursor(cursor))
+    page_where = f"WHERE {' AND '.join(page_clauses)}" if page_clauses else ""
+
+    rows = conn.execute(
+        f"SELECT *, {', '.join(f'{k} AS _k{i}' for i, k in enumerate(keys))} FROM internships {page_where} "
+        f"ORDER BY {', '.join(f'{k} DESC' for k in keys)} LIMIT ?",
+        page_params + [limit + 1],
+    ).fetchall()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = _encode_cursor([last["_k0"], last["_k1"], last["_k2"]])
+
+    return {"items": [_from_row(row) for row in rows], "total": total, "next_cursor": next_cursor}
+
+
+def fetch_changes(since: int, limit: int = 1000, conn: sqlite3.Connection = None) -> dict:
+    """
+    Listings inserted or rewritten after sequence number `since`, oldest first.
+    Returns {"items", "reset", "seq", "more"}: `reset` means the store was
+    cleared after `since` (drop everything, then apply items); `seq` is the
+    cursor for the next call; `more` means another page is waiting.
+    """
+    conn = conn or get_connection()
+    latest = current_seq(conn=conn)
+
+    # A cursor from the future means the database was replaced underneath the client
+    reset = since > latest or conn.execute(
+        "SELECT 1 FROM tombstones WHERE seq > ? LIMIT 1", (since,)
+    ).fetchone() is not None
+    if reset:
+        since = 0
+
+    rows = conn.execute(
+        "SELECT * FROM internships WHERE seq > ? ORDER BY seq LIMIT ?", (since, limit + 1)
+    ).fetchall()
+    more = len(rows) > limit
+    items = [_from_row(row) for row in rows[:limit]]
+
+    return {
+        "items": items,
+        "reset": reset,
+        "seq": items[-1]["seq"] if more else latest,
+        "more": more,
+    }
+
+
+# ── Facets ───────────────────────────────────────────────────────────────────
+
+def _stipend_filter_counts(bucket_counts: dict) -> dict:
+    return {name: sum(bucket_counts.get(b, 0) for b in buckets)
+            for name, buckets in STIPEND_BUCKETS_PER_FILTER.items()}
+
+
+def facets(filters: dict = None, conn: sqlite3.Connection = None) -> dict:
+    """
+    Listing counts per location_type, source_platform, org_type, role_type
+    and stipend filter. Unfiltered counts come straight from facet_counts;
+    with `filters`, each facet is counted over the listings matching every
+    *other* filter, so the numbers show what picking that value would give.
+    Returns {"total", "facets": {facet: {value: count}}}.
+    """
+    conn = conn or get_connection()
+    filters = {k: v for k, v in (filters or {}).items() if v and v != "all"}
+    result = {}
+
+    if not filters:
+        for row in conn.execute("SELECT facet, value, count FROM facet_counts WHERE count > 0"):
+            result.setdefault(row["facet"], {})[row["value"]] = row["count"]
+        total = sum(result.get("stipend", {}).values())
+    else:
+        clauses, params = _filter_clause(filters)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        total = conn.execute(f"SELECT COUNT(*) FROM internships {where}", params).fetchone()[0]
+
+        for facet in FACETS:
+            others = {k: v for k, v in filters.items() if k != FACET_FILTER_PARAMS[facet]}
+            clauses, params = _filter_clause(others)
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+            expr = STIPEND_BUCKET_SQL.format(row="") if facet == "stipend" else f"COALESCE({facet}, '')"
+            rows = conn.execute(
+                f"SELECT {expr} AS v, COUNT(*) AS n FROM internships {where} GROUP BY v", params
+            )
+            result[facet] = {row["v"]: row["n"] for row in rows}
+
+    result["stipend"] = _stipend_filter_counts(result.get("stipend", {}))
+    for facet in FACETS:
+        result.setdefault(facet, {})
+    return {"total": total, "facets": result}
+
+
+# ── Full-text search ─────────────────────────────────────────────────────────
+
+def _search_terms(q: str) -> list:
+    return re.findall(r"\w+", (q or "").lower())
+
+
+def _fts_match(terms: list) -> str:
+    # Quoted terms can't be mistaken for FTS5 operators; a trailing * makes each a prefix query
+    return " AND ".join(f'"{t}"*' for t in terms)
+
+
+def search_listings(q: str, limit: int = DEFAULT_PAGE_SIZE, conn: sqlite3.Connection = None) -> dict:
+    """
+    Listings matching every word of `q`, each word as a prefix ("tensor flo"
+    matches "TensorFlow"), best bm25 match first (title hits outrank company,
+    company outranks skills). Returns {"items", "total"}.
+    """
+    terms = _search_terms(q)
+    if not terms:
+        return {"items": [], "total": 0}
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    conn = conn or get_connection()
+
+    if not fts_enabled:
+        clauses = ["(COALESCE(role_title, '') || ' ' || COALESCE(company_name, '') || ' ' || "
+                   "COALESCE(required_skills, '')) LIKE ?"] * len(terms)
+        params = [f"%{t}%" for t in terms]
+        where = " AND ".join(clauses)
+        total = conn.execute(f"SELECT COUNT(*) FROM internships WHERE {where}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT * FROM internships WHERE {where} ORDER BY COALESCE(match_score, 0) DESC LIMIT ?",
+            params + [limit],
+        ).fetchall()
+        return {"items": [_from_row(row) for row in rows], "total": total}
+
+    match = _fts_match(terms)
+    total = conn.execute(
+        "SELECT COUNT(*) FROM internships_fts WHERE internships_fts MATCH ?", (match,)
+    ).fetchone()[0]
+    rows = conn.execute(
+        "SELECT i.* FROM internships_fts JOIN internships i ON i.seq = internships_fts.rowid "
+        f"WHERE internships_fts MATCH ? ORDER BY bm25(internships_fts, {', '.join(map(str, FTS_WEIGHTS))}) "
+        "LIMIT ?",
+        (match, limit),
+    ).fetchall()
+    return {"items": [_from_row(row) for row in rows], "total": total}
+
+
+def listing_ids(conn: sqlite3.Connection = None) -> list:
+    conn = conn or get_connection()
+    return [row[0] for row in conn.execute("SELECT id FROM internships")]
+
+
+# ── Run history ──────────────────────────────────────────────────────────────
+
+def record_run(date: str, new_listings: int, sources_failed: list, failed_units: dict = None,
+               conn: sqlite3.Connection = None):
+    """Adds one run's stats to the history entry for `date`, merging with earlier runs that day."""
+    conn = conn or get_connection()
+    with conn:
+        _record_run(conn, date, new_listings, sources_failed, failed_units)
+
+
+def _record_run(conn: sqlite3.Connection, date: str, new_listings: int, sources_failed: list,
+                failed_units: dict = None):
+    row = conn.execute("SELECT * FROM run_history WHERE date = ?", (date,)).fetchone()
+    if row:
+        new_listings += row["new_listings"]
+        sources_failed = list(set(json.loads(row["sources_failed"]) + list(sources_failed)))
+        merged_units = json.loads(row["failed_units"])
+    else:
+        merged_units = {}
+
+    # URLs/queries that failed every retry, per source
+    for source, units in (failed_units or {}).items():
+        merged = merged_units.setdefault(source, [])
+        merged.extend(u for u in units if u not in merged)
+
+    conn.execute(
+        "INSERT OR REPLACE INTO run_history (date, new_listings, sources_failed, failed_units) "
+        "VALUES (?, ?, ?, ?)",
+        (date, new_listings, json.dumps(list(sources_failed)), json.dumps(merged_units)),
+    )
+    _set_last_run(conn, date)
+    _bump_version(conn)
+
+
+def _set_last_run(conn: sqlite3.Connection, date: str):
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES ('last_run', ?) "
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (date,),
+    )
+
+
+def fetch_run_history(conn: sqlite3.Connection = None) -> list:
+    conn = conn or get_connection()
+    history = []
+    for row in conn.execute("SELECT * FROM run_history ORDER BY date"):
+        entry = {
+            "date": row["date"],
+            "new_listings": row["new_listings"],
+            "sources_failed": json.loads(row["sources_failed"]),
+        }
+        failed_units = json.loads(row["failed_units"])
+        if failed_units:
+            entry["failed_units"] = failed_units
+        history.append(entry)
+    return history
+
+
+# ── Scrape jobs ──────────────────────────────────────────────────────────────
+# A queue shared by every web worker process and the scraper worker: the web
+# side enqueues, worker.py claims and runs. Each step is a single UPDATE or
+# INSERT, so two processes can never both enqueue or both claim the same job.
+# A running job whose worker stops heartbeating is failed, so a crashed
+# worker doesn't block the queue forever.
+
+JOB_HEARTBEAT_SECONDS = 15
+JOB_STALE_SECONDS = 120
+
+
+def _job_from_row(row: sqlite3.Row) -> dict:
+    job = dict(row)
+    job["config"] = json.loads(job["config"]) if job["config"] else None
+    return job
+
+
+def _fail_stale_jobs(conn: sqlite3.Connection):
+    conn.execute(
+        "UPDATE jobs SET status = 'failed', finished_at = ?, error = 'worker stopped responding' "
+        "WHERE status = 'running' AND heartbeat_at < ?",
+        (time.time(), time.time() - JOB_STALE_SECONDS),
+    )
+
+
+def enqueue_job(config: dict = None, conn: sqlite3.Connection = None):
+    """
+    Queues a scrape unless one is already queued or running.
+    Returns (job, created); `job` is the new job or the one in the way.
+    """
+    conn = conn or get_connection()
+    with conn:
+        _fail_stale_jobs(conn)
+        cur = conn.execute(
+            "INSERT INTO jobs (config, status, created_at) SELECT ?, 'queued', ? "
+            "WHERE NOT EXISTS (SELECT 1 FROM jobs WHERE status IN ('queued', 'running'))",
+            (json.dumps(config) if config is not None else None, time.time()),
+        )
+    if cur.rowcount:
+        return fetch_job(cur.lastrowid, conn=conn), True
+    return active_job(conn=conn), False
+
+
+def claim_job(worker: str, conn: sqlite3.Connection = None):
+    """Marks the oldest queued job as running on `worker` and returns it, or None."""
+    conn = conn or get_connection()
+    now = time.time()
+    with conn:
+        _fail_stale_jobs(conn)
+        cur = conn.execute(
+            "UPDATE jobs SET status = 'running', worker = ?, started_at = ?, heartbeat_at = ? "
+            "WHERE id = (SELECT id FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1)",
+            (worker, now, now),
+        )
+        if not cur.rowcount:
+            return None
+        row = conn.execute(
+            "SELECT * FROM jobs WHERE status = 'running' AND worker = ? ORDER BY id DESC LIMIT 1", (worker,)
+        ).fetchone()
+    return _job_from_row(row)
+
+
+def heartbeat_job(job_id: int, conn: sqlite3.Connection = None):
+    conn = conn or get_connection()
+    with conn:
+        conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ?", (time.time(), job_id))
+
+
+def finish_job(job_id: int, error: str = None, conn: sqlite3.Connection = None):
+    conn = conn or get_connection()
+    with conn:
+        conn.execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE id = ?",
+            ("failed" if error else "done", time.time(), error, job_id),
+        )
+
+
+def fetch_job(job_id: int, conn: sqlite3.Connection = None):
+    conn = conn or get_connection()
+    row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return _job_from_row(row) if row else None
+
+
+def active_job(conn: sqlite3.Connection = None):
+    """The queued or running job, if any (a running one only while its worker is alive)."""
+    conn = conn or get_connection()
+    row = conn.execute(
+        "SELECT * FROM jobs WHERE status IN ('queued', 'running') "
+        "AND (status = 'queued' OR heartbeat_at >= ?) ORDER BY id LIMIT 1",
+        (time.time() - JOB_STALE_SECONDS,),
+    ).fetchone()
+    return _job_from_row(row) if row else None
+
+
+# ── Maintenance ──────────────────────────────────────────────────────────────
+
+def clear(conn: sqlite3.Connection = None):
+    """Deletes every listing and the run history (the dashboard's 'Clear' button)."""
+    conn = conn or get_connection()
+    with conn:
+        conn.execute("DELETE FROM internships")
+        conn.execute("DELETE FROM run_history")
+        conn.execute("DELETE FROM meta WHERE key = 'last_run'")
+        # Only the latest clear matters to a client
+        conn.execute("DELETE FROM tombstones")
+        conn.execute("INSERT INTO tombstones (seq) VALUES (?)", (_reserve_seq(conn, 1),))
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'generation'", (uuid.uuid4().hex,))
+        _bump_version(conn)
+
+
+def renormalize_locations(batch_size: int = 5000, conn: sqlite3.Connection = None) -> int:
+    """
+    Re-runs the location normalizer over every stored listing in one
+    transaction. Changed rows get a new seq, so delta-sync clients pick them
+    up; the triggers keep search and facet counts in step. Returns how many
+    listings changed.
+    """
+    conn = conn or get_connection()
+    changed = 0
+    with conn:
+        last_rowid = 0
+        while True:
+            rows = conn.execute(
+                "SELECT rowid, id, location, location_type, apply_link, company_name FROM internships "
+                "WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (last_rowid, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+            last_rowid = rows[-1]["rowid"]
+
+            updates = []
+            for row in rows:
+                record = dict(row)
+                if location_normalizer.normalize(record):
+                    updates.append((record["location_type"], record["id"]))
+            if updates:
+                first_seq = _reserve_seq(conn, len(updates))
+                conn.executemany(
+                    "UPDATE internships SET location_type = ?, seq = ? WHERE id = ?",
+                    [(location_type, first_seq + i, id_) for i, (location_type, id_) in enumerate(updates)],
+                )
+                changed += len(updates)
+
+        if changed:
+            _bump_version(conn)
+        set_meta("location_rules", str(location_normalizer.RULES_VERSION), conn=conn)
+
+    if changed:
+        logger.info(f"Store: Re-normalized the location of {changed} listings")
+    return changed
+
+
+def import_legacy(csv_path: Path = LEGACY_CSV_FILE, log_path: Path = LEGACY_LOG_FILE,
+                  conn: sqlite3.Connection = None) -> int:
+    """
+    One-shot import of internships.csv and the run history in
+    internships_log.json. Safe to run again: rows already stored are skipped.
+    Returns the number of listings imported.
+    """
+    conn = conn or get_connection()
+    imported = 0
+
+    if csv_path.exists():
+        try:
+            with open(csv_path, newline="", encoding="utf-8") as f:
+                rows = [r for r in csv.DictReader(f) if r.get("id")]
+            imported = len(insert_listings(rows, conn=conn))
+        except Exception as e:
+            logger.error(f"Store: Could not import {csv_path.name}: {e}")
+
+    if log_path.exists():
+        try:
+            log_data = json.loads(log_path.read_text(encoding="utf-8"))
+            for entry in log_data.get("run_history", []):
+                record_run(entry["date"], entry.get("new_listings", 0), entry.get("sources_failed", []),
+                           entry.get("failed_units"), conn=conn)
+            if log_data.get("last_run"):
+                set_meta("last_run", log_data["last_run"], conn=conn)
+        except Exception as e:
+            logger.error(f"Store: Could not import {log_path.name}: {e}")
+
+    set_meta("legacy_imported", "1", conn=conn)
+    if imported:
+        logger.info(f"Store: Imported {imported} listings from {csv_path.name}")
+    return imported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Internship listing store")
+    parser.add_argument("--import", dest="do_import", action="store_true",
+                        help="Import internships.csv / internships_log.json into the database")
+    parser.add_argument("--renormalize", action="store_true",
+                        help="Re-classify the location_type of every stored listing")
+    args = parser.parse_args()
+
+    if args.renormalize:
+        print(f"Re-normalized {renormalize_locations()} of {count_listings()} listings.")
+    elif args.do_import:
+        added = import_legacy()
+        print(f"Imported {added} new listings into {DB_FILE.name} ({count_listings()} total).")
+    else:
+        print(f"{DB_FILE.name}: {count_listings()} listings, last run {get_meta('last_run')}")
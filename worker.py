@@ -0,0 +1,78 @@
+"""
+Scraper Worker
+──────────────
+Runs scrape jobs queued by the dashboard (`serve.py`), in its own process,
+so Playwright and HTML parsing never compete with request handling for the
+GIL or memory. Run one alongside the web server:
+
+    python worker.py
+
+It claims the oldest queued job from the store's `jobs` table, runs
+`run_scrapers` with the job's config, and heartbeats while it does, so the
+web side can tell a long run from a dead worker. Live status, log lines,
+alerts and new listings reach dashboards through the web process's bridge,
+which watches the store and scraper_run.log.
+"""
+
+import argparse
+import os
+import socket
+import threading
+import time
+
+from loguru import logger
+
+import store
+from seen_index import reset_seen_index
+from scraper import run_scrapers
+
+POLL_SECONDS = 2.0
+
+
+def _heartbeat(job_id: int, stop: threading.Event):
+    while not stop.wait(store.JOB_HEARTBEAT_SECONDS):
+        try:
+            store.heartbeat_job(job_id)
+        except Exception as e:
+            logger.warning(f"Worker: Could not heartbeat job {job_id}: {e}")
+
+
+def run_job(job: dict):
+    logger.info(f"Worker: Starting scrape job #{job['id']}")
+    # The dashboard may have cleared the store (and the index files) since the last job
+    reset_seen_index()
+    stop = threading.Event()
+    threading.Thread(target=_heartbeat, args=(job["id"], stop), daemon=True).start()
+    try:
+        run_scrapers(dry_run=False, config=job["config"])
+    except Exception as e:
+        logger.exception(f"Worker: Scrape job #{job['id']} failed: {e}")
+        store.finish_job(job["id"], error=str(e) or type(e).__name__)
+    else:
+        store.finish_job(job["id"])
+        logger.info(f"Worker: Scrape job #{job['id']} finished")
+    finally:
+        stop.set()
+
+
+def main(once: bool = False):
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    logger.info(f"Worker {worker}: Waiting for scrape jobs")
+    try:
+        while True:
+            job = store.claim_job(worker)
+            if job:
+                run_job(job)
+            elif once:
+                return
+            else:
+                time.sleep(POLL_SECONDS)
+    except KeyboardInterrupt:
+        logger.info(f"Worker {worker}: Stopped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runs scrape jobs queued from the dashboard")
+    parser.add_argument("--once", action="store_true", help="Run whatever is queued, then exit")
+    args = parser.parse_args()
+    main(once=args.once)